@@ -1,22 +1,165 @@
 #!/usr/bin/env python3
 """
 🌐 Translation Alignment Checker for React i18next
-Checks for missing translation keys and generates missing key files
+Checks for missing translation keys and generates missing key files, with
+values pre-filled from the translation memory where it knows them
+Flags keys that are both a string and a namespace (`job` and `job.name`)
 """
 
+import argparse
 import json
 import os
 import re
 import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from source_snapshot import load_snapshot
+from timings import add_profiling_arguments, profiling_session, span
+from translation_memory import DEFAULT_DB_PATH, TranslationMemory
+
+_MISSING = object()
+
+
+class KeyNode:
+    """One key segment; value is set when the path is a translation"""
+    __slots__ = ("children", "value", "flat", "leaves")
+
+    def __init__(self):
+        self.children: Dict[str, "KeyNode"] = {}
+        self.value = _MISSING
+        self.flat = False  # stored as a top-level dotted key ("a.b": ...) rather than nested objects
+        self.leaves = 0  # translations in this subtree, including this node
+
+
+class LocaleKeyIndex:
+    """🌳 Prefix trie over translation keys; flat dotted keys and nested objects share one path"""
+
+    def __init__(self):
+        self.root = KeyNode()
+        self.duplicates: List[str] = []
+
+    @classmethod
+    def from_translations(cls, data: Dict) -> "LocaleKeyIndex":
+        index = cls()
+        index._add_dict(data, [])
+        return index
+
+    @classmethod
+    def from_keys(cls, keys: Iterable[str]) -> "LocaleKeyIndex":
+        index = cls()
+        for key in sorted(keys):
+            index.add(key, True)
+        return index
+
+    def _add_dict(self, data: Dict, path: List[str]):
+        for key, value in data.items():
+            parts = path + key.split('.')
+            if isinstance(value, dict):
+                self._add_dict(value, parts)
+            else:
+                self.add_parts(parts, value, flat=not path)
+
+    def add(self, key: str, value, flat: bool = False):
+        self.add_parts(key.split('.'), value, flat)
+
+    def add_parts(self, parts: List[str], value, flat: bool = False):
+        node = self.root
+        visited = [node]
+        for part in parts:
+            node = node.children.setdefault(part, KeyNode())
+            visited.append(node)
+        if node.value is not _MISSING:
+            # i18next reads the flat key first, so it wins over the nested one
+            self.duplicates.append('.'.join(parts))
+            if flat and not node.flat:
+                node.value, node.flat = value, True
+            return
+        node.value, node.flat = value, flat
+        for visited_node in visited:
+            visited_node.leaves += 1
+
+    # === QUERIES ===
+    def find(self, key: str) -> Optional[KeyNode]:
+        node = self.root
+        for part in key.split('.'):
+            node = node.children.get(part)
+            if node is None:
+                return None
+        return node
+
+    def get(self, key: str):
+        """Translation of key, None if the key is missing or only a namespace"""
+        node = self.find(key)
+        return None if node is None or node.value is _MISSING else node.value
+
+    def is_namespace(self, key: str) -> bool:
+        node = self.find(key)
+        return node is not None and bool(node.children)
+
+    def is_flat(self, key: str) -> bool:
+        node = self.find(key)
+        return node is not None and node.flat
+
+    def subtree_size(self, prefix: str = "") -> int:
+        node = self.find(prefix) if prefix else self.root
+        return node.leaves if node else 0
+
+    def keys(self) -> Iterator[str]:
+        stack = [(self.root, [])]
+        while stack:
+            node, path = stack.pop()
+            if node.value is not _MISSING:
+                yield '.'.join(path)
+            for part, child in node.children.items():
+                stack.append((child, path + [part]))
+
+    def conflicts(self) -> List[Tuple[str, str]]:
+        """(key, reason) for keys i18next cannot resolve as written"""
+        found = [(key, "defined both as a flat dotted key and as nested objects") for key in self.duplicates]
+        stack = [(self.root, [])]
+        while stack:
+            node, path = stack.pop()
+            if node.value is not _MISSING and node.children:
+                found.append(('.'.join(path), f"is a string and the namespace of {node.leaves - 1} keys"))
+            for part, child in node.children.items():
+                stack.append((child, path + [part]))
+        return sorted(found)
+
+    # === OUTPUT ===
+    def to_dict(self) -> Dict:
+        """
+        Nested objects, except leaves stored flat and keys below a string (both
+        written as top-level dotted keys, the only form that cannot clash)
+        """
+        result = {}
+
+        def render(node: KeyNode, path: List[str], target: Optional[Dict]):
+            for part, child in node.children.items():
+                parts = path + [part]
+                if child.value is not _MISSING:
+                    if child.flat or target is None:
+                        result['.'.join(parts)] = child.value
+                    else:
+                        target[part] = child.value
+                if child.children:
+                    if target is not None and child.value is _MISSING:
+                        nested = target.setdefault(part, {})
+                        render(child, parts, nested)
+                        if not nested:
+                            del target[part]
+                    else:
+                        render(child, parts, None)
+
+        render(self.root, [], result)
+        return result
 
 
 class TranslationAligner:
     """🔧 Main class for translation alignment operations"""
     
-    def __init__(self, base_dir: str = None):
+    def __init__(self, base_dir: str = None, memory_db: Optional[str] = None):
         # Use current working directory as default base_dir
         if base_dir is None:
             base_dir = os.getcwd()
@@ -24,6 +167,10 @@ class TranslationAligner:
         self.src_dir = self.base_dir / "src"
         self.i18n_dir = self.base_dir / "src" / "i18n" / "locales"
         self.default_lang = "zhCN"
+        # Only the CLI uses the shared memory; other callers get one under their own base_dir
+        self.memory_db = memory_db or str(self.base_dir / "hack" / ".cache" / "translation_memory.sqlite")
+        self.key_indexes: Dict[str, LocaleKeyIndex] = {}
+        self.conflicts: Dict[str, List[Tuple[str, str]]] = {}
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
         # 📝 Pattern to match t('key') or t("key") calls with improved regex
@@ -31,24 +178,26 @@ class TranslationAligner:
         # Uses word boundary or specific delimiters to avoid false positives like get('key')
         self.translation_pattern = re.compile(r'(?<![a-zA-Z0-9_])t\([\'"`]([a-zA-Z][a-zA-Z0-9._-]*)[\'"`]\)')
         
-    def extract_translation_keys_from_file(self, file_path: Path) -> Set[str]:
+    def extract_translation_keys_from_file(self, file_path: Path, content: Optional[str] = None) -> Set[str]:
         """🔍 Extract translation keys from a single source file"""
         keys = set()
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            if content is None:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+            with span("extract keys", "regex"):
                 matches = self.translation_pattern.findall(content)
-                # Filter out invalid keys
-                valid_keys = []
-                for key in matches:
-                    # Skip empty keys, very short keys, or keys that look like invalid patterns
-                    if (len(key) > 1 and 
-                        not key.startswith('.') and 
-                        not key.endswith('.') and
-                        not all(c in '.,/:\\=?#' for c in key) and
-                        key not in ['a', 'tab', 'token', '/', ':', '=', '?', ',', '\n']):
-                        valid_keys.append(key)
-                keys.update(valid_keys)
+            # Filter out invalid keys
+            valid_keys = []
+            for key in matches:
+                # Skip empty keys, very short keys, or keys that look like invalid patterns
+                if (len(key) > 1 and 
+                    not key.startswith('.') and 
+                    not key.endswith('.') and
+                    not all(c in '.,/:\\=?#' for c in key) and
+                    key not in ['a', 'tab', 'token', '/', ':', '=', '?', ',', '\n']):
+                    valid_keys.append(key)
+            keys.update(valid_keys)
         except Exception as e:
             print(f"⚠️  Error reading {file_path}: {e}")
         return keys
@@ -61,12 +210,20 @@ class TranslationAligner:
         # File extensions to scan
         extensions = {'.tsx', '.jsx', '.ts', '.js'}
         
-        for file_path in self.src_dir.rglob('*'):
-            if file_path.suffix in extensions and file_path.is_file():
-                keys = self.extract_translation_keys_from_file(file_path)
-                if keys:
-                    print(f"   📄 Found {len(keys)} keys in {file_path.relative_to(self.base_dir)}")
-                all_keys.update(keys)
+        # One shared walk of src/, contents are read lazily from the snapshot
+        snapshot = load_snapshot(str(self.src_dir))
+        for entry in snapshot.files(extensions=extensions):
+            file_path = Path(snapshot.abspath(entry.path))
+            try:
+                with span("read source", "read"):
+                    content = snapshot.read_text(entry.path)
+            except (OSError, UnicodeDecodeError) as e:
+                print(f"⚠️  Error reading {file_path}: {e}")
+                continue
+            keys = self.extract_translation_keys_from_file(file_path, content)
+            if keys:
+                print(f"   📄 Found {len(keys)} keys in {file_path.relative_to(self.base_dir)}")
+            all_keys.update(keys)
         
         print(f"✅ Total unique translation keys found: {len(all_keys)}")
         return all_keys
@@ -75,7 +232,7 @@ class TranslationAligner:
         """📖 Load translation JSON file for a specific language"""
         file_path = self.i18n_dir / lang / "translation.json"
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
+            with span(f"load {lang}/translation.json", "json"), open(file_path, 'r', encoding='utf-8') as f:
                 return json.load(f)
         except FileNotFoundError:
             print(f"⚠️  Translation file not found: {file_path}")
@@ -84,87 +241,82 @@ class TranslationAligner:
             print(f"❌ Invalid JSON in {file_path}: {e}")
             return {}
     
-    def get_nested_value(self, data: Dict, key: str):
-        """🔗 Get value from dictionary (supports both flat and nested structure)"""
-        # First try to get the key directly (flat structure)
-        if key in data:
-            return data[key]
-        
-        # If not found, try nested structure with dot notation
-        keys = key.split('.')
-        current = data
-        for k in keys:
-            if isinstance(current, dict) and k in current:
-                current = current[k]
-            else:
-                return None
-        return current
-    
-    def get_all_keys_from_dict(self, data: Dict, prefix: str = "") -> Set[str]:
-        """🗝️  Extract all possible keys from dictionary (supports both flat and nested structure)"""
-        keys = set()
-        for key, value in data.items():
-            if prefix:
-                # This is for nested structure processing
-                current_key = f"{prefix}.{key}"
-                keys.add(current_key)
-                if isinstance(value, dict):
-                    keys.update(self.get_all_keys_from_dict(value, current_key))
-            else:
-                # First level - add the key as-is (supports flat structure like "accountDetail.addUser")
-                keys.add(key)
-                # Also check if it's a nested object and add nested keys
-                if isinstance(value, dict):
-                    keys.update(self.get_all_keys_from_dict(value, key))
-        return keys
-    
+    def key_index(self, lang: str) -> LocaleKeyIndex:
+        """🌳 Key trie of a language's translation.json, built once per run"""
+        if lang not in self.key_indexes:
+            translations = self.load_translation_file(lang)
+            with span(f"index {lang} keys", "json"):
+                self.key_indexes[lang] = LocaleKeyIndex.from_translations(translations)
+        return self.key_indexes[lang]
+
+    def report_conflicts(self, name: str, index: LocaleKeyIndex):
+        conflicts = index.conflicts()
+        if conflicts:
+            print(f"⚠️  {len(conflicts)} key conflicts in {name}:")
+            for key, reason in conflicts:
+                print(f"   🔀 {key}: {reason}")
+            self.conflicts[name] = conflicts
+
     def check_missing_keys_in_default(self, source_keys: Set[str]) -> List[str]:
         """❓ Check for missing keys in default language (zhCN)"""
         print(f"\n🔍 Checking for missing keys in default language ({self.default_lang})...")
         
-        default_translations = self.load_translation_file(self.default_lang)
-        missing_keys = []
-        
-        for key in source_keys:
-            if self.get_nested_value(default_translations, key) is None:
-                missing_keys.append(key)
+        default_index = self.key_index(self.default_lang)
+        print(f"🌳 Indexed {default_index.subtree_size()} keys of {self.default_lang}")
+        self.report_conflicts(self.default_lang, default_index)
+        # A key used both as t('a') and t('a.b') cannot be stored as written either
+        self.report_conflicts("source code", LocaleKeyIndex.from_keys(source_keys))
+
+        missing_keys = [key for key in source_keys if default_index.get(key) is None]
         
         if missing_keys:
             print(f"❌ Found {len(missing_keys)} missing keys in {self.default_lang}:")
             for key in sorted(missing_keys):
-                print(f"   🔑 {key}")
+                if default_index.is_namespace(key):
+                    print(f"   🔑 {key} (namespace of {default_index.subtree_size(key)} keys, not a string)")
+                else:
+                    print(f"   🔑 {key}")
         else:
             print(f"✅ All source keys exist in {self.default_lang}")
         
         return missing_keys
      
-    def create_nested_dict_from_keys(self, keys: List[str], default_translations: Dict) -> Dict:
+    def check_missing_keys_in_other_langs(self, source_keys: Set[str]) -> Dict[str, List[str]]:
+        """❓ Source keys missing in every other language"""
+        missing_by_lang = {}
+        for lang_dir in sorted(self.i18n_dir.glob("*/translation.json")):
+            lang = lang_dir.parent.name
+            if lang == self.default_lang:
+                continue
+            index = self.key_index(lang)
+            missing_keys = sorted(key for key in source_keys if index.get(key) is None)
+            if missing_keys:
+                print(f"❌ Found {len(missing_keys)} missing keys in {lang}")
+                missing_by_lang[lang] = missing_keys
+            else:
+                print(f"✅ All source keys exist in {lang}")
+        return missing_by_lang
+
+    def create_nested_dict_from_keys(self, keys: List[str], default_index: LocaleKeyIndex,
+                                     lang: Optional[str] = None,
+                                     memory: Optional[TranslationMemory] = None) -> Dict:
         """🏗️  Create dictionary structure from flat keys (preserves flat structure for dot-separated keys)"""
-        result = {}
+        output = LocaleKeyIndex()
         
         for key in keys:
             # Try to get the value from default translations
-            default_value = self.get_nested_value(default_translations, key)
+            default_value = default_index.get(key)
+            # Prefer a translation the memory already has for this language
+            if memory and lang and lang != self.default_lang and isinstance(default_value, str):
+                entry = memory.lookup(default_value, lang)
+                if entry:
+                    default_value = entry.translation
             
-            # For flat structure (like "accountDetail.addUser"), just add the key directly
-            if key in default_translations or '.' not in key:
-                result[key] = default_value if default_value is not None else f"TODO: Translate '{key}'"
-            else:
-                # For truly nested structure, create nested objects
-                keys_parts = key.split('.')
-                current = result
-                
-                # Navigate/create the nested structure
-                for i, part in enumerate(keys_parts[:-1]):
-                    if part not in current:
-                        current[part] = {}
-                    current = current[part]
-                
-                # Set the final value
-                final_key = keys_parts[-1]
-                current[final_key] = default_value if default_value is not None else f"TODO: Translate '{key}'"
+            # Keys stored flat (like "accountDetail.addUser") stay flat, the others are nested
+            output.add(key, default_value if default_value is not None else f"TODO: Translate '{key}'",
+                       flat=default_index.is_flat(key))
         
-        return result
+        return output.to_dict()
     
     def save_missing_keys_files(self, missing_by_lang: Dict[str, List[str]]):
         """💾 Save missing keys to separate JSON files"""
@@ -173,27 +325,31 @@ class TranslationAligner:
             return
         
         print(f"\n💾 Saving missing keys files...")
-        default_translations = self.load_translation_file(self.default_lang)
+        default_index = self.key_index(self.default_lang)
+        memory = TranslationMemory(self.memory_db)
+        memory.seed_from_locales(self.i18n_dir)
         
         # Create output directory
         output_dir = self.base_dir / "hack" / "missing_translations"
-        output_dir.mkdir(exist_ok=True)
+        output_dir.mkdir(parents=True, exist_ok=True)
         
         for lang, missing_keys in missing_by_lang.items():
             filename = f"{lang}_missing_{self.timestamp}.json"
             file_path = output_dir / filename
             
             # Create nested structure for missing keys
-            missing_dict = self.create_nested_dict_from_keys(missing_keys, default_translations)
+            missing_dict = self.create_nested_dict_from_keys(missing_keys, default_index, lang, memory)
             
-            with open(file_path, 'w', encoding='utf-8') as f:
+            with span(f"write {filename}", "write"), open(file_path, 'w', encoding='utf-8') as f:
                 json.dump(missing_dict, f, ensure_ascii=False, indent=2)
             
             print(f"   📁 {lang}: {file_path}")
         
+        memory.close()
+        print(f"🧠 Translation memory filled {memory.stats['hits']} values")
         print(f"✅ Missing translation files saved to {output_dir}")
     
-    def run(self):
+    def run(self, save: bool = True):
         """🚀 Main execution method"""
         print("🌐 Translation Alignment Checker Starting...")
         print(f"📁 Base directory: {self.base_dir}")
@@ -205,14 +361,28 @@ class TranslationAligner:
         
         # Step 2: Check missing keys in default language
         missing_in_default = self.check_missing_keys_in_default(source_keys)
+        missing_by_lang = {self.default_lang: missing_in_default} if missing_in_default else {}
+
+        # Step 3: Check the other languages
+        print("\n🔍 Checking the other languages...")
+        missing_by_lang.update(self.check_missing_keys_in_other_langs(source_keys))
+
+        # Step 4: Write the missing keys, pre-filled from the translation memory
+        if save:
+            self.save_missing_keys_files(missing_by_lang)
         
         print("\n" + "=" * 60)
         print("📊 SUMMARY")
         print("=" * 60)
         print(f"🔑 Total source keys found: {len(source_keys)}")
         print(f"❌ Missing in {self.default_lang}: {len(missing_in_default)}")
+        for lang, missing_keys in missing_by_lang.items():
+            if lang != self.default_lang:
+                print(f"❌ Missing in {lang}: {len(missing_keys)}")
+        for name, conflicts in self.conflicts.items():
+            print(f"🔀 Key conflicts in {name}: {len(conflicts)}")
         
-        if missing_in_default or missing_by_lang:
+        if missing_by_lang:
             print("\n⚠️  Action required: Please review and add missing translations!")
         else:
             print("\n🎉 All translations are aligned!")
@@ -220,9 +390,25 @@ class TranslationAligner:
 
 def main():
     """🎯 Entry point"""
+    parser = argparse.ArgumentParser(description="Check source translation keys against every locale.")
+    parser.add_argument("--base-dir", default=None, help="Project root containing src/ (default: cwd).")
+    parser.add_argument(
+        "--no-save",
+        action="store_true",
+        help="Only report; do not write hack/missing_translations/<lang>_missing_*.json."
+    )
+    parser.add_argument(
+        "--memory-db",
+        default=str(DEFAULT_DB_PATH),
+        help="Translation memory used to pre-fill missing values (default: the shared one in hack/.cache/)."
+    )
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+
     try:
-        aligner = TranslationAligner()
-        aligner.run()
+        with profiling_session(args, "align_translation"):
+            aligner = TranslationAligner(args.base_dir, args.memory_db)
+            aligner.run(save=not args.no_save)
     except KeyboardInterrupt:
         print("\n\n⏹️  Operation cancelled by user")
         sys.exit(1)
@@ -0,0 +1,194 @@
+# Copyright 2025 RAIDS Lab
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# python3 ./hack/bench_convert_index_css.py --sizes 1000 100000 1000000
+
+"""
+Accuracy checks and benchmarks for convert_index_css.py.
+
+The accuracy checks run first and compare against reference values (the hsl
+colors currently shipped in src/index.css plus hand-checked out-of-gamut
+cases), so a faster implementation can be dropped in and accepted only if it
+still produces the same output. The benchmark then times the regex scan, the
+conversion math and the output assembly separately on synthetic CSS.
+"""
+
+import argparse
+import math
+import random
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+import convert_index_css as cic
+
+# (l, c, h) -> expected (h, s, l) after rounding
+HSL_REFERENCES: List[Tuple[Tuple[float, float, float], Tuple[float, float, float]]] = [
+    ((1, 0, 0), (0, 0, 100.0)),
+    ((0, 0, 0), (0, 0, 0.0)),
+    ((0.129, 0.042, 264.695), (228.8, 85.1, 5.0)),
+    ((0.473, 0.149, 253.58), (208.3, 100.0, 33.7)),
+    ((0.577, 0.245, 27.325), (357.2, 100.0, 45.3)),
+    # Out of gamut: channels are clipped by linear_to_srgb
+    ((0.7, 0.4, 30), (0.0, 100.0, 50.0)),
+    ((0.9, 0.4, 140), (120.0, 100.0, 50.0)),
+    ((0.5, 0.5, 264), (254.1, 100.0, 50.0)),
+]
+
+LINEAR_TO_SRGB_REFERENCES: List[Tuple[float, float]] = [
+    (-0.1, 0.0),
+    (0.0, 0.0),
+    (0.002, 0.02584),
+    (0.0031308, 0.040449936),
+    (0.5, 0.7353569830524495),
+    (1.0, 1.0),
+    (1.5, 1.0),
+]
+
+CSS_REFERENCES: List[Tuple[str, str]] = [
+    ('a: oklch(1 0 0);', 'a: hsl(0, 0%, 100.0%);'),
+    ('a: oklch(1 0 0 / 10%);', 'a: hsla(0, 0%, 100.0%, 10%);'),
+    ('b: oklch(.5 .1 120 / 0.5);', 'b: hsla(72.2, 53.2%, 27.4%, 0.5);'),
+    ('c: oklch(0.5 0.1 120);', 'c: hsl(72.2, 53.2%, 27.4%);'),
+    ('d: rgb(0 0 0);', 'd: rgb(0 0 0);'),
+]
+
+def check_accuracy() -> int:
+    """Run the reference checks, returning the number of failures"""
+    failures = 0
+
+    for x, expected in LINEAR_TO_SRGB_REFERENCES:
+        actual = cic.linear_to_srgb(x)
+        if not math.isclose(actual, expected, rel_tol=1e-9, abs_tol=1e-12):
+            print(f"❌ linear_to_srgb({x}) = {actual}, expected {expected}")
+            failures += 1
+
+    for lch, expected in HSL_REFERENCES:
+        actual = cic.oklch_to_hsl(*lch)
+        if tuple(actual) != expected:
+            print(f"❌ oklch_to_hsl{lch} = {actual}, expected {expected}")
+            failures += 1
+
+    for css, expected in CSS_REFERENCES:
+        actual = cic.convert_css_colors(css)
+        if actual != expected:
+            print(f"❌ convert_css_colors({css!r}) = {actual!r}, expected {expected!r}")
+            failures += 1
+
+    checks = len(LINEAR_TO_SRGB_REFERENCES) + len(HSL_REFERENCES) + len(CSS_REFERENCES)
+    if failures:
+        print(f"❌ {failures}/{checks} accuracy checks failed")
+    else:
+        print(f"✅ {checks} accuracy checks passed")
+    return failures
+
+def generate_css(tokens: int, alpha: bool, percent: bool, palette: int, seed: int = 0) -> str:
+    """Synthetic CSS with `tokens` oklch() values drawn from a palette of distinct colors"""
+    rng = random.Random(seed)
+    colors = []
+    for _ in range(palette):
+        l = round(rng.uniform(0, 1), 3)
+        c = round(rng.uniform(0, 0.3), 3)
+        h = round(rng.uniform(0, 360), 3)
+        if alpha:
+            a = f'{rng.randint(1, 99)}%' if percent else f'{rng.random():.2f}'
+            colors.append(f'oklch({l} {c} {h} / {a})')
+        else:
+            colors.append(f'oklch({l} {c} {h})')
+
+    lines = [':root {']
+    for i in range(tokens):
+        lines.append(f'  --color-{i}: {colors[i % palette]};')
+    lines.append('}')
+    return '\n'.join(lines) + '\n'
+
+def time_phase(fn: Callable[[], object], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def bench_case(css_text: str, repeat: int) -> Dict[str, float]:
+    matches = list(cic.OKLCH_PATTERN.finditer(css_text))
+    parsed = [
+        (float(m.group(1)), float(m.group(2)), float(m.group(3)), m.group(4))
+        for m in matches
+    ]
+    unique = set(parsed)
+    converted = {key: cic.format_oklch_as_hsl(*key) for key in unique}
+
+    def scan():
+        for _ in cic.OKLCH_PATTERN.finditer(css_text):
+            pass
+
+    def math_uncached():
+        for l, c, h, _ in parsed:
+            cic.oklch_to_hsl(l, c, h)
+
+    def assemble():
+        cic.OKLCH_PATTERN.sub(
+            lambda m: converted[(float(m.group(1)), float(m.group(2)), float(m.group(3)), m.group(4))],
+            css_text,
+        )
+
+    def end_to_end():
+        cic.format_oklch_as_hsl.cache_clear()
+        cic.convert_css_colors(css_text)
+
+    return {
+        'scan': time_phase(scan, repeat),
+        'math': time_phase(math_uncached, repeat),
+        'assemble': time_phase(assemble, repeat),
+        'total': time_phase(end_to_end, repeat),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark and accuracy suite for convert_index_css.py.")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1_000, 100_000, 1_000_000],
+        help="Number of oklch tokens per synthetic stylesheet."
+    )
+    parser.add_argument("--palette", type=int, default=64, help="Distinct colors per stylesheet.")
+    parser.add_argument("--repeat", type=int, default=3, help="Best-of-N timing repetitions.")
+    parser.add_argument("--accuracy-only", action="store_true", help="Run the accuracy checks only.")
+    args = parser.parse_args()
+
+    if check_accuracy():
+        sys.exit(1)
+    if args.accuracy_only:
+        return
+
+    variants = [
+        ('plain', False, False),
+        ('alpha', True, False),
+        ('alpha%', True, True),
+    ]
+
+    print(f"\n{'tokens':>9} {'variant':<8} {'scan':>9} {'math':>9} {'assemble':>9} {'total':>9} {'tok/s':>12}")
+    for size in args.sizes:
+        for name, alpha, percent in variants:
+            css_text = generate_css(size, alpha, percent, args.palette)
+            result = bench_case(css_text, args.repeat)
+            rate = size / result['total'] if result['total'] else float('inf')
+            print(f"{size:>9} {name:<8} "
+                  f"{result['scan']:>8.3f}s {result['math']:>8.3f}s "
+                  f"{result['assemble']:>8.3f}s {result['total']:>8.3f}s {rate:>12,.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+# Copyright 2025 RAIDS Lab
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# python3 ./hack/bench_hack_scripts.py --sizes 1000 10000 50000 --output bench.json
+
+"""
+⏱️  Benchmarks for the hack/ scripts on synthetic frontend trees
+
+Generates a src/ tree of N PascalCase .tsx components (with t() calls, `@/`
+and relative imports) plus locale files, then times:
+
+  - align:    TranslationAligner.run
+  - format:   flatten_json / process_folder on the locale files
+  - refactor: find_rename_targets + update_file_imports (dry run)
+  - css:      convert_css_colors on a stylesheet scaled with N
+
+Results are written as JSON (with the current git commit) so runs can be
+compared between commits with --compare.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict
+
+import source_snapshot
+from align_translation import TranslationAligner
+from bench_convert_index_css import generate_css
+from convert_index_css import convert_css_colors, format_oklch_as_hsl
+from format_translation import process_folder
+from refactor_filenames import find_rename_targets, update_file_imports
+
+GROUPS = ['Job', 'Image', 'Dataset', 'Account', 'Node', 'Queue', 'Metric', 'Setting']
+WORDS = ['Detail', 'List', 'Table', 'Form', 'Dialog', 'Card', 'Panel', 'Badge', 'Sheet', 'Chart']
+LOCALES = ['zhCN', 'enUS', 'ja', 'ko']
+
+def component_name(i: int) -> str:
+    return f"{GROUPS[i % len(GROUPS)]}{WORDS[(i // len(GROUPS)) % len(WORDS)]}{i}"
+
+def generate_tree(base_dir: str, files: int, seed: int = 0) -> int:
+    """Writes base_dir/src with `files` components and locale files, returns the number of t() keys"""
+    rng = random.Random(seed)
+    src_dir = os.path.join(base_dir, 'src')
+    keys: Dict[str, str] = {}
+
+    for i in range(files):
+        name = component_name(i)
+        group = GROUPS[i % len(GROUPS)]
+        folder = os.path.join(src_dir, 'components', f"{group}Views", f"Part{i // 100}")
+        os.makedirs(folder, exist_ok=True)
+
+        imports = ["import { useTranslation } from 'react-i18next'"]
+        for j in rng.sample(range(files), min(3, files)):
+            other = component_name(j)
+            other_group = GROUPS[j % len(GROUPS)]
+            if j // 100 == i // 100 and other_group == group:
+                imports.append(f"import {other} from './{other}'")
+            else:
+                imports.append(f"import {other} from '@/components/{other_group}Views/Part{j // 100}/{other}'")
+
+        body = []
+        for k in range(rng.randint(2, 8)):
+            key = f"{name[0].lower()}{name[1:]}.label{k}"
+            keys[key] = f"标签 {k}"
+            body.append(f"      <span>{{t('{key}')}}</span>")
+
+        with open(os.path.join(folder, f"{name}.tsx"), 'w', encoding='utf-8') as f:
+            f.write('\n'.join(imports) + '\n\n')
+            f.write(f"export default function {name}() {{\n")
+            f.write("  const { t } = useTranslation()\n")
+            f.write("  return (\n    <div placeholder=\"Search\">\n")
+            f.write('\n'.join(body) + '\n')
+            f.write("    </div>\n  )\n}\n")
+
+    # Locales: ~95% coverage in the default language, mixed flat and nested keys
+    for locale in LOCALES:
+        translations: Dict = {}
+        for key, value in keys.items():
+            if locale == 'zhCN' and rng.random() < 0.05:
+                continue
+            if rng.random() < 0.5:
+                translations[key] = value
+            else:
+                head, tail = key.split('.', 1)
+                translations.setdefault(head, {})
+                if isinstance(translations[head], dict):
+                    translations[head][tail] = value
+        locale_dir = os.path.join(src_dir, 'i18n', 'locales', locale)
+        os.makedirs(locale_dir, exist_ok=True)
+        with open(os.path.join(locale_dir, 'translation.json'), 'w', encoding='utf-8') as f:
+            json.dump(translations, f, ensure_ascii=False, indent=2)
+
+    return len(keys)
+
+def timed(fn: Callable[[], object]) -> float:
+    """Runs fn with stdout silenced and a cold source snapshot, returns seconds"""
+    source_snapshot._snapshots.clear()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn()
+    return time.perf_counter() - started
+
+def bench_size(files: int, work_dir: str) -> Dict[str, float]:
+    base_dir = os.path.join(work_dir, f"tree-{files}")
+    generate_tree(base_dir, files)
+    src_dir = os.path.join(base_dir, 'src')
+    i18n_dir = os.path.join(src_dir, 'i18n')
+    css_text = generate_css(files * 20, alpha=True, percent=False, palette=64)
+
+    results = {}
+    # Report only, as before run() wrote missing-key files; keep the memory out of hack/.cache
+    memory_db = os.path.join(work_dir, '.cache', 'translation_memory.sqlite')
+    results['align'] = timed(lambda: TranslationAligner(base_dir, memory_db=memory_db).run(save=False))
+    results['format'] = timed(lambda: process_folder(i18n_dir))
+
+    def refactor():
+        rename_map = find_rename_targets(src_dir, ['i18n']).renames
+        update_file_imports(src_dir, rename_map)
+    results['refactor'] = timed(refactor)
+
+    def css():
+        format_oklch_as_hsl.cache_clear()
+        convert_css_colors(css_text)
+    results['css'] = timed(css)
+    return results
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def print_table(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]] = None):
+    phases = ['align', 'format', 'refactor', 'css']
+    print(f"\n{'files':>8} " + ' '.join(f"{phase:>16}" for phase in phases))
+    for size, timings in results.items():
+        cells = []
+        for phase in phases:
+            cell = f"{timings[phase]:.3f}s"
+            if baseline and size in baseline and baseline[size].get(phase):
+                cell += f" ({timings[phase] / baseline[size][phase]:.2f}x)"
+            cells.append(f"{cell:>16}")
+        print(f"{size:>8} " + ' '.join(cells))
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the hack/ scripts on synthetic frontend trees.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 50_000],
+                        help="Number of components per synthetic tree.")
+    parser.add_argument("--output", help="Write results as JSON to this file.")
+    parser.add_argument("--compare", help="Previous JSON results to compare against.")
+    parser.add_argument("--keep", action="store_true", help="Keep the generated trees.")
+    args = parser.parse_args()
+
+    # Keep the synthetic trees' snapshot caches out of hack/.cache
+    work_dir = tempfile.mkdtemp(prefix="hack-bench-")
+    source_snapshot.CACHE_DIR = os.path.join(work_dir, '.cache')
+
+    results: Dict[str, Dict[str, float]] = {}
+    try:
+        for size in args.sizes:
+            print(f"🏗️  Benchmarking {size} files...", file=sys.stderr)
+            results[str(size)] = bench_size(size, work_dir)
+    finally:
+        if args.keep:
+            print(f"📁 Trees kept in {work_dir}", file=sys.stderr)
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+    print_table(results, baseline)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({
+                'commit': git_commit(),
+                'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': sys.version.split()[0],
+                'results': results,
+            }, f, indent=2)
+        print(f"\n💾 Results saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
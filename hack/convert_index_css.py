@@ -12,9 +12,21 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import re
+import argparse
+import glob
 import math
-from typing import Tuple
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from timings import (Span, add_profiling_arguments, add_spans, collect_spans, init_worker, profiling_enabled,
+                     profiling_session, span)
+
+OKLCH_PATTERN = re.compile(r'oklch\((\d*\.?\d+)\s+(\d*\.?\d+)\s+(\d*\.?\d+)(?:\s*\/\s*(\d*\.?\d+%?))?\)')
 
 def oklch_to_oklab(l: float, c: float, h: float) -> Tuple[float, float, float]:
     h_rad = math.radians(h)
@@ -80,37 +92,212 @@ def oklch_to_hsl(l: float, c: float, h: float) -> Tuple[float, float, float]:
     rgb_r, rgb_g, rgb_b = oklab_to_linear_srgb(lab_l, lab_a, lab_b)
     return rgb_to_hsl(rgb_r, rgb_g, rgb_b)
 
+def normalize_alpha(alpha: Optional[str]) -> Optional[str]:
+    """'50%', '0.5' and '.50' are the same alpha; give them one cache key"""
+    if alpha is None:
+        return None
+    value = float(alpha[:-1]) / 100 if alpha.endswith('%') else float(alpha)
+    return format(round(value, 4), 'g')
+
+@lru_cache(maxsize=None)
+def format_oklch_as_hsl(l: float, c: float, h: float, alpha: Optional[str]) -> str:
+    """Convert one normalized (l, c, h, alpha) tuple; themes repeat the same colors a lot"""
+    hsl_h, hsl_s, hsl_l = oklch_to_hsl(l, c, h)
+
+    if alpha:
+        return f'hsla({hsl_h}, {hsl_s}%, {hsl_l}%, {alpha})'
+    return f'hsl({hsl_h}, {hsl_s}%, {hsl_l}%)'
+
 def convert_css_colors(css_text: str) -> str:
-    oklch_pattern = r'oklch\((\d*\.?\d+)\s+(\d*\.?\d+)\s+(\d*\.?\d+)(?:\s*\/\s*(\d*\.?\d+%?))?\)'
-    
     def replace_color(match):
         l = float(match.group(1))
         c = float(match.group(2))
         h = float(match.group(3))
-        alpha = match.group(4)
-        
-        hsl_h, hsl_s, hsl_l = oklch_to_hsl(l, c, h)
-        
-        if alpha:
-            return f'hsla({hsl_h}, {hsl_s}%, {hsl_l}%, {alpha})'
-        return f'hsl({hsl_h}, {hsl_s}%, {hsl_l}%)'
-    
-    return re.sub(oklch_pattern, replace_color, css_text)
+        alpha = normalize_alpha(match.group(4))
+
+        return format_oklch_as_hsl(l, c, h, alpha)
+
+    return OKLCH_PATTERN.sub(replace_color, css_text)
 
-def main():
-    try:
-        with open('index.css', 'r') as file:
+# === CLI ===
+def convert_file(path: str) -> Tuple[str, str, int, int, int]:
+    """Worker entry: returns (path, converted css, tokens, cache hits, cache misses)"""
+    with span(f"read {path}", "read"):
+        with open(path, 'r', encoding='utf-8') as file:
             css_text = file.read()
-    except FileNotFoundError:
-        print("Please create an index.css file with your CSS content")
+
+    before = format_oklch_as_hsl.cache_info()
+    with span(f"convert {path}", "regex"):
+        converted_css = convert_css_colors(css_text)
+    after = format_oklch_as_hsl.cache_info()
+
+    hits = after.hits - before.hits
+    misses = after.misses - before.misses
+    return path, converted_css, hits + misses, hits, misses
+
+def convert_file_in_worker(path: str) -> Tuple[Tuple[str, str, int, int, int], List[Span]]:
+    """convert_file plus the spans it recorded, which would otherwise stay in the worker"""
+    return convert_file(path), collect_spans()
+
+def expand_inputs(patterns: List[str]) -> List[str]:
+    """Expand globs, keeping '-' (stdin) and literal paths in the given order"""
+    paths = []
+    for pattern in patterns:
+        if pattern == '-':
+            paths.append(pattern)
+            continue
+        matches = sorted(glob.glob(pattern, recursive=True))
+        if not matches:
+            print(f"⚠️  No files match {pattern}", file=sys.stderr)
+        paths.extend(matches)
+    return paths
+
+def iter_conversions(paths: List[str], jobs: int) -> Iterator[Tuple[str, str, int, int, int]]:
+    """Yield conversions in input order, using a worker pool for multiple files"""
+    if jobs <= 1 or len(paths) <= 1:
+        for path in paths:
+            yield convert_file(path)
         return
 
-    converted_css = convert_css_colors(css_text)
+    with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker,
+                             initargs=(profiling_enabled(),)) as pool:
+        for result, spans in pool.map(convert_file_in_worker, paths):
+            add_spans(spans)
+            yield result
 
-    with open('output.css', 'w') as file:
-        file.write(converted_css)
-    
-    print("Conversion completed! Check output.css for the results.")
+def output_paths(paths: List[str], args: argparse.Namespace) -> Dict[str, Optional[str]]:
+    """
+    Destination of each input. With --out-dir the inputs keep their paths
+    relative to their common parent directory, so a/index.css and b/index.css
+    do not overwrite each other.
+    """
+    if not args.out_dir:
+        return {path: args.output for path in paths}
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in paths])
+    return {path: os.path.join(args.out_dir, os.path.relpath(os.path.abspath(path), root)) for path in paths}
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Convert oklch() colors in CSS files to hsl()/hsla().")
+    parser.add_argument(
+        "inputs",
+        nargs="*",
+        help="CSS files or glob patterns, '-' for stdin. Defaults to ./index.css."
+    )
+    parser.add_argument(
+        "-o", "--output",
+        default=None,
+        help="Output file, '-' for stdout. Defaults to output.css without inputs, stdout otherwise."
+    )
+    parser.add_argument(
+        "--out-dir",
+        default=None,
+        help="Write the converted files into this directory, keeping their paths relative to their common parent."
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of worker processes when converting several files."
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Print cache hit-rate and throughput statistics to stderr."
+    )
+    add_profiling_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if args.output and args.out_dir:
+        parser.error("--output and --out-dir are mutually exclusive")
+    return args
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    with profiling_session(args, "convert_index_css"):
+        run(args)
+
+def run(args: argparse.Namespace):
+    # Keep the original behaviour: ./index.css -> ./output.css
+    legacy_mode = not args.inputs
+    if legacy_mode:
+        if not os.path.exists('index.css'):
+            print("Please create an index.css file with your CSS content")
+            return
+        args.inputs = ['index.css']
+        if not args.out_dir:
+            args.output = args.output or 'output.css'
+
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        print("No input files to convert.", file=sys.stderr)
+        sys.exit(1)
+    if args.output and args.output != '-' and len(paths) > 1:
+        print("Use --out-dir when converting more than one file.", file=sys.stderr)
+        sys.exit(1)
+    if args.out_dir and '-' in paths:
+        print("stdin ('-') cannot be combined with --out-dir, use --output instead.", file=sys.stderr)
+        sys.exit(1)
+    destinations = output_paths(paths, args)
+
+    start = time.perf_counter()
+    total_bytes = total_tokens = total_hits = total_misses = 0
+
+    # stdin is read here, everything else goes through the worker pool
+    stdin_results = {}
+    if '-' in paths:
+        with span("read stdin", "read"):
+            css_text = sys.stdin.read()
+        before = format_oklch_as_hsl.cache_info()
+        with span("convert stdin", "regex"):
+            converted_css = convert_css_colors(css_text)
+        after = format_oklch_as_hsl.cache_info()
+        hits = after.hits - before.hits
+        misses = after.misses - before.misses
+        stdin_results['-'] = ('-', converted_css, hits + misses, hits, misses)
+        total_bytes += len(css_text.encode('utf-8'))
+
+    file_paths = [p for p in paths if p != '-']
+    results = iter_conversions(file_paths, args.jobs)
+
+    for path in paths:
+        if path == '-':
+            _, converted_css, tokens, hits, misses = stdin_results['-']
+        else:
+            _, converted_css, tokens, hits, misses = next(results)
+            total_bytes += os.path.getsize(path)
+
+        total_tokens += tokens
+        total_hits += hits
+        total_misses += misses
+
+        destination = destinations[path]
+        with span(f"write {destination or 'stdout'}", "write"):
+            if destination is None or destination == '-':
+                sys.stdout.write(converted_css)
+                sys.stdout.flush()
+            else:
+                os.makedirs(os.path.dirname(destination) or '.', exist_ok=True)
+                with open(destination, 'w', encoding='utf-8') as file:
+                    file.write(converted_css)
+        if destination not in (None, '-'):
+            print(f"Converted {path} -> {destination}", file=sys.stderr)
+
+    elapsed = time.perf_counter() - start
+
+    if args.stats:
+        lookups = total_hits + total_misses
+        hit_rate = (total_hits / lookups * 100) if lookups else 0.0
+        print("📊 Conversion stats:", file=sys.stderr)
+        print(f"  - Files: {len(paths)}", file=sys.stderr)
+        print(f"  - oklch tokens: {total_tokens}", file=sys.stderr)
+        print(f"  - Cache hits/misses: {total_hits}/{total_misses} ({hit_rate:.1f}% hit rate)", file=sys.stderr)
+        print(f"  - Elapsed: {elapsed:.3f}s", file=sys.stderr)
+        if elapsed > 0:
+            print(f"  - Throughput: {total_tokens / elapsed:,.0f} tokens/s, "
+                  f"{total_bytes / elapsed / 1024:,.1f} KiB/s", file=sys.stderr)
+
+    if legacy_mode and args.output == 'output.css':
+        print("Conversion completed! Check output.css for the results.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
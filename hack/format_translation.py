@@ -1,6 +1,10 @@
 import os
 import sys
 import json
+import argparse
+
+from source_snapshot import load_snapshot
+from timings import add_profiling_arguments, profiling_session, span
 
 def flatten_json(y, prefix=''):
     out = {}
@@ -12,32 +16,41 @@ def flatten_json(y, prefix=''):
         out[prefix] = y
     return out
 
-def process_folder(folder_path):
+def process_folder(folder_path, snapshot=None):
     processed_files = []
+    if snapshot is None:
+        snapshot = load_snapshot(folder_path)
+    under = os.path.relpath(os.path.abspath(folder_path), snapshot.root)
+    if under == os.pardir or under.startswith(os.pardir + os.sep):
+        raise ValueError(f"{folder_path} is outside the snapshot root {snapshot.root}")
     
-    for root, dirs, files in os.walk(folder_path):
-        for file in files:
-            if file == "translation.json":
-                file_path = os.path.join(root, file)
-                relative_path = os.path.relpath(file_path, folder_path)
-                
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    flat = flatten_json(data)
-                    # Sort in ascending order
-                    sorted_result = dict(sorted(flat.items()))
-                
-                # Write back to the original file
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(sorted_result, f, ensure_ascii=False, indent=2)
-                
-                processed_files.append(relative_path)
+    for entry in snapshot.files(under=under, names=["translation.json"]):
+        file_path = snapshot.abspath(entry.path)
+        relative_path = os.path.relpath(file_path, folder_path)
+        
+        with span(f"load {relative_path}", "json"):
+            data = json.loads(snapshot.read_text(entry.path))
+        flat = flatten_json(data)
+        # Sort in ascending order
+        sorted_result = dict(sorted(flat.items()))
+        
+        # Write back to the original file
+        with span(f"write {relative_path}", "write"), open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(sorted_result, f, ensure_ascii=False, indent=2)
+        
+        processed_files.append(relative_path)
     
     return processed_files
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Flatten and sort every translation.json under src/i18n.")
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+
     folder = "src/i18n"
-    processed_files = process_folder(folder)
+    with profiling_session(args, "format_translation"):
+        # Share the src/ snapshot with the other hack/ tools
+        processed_files = process_folder(folder, load_snapshot("src"))
     
     # Log processed files
     print(f"Processed and updated {len(processed_files)} translation.json file(s):")
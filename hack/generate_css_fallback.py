@@ -0,0 +1,181 @@
+# Copyright 2025 RAIDS Lab
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# python3 ./hack/generate_css_fallback.py --src ./src/index.css --out ./src/oklch-fallback.css
+
+"""
+Generate an hsl() fallback layer for the oklch theme variables in src/index.css.
+
+The live theme blocks (`:root`, `.dark`, ...; commented-out blocks are ignored)
+are parsed once, every oklch variable is converted with convert_index_css, and
+the result is wrapped in `@supports not (color: oklch(0 0 0))` so only browsers
+without oklch support apply it. The source hash is stored in the generated
+header, so the file is only rebuilt when src/index.css (or this generator)
+changes.
+
+`make css-fallback` is opt-in: the live theme is written in hsl() today, so
+nothing imports the output. Once a live block uses oklch(), import it in
+src/main.tsx right after index.css so it wins the cascade.
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import sys
+from typing import List, Optional, Tuple
+
+from convert_index_css import OKLCH_PATTERN, convert_css_colors
+from timings import add_profiling_arguments, profiling_session, span
+
+GENERATOR_VERSION = "2"
+
+# `:root {` / `.dark {` blocks at the start of a line
+THEME_BLOCK_PATTERN = re.compile(r'(?:^|\n)[ \t]*([:.][\w-]+)[ \t]*\{([^{}]*)\}')
+COMMENT_PATTERN = re.compile(r'/\*.*?\*/', re.S)
+DECLARATION_PATTERN = re.compile(r'(--[\w-]+)\s*:\s*([^;]+);')
+HASH_HEADER_PATTERN = re.compile(r'source-hash: ([0-9a-f]+)')
+
+def source_hash(css_text: str) -> str:
+    digest = hashlib.sha256()
+    digest.update(GENERATOR_VERSION.encode('utf-8'))
+    digest.update(css_text.encode('utf-8'))
+    return digest.hexdigest()
+
+def parse_theme_blocks(css_text: str) -> List[Tuple[str, List[Tuple[str, str]]]]:
+    """Collect (selector, [(variable, oklch value)]) for every theme block using oklch"""
+    blocks = []
+    # Commented-out themes are not applied by the browser, so they need no fallback
+    css_text = COMMENT_PATTERN.sub('', css_text)
+    for match in THEME_BLOCK_PATTERN.finditer(css_text):
+        selector, body = match.group(1), match.group(2)
+        declarations = [
+            (name, value.strip())
+            for name, value in DECLARATION_PATTERN.findall(body)
+            if OKLCH_PATTERN.search(value)
+        ]
+        if declarations:
+            blocks.append((selector, declarations))
+    return blocks
+
+def render_fallback(blocks: List[Tuple[str, List[Tuple[str, str]]]], digest: str,
+                    src_path: str) -> str:
+    lines = [
+        f'/* This file is generated by generate_css_fallback.py from {src_path} */',
+        '/* Please do not modify this file manually */',
+        f'/* source-hash: {digest} */',
+    ]
+    if not blocks:
+        lines.append(f'/* No live theme block in {src_path} uses oklch(), '
+                     'nothing to fall back to */')
+        return '\n'.join(lines) + '\n'
+    lines += [
+        '',
+        '@supports not (color: oklch(0 0 0)) {',
+    ]
+    for i, (selector, declarations) in enumerate(blocks):
+        if i > 0:
+            lines.append('')
+        lines.append(f'  {selector} {{')
+        for name, value in declarations:
+            lines.append(f'    {name}: {convert_css_colors(value)};')
+        lines.append('  }')
+    lines.append('}')
+    return '\n'.join(lines) + '\n'
+
+def read_existing_hash(out_path: str) -> Optional[str]:
+    try:
+        with open(out_path, 'r', encoding='utf-8') as f:
+            header = f.read(512)
+    except FileNotFoundError:
+        return None
+    match = HASH_HEADER_PATTERN.search(header)
+    return match.group(1) if match else None
+
+def generate_fallback(src_path: str, out_path: str, force: bool = False) -> bool:
+    """Regenerate out_path if the source hash changed. Returns True when written."""
+    with span(f"read {src_path}", "read"):
+        with open(src_path, 'r', encoding='utf-8') as f:
+            css_text = f.read()
+
+    digest = source_hash(css_text)
+    if not force and read_existing_hash(out_path) == digest:
+        return False
+
+    with span("parse theme blocks", "regex"):
+        blocks = parse_theme_blocks(css_text)
+    with span("convert variables", "regex"):
+        relative_src = os.path.relpath(src_path, os.path.dirname(out_path) or '.')
+        content = render_fallback(blocks, digest, relative_src)
+
+    # Write atomically so Vite never picks up a half-written stylesheet
+    with span(f"write {out_path}", "write"):
+        tmp_path = f'{out_path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, out_path)
+
+    variables = sum(len(declarations) for _, declarations in blocks)
+    print(f"Generated {out_path}: {variables} variables in {len(blocks)} theme block(s)")
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate the hsl() fallback layer for oklch theme variables."
+    )
+    parser.add_argument(
+        "--src",
+        default="src/index.css",
+        help="Stylesheet containing the oklch theme blocks."
+    )
+    parser.add_argument(
+        "--out",
+        default="src/oklch-fallback.css",
+        help="Generated fallback stylesheet."
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Regenerate even if the source hash is unchanged."
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Only check whether the fallback is up to date; exit 1 if it is stale."
+    )
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+
+    with profiling_session(args, "generate_css_fallback"):
+        run(args)
+
+def run(args: argparse.Namespace):
+    if not os.path.isfile(args.src):
+        print(f"Error: Stylesheet '{args.src}' not found.")
+        sys.exit(1)
+
+    if args.check:
+        with open(args.src, 'r', encoding='utf-8') as f:
+            digest = source_hash(f.read())
+        if read_existing_hash(args.out) != digest:
+            print(f"❌ {args.out} is out of date, run `make css-fallback`.")
+            sys.exit(1)
+        print(f"✅ {args.out} is up to date.")
+        return
+
+    if not generate_fallback(args.src, args.out, args.force):
+        print(f"✅ {args.out} is up to date, nothing to do.")
+
+if __name__ == "__main__":
+    main()
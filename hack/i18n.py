@@ -29,17 +29,44 @@ Export your key as an environment variable:
 🚀 3. Run the Script
 In the root of your project (where this script lives), run:
     python i18n.py
+
+The model is only contacted when some file still needs processing, and a
+successful connection test is reused for HEALTH_CHECK_TTL seconds
+(--health-ttl, cached in hack/.cache/i18n_health.json).
+
+Simple files (JSX text, placeholder/aria-label/title/alt) are rewritten locally
+by i18n_codemod.py; only files with hard cases go to the model
+(--no-codemod sends everything, --local-only sends nothing).
+
+At the end of the run every rewritten file is checked with one incremental
+tsc and one eslint call (i18n_verify.py); --on-failure revert|requeue undoes
+or retries the files that fail.
+
+Files for the model are sent longest-first by estimated cost (prompt plus
+expected output tokens, timed with the throughput of earlier runs), with an
+ETA on every progress line; --quick-feedback sends the shortest first.
+--estimate prints that projection per target folder without contacting the
+model or writing the translation memory.
 """
 
 import os
+import re
 import json
+import argparse
 import time
 import sys
 import subprocess
-from openai import OpenAI
-import glob
 from pathlib import Path
-from typing import Tuple, Optional, Dict, Any, List
+from typing import Tuple, Optional, Dict, Any, List, Set
+
+from source_snapshot import load_snapshot
+from format_translation import flatten_json
+from i18n_codemod import CodemodResult, apply_edit_list, looks_user_facing, run_codemod
+from i18n_schedule import (FileCost, ProgressReporter, Throughput, count_tokens, estimate_file_cost,
+                           format_duration, load_throughput, save_throughput, schedule, use_model_tokenizer)
+from i18n_verify import print_report, verify_files
+from timings import add_profiling_arguments, profiling_session, span, timed
+from translation_memory import TranslationMemory
 
 # === CONFIGURATION ===
 # API Configuration
@@ -48,21 +75,64 @@ API_KEY = os.getenv("API_KEY", "placeholder")
 MODEL_NAME = os.getenv("MODEL_NAME", "/models/Qwen3-32B")
 MAX_RETRIES = 3
 RETRY_DELAY = 2  # seconds
+# "edits": the model returns a span edit list applied locally, "full": the whole modified file,
+# "json": {code, translations, no_strings} constrained by the endpoint's JSON-schema response_format
+RESPONSE_MODES = ["edits", "full", "json"]
+RESPONSE_MODE = os.getenv("I18N_RESPONSE_MODE", "edits")
 
 # Project Configuration
 PROJECT_ROOT = "./src" 
 TRANSLATION_PATH = Path("i18n/locales/zhCN/translation.json")
+SOURCE_LOCALE = TRANSLATION_PATH.parent.name
 TARGET_FOLDERS = ["components/form", "components/custom", "pages"]
 SCRIPT_VERSION = "1.1.0"  # Update this when making significant changes
 
-client = OpenAI(
-    api_key=API_KEY,
-    base_url=API_BASE_URL
-)
+# A successful connection test is trusted for this long (seconds, 0 disables the cache)
+HEALTH_CHECK_TTL = int(os.getenv("HEALTH_CHECK_TTL", "600"))
+HEALTH_CACHE_PATH = Path(__file__).resolve().parent / ".cache" / "i18n_health.json"
+RUN_HISTORY_PATH = Path(__file__).resolve().parent / ".cache" / "i18n_runs.jsonl"
+
+_client = None
+_memory = None
+_throughput = None
+
+def get_client():
+    """OpenAI client, created on first use so runs that never call the model skip the import"""
+    global _client
+    if _client is None:
+        from openai import OpenAI
+        _client = OpenAI(
+            api_key=API_KEY,
+            base_url=API_BASE_URL
+        )
+    return _client
+
+def get_translation_memory(read_only: bool = False) -> TranslationMemory:
+    """Translation memory, seeded from the locale files on first use; read_only never touches the database file"""
+    global _memory
+    if _memory is None:
+        _memory = TranslationMemory(read_only=read_only)
+        seeded = _memory.seed_from_locales()
+        if seeded:
+            print(f"🧠 Seeded translation memory with {seeded} entries")
+    return _memory
+
+def get_throughput() -> Throughput:
+    """Prefill/decode speed of MODEL_NAME measured by earlier runs, or the defaults"""
+    global _throughput
+    if _throughput is None:
+        _throughput = load_throughput(MODEL_NAME)
+    return _throughput
 
 # 存储格式化失败的文件
 formatting_failures = []
 
+# Files written in this run: absolute path -> {file, original, added_keys}, for verification and revert
+rewritten_files: Dict[str, Dict[str, Any]] = {}
+
+# Model request counters per response mode, reported in the run summary
+model_stats: Dict[str, Dict[str, int]] = {}
+
 # === VERSION CHECK ===
 def has_current_version(filepath: str) -> bool:
     """Check if file already processed with current version"""
@@ -81,11 +151,47 @@ def add_version_comment(filepath: str, content: str) -> str:
     return version_comment + content
 
 # === CONNECTION TEST ===
+def health_cache_key() -> str:
+    return f"{API_BASE_URL}|{MODEL_NAME}"
+
+def load_health_checks() -> Dict[str, float]:
+    try:
+        with open(HEALTH_CACHE_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def has_recent_health_check(ttl: int) -> bool:
+    """True if the same endpoint and model passed the connection test less than ttl seconds ago"""
+    if ttl <= 0:
+        return False
+    checked_at = load_health_checks().get(health_cache_key())
+    return isinstance(checked_at, (int, float)) and 0 <= time.time() - checked_at < ttl
+
+def record_health_check():
+    checks = load_health_checks()
+    checks[health_cache_key()] = time.time()
+    HEALTH_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = HEALTH_CACHE_PATH.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(checks, f, indent=2)
+    os.replace(tmp_path, HEALTH_CACHE_PATH)
+
+def ensure_model_connection(ttl: int = HEALTH_CHECK_TTL) -> bool:
+    """Run the connection test unless a recent one for this endpoint already passed"""
+    if has_recent_health_check(ttl):
+        print(f"✅ Model connection checked within the last {ttl}s, skipping test.")
+        return True
+    if not test_model_connection():
+        return False
+    record_health_check()
+    return True
+
 def test_model_connection() -> bool:
     """Test model connection"""
     print("🔄 Testing model connection...")
     try:
-        response = client.chat.completions.create(
+        response = get_client().chat.completions.create(
             model=MODEL_NAME,
             messages=[
                 {"role": "system", "content": "You are a helpful assistant."},
@@ -203,9 +309,223 @@ def parse_json_with_templates(json_str: str) -> Dict[str, str]:
     
     return translations
 
+# === TRANSLATION MEMORY ===
+JSX_TEXT_PATTERN = re.compile(r'(?<=[>}])([^<>{}]+)(?=[<{])')
+STRING_LITERAL_PATTERN = re.compile(r"""(['"`])((?:(?!\1)[^\\\n$])+)\1""")
+
+def find_source_strings(code: str) -> List[str]:
+    """User-facing string candidates: JSX text and string literals with at least one letter"""
+    candidates = [m.group(1) for m in JSX_TEXT_PATTERN.finditer(code)]
+    candidates += [m.group(2) for m in STRING_LITERAL_PATTERN.finditer(code)]
+    strings = []
+    for text in candidates:
+        text = text.strip()
+        if text and any(c.isalpha() for c in text) and not text.startswith(('.', '/', '@')):
+            strings.append(text)
+    return list(dict.fromkeys(strings))
+
+def count_new_strings(code: str, known: Dict[str, Any]) -> int:
+    """Strings the model will likely have to key: JSX text, and literals that read like UI text"""
+    texts = {m.group(1).strip() for m in JSX_TEXT_PATTERN.finditer(code)}
+    texts = {text for text in texts if any(c.isalpha() for c in text)}
+    texts |= {m.group(2) for m in STRING_LITERAL_PATTERN.finditer(code) if looks_user_facing(m.group(2))}
+    return len(texts - set(known))
+
+def known_translations_section(known: Dict[str, Any]) -> str:
+    if not known:
+        return ""
+    lines = "\n".join(f"- {json.dumps(source, ensure_ascii=False)} -> t('{entry.key}')" for source, entry in known.items())
+    return f"""
+=== KNOWN TRANSLATIONS ===
+These strings already have translation keys. Use exactly these keys with t()
+and do NOT include them in the translations JSON:
+{lines}
+"""
+
 # === OPENAI REQUEST ===
-def call_openai_for_i18n(code: str) -> Optional[Tuple[str, Dict[str, str], bool]]:
-    prompt = f"""
+# The system message names the same answer format as the user prompt of each response mode
+SYSTEM_PROMPTS = {
+    "edits": "You internationalize React applications with react-i18next. "
+             "Answer with a single JSON edit list as specified by the user, never with the rewritten file.",
+    "full": "You internationalize React applications with react-i18next. "
+            "Answer with the fully modified code followed by a flat translations JSON object, as specified by the user.",
+    "json": "You internationalize React applications with react-i18next. "
+            "Answer with one JSON object with the fields code, translations and no_strings, as specified by the user.",
+}
+
+def stream_model_response(prompt: str, code: str, mode: str,
+                          response_format: Optional[Dict[str, Any]] = None) -> str:
+    """Stream one completion, echoing it, and return it without the <think> part"""
+    extra = {"response_format": response_format} if response_format else {}
+    first_token_seconds = 0.0
+    with timed("model request", "model") as request:
+        response = get_client().chat.completions.create(
+            model=MODEL_NAME,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPTS[mode]},
+                {"role": "user", "content": prompt + "\n\nOriginal code:\n" + code}
+            ],
+            stream=True,
+            **extra,
+        )
+
+        full_content = ""
+        thinking_content = ""
+        in_thinking = False
+
+        print("🔄 Receiving stream response:")
+        for chunk in response:
+            delta = chunk.choices[0].delta
+            if delta.content:
+                if not full_content:
+                    first_token_seconds = (time.perf_counter_ns() - request.start_ns) / 1e9
+                content = delta.content
+                print(content, end="", flush=True)
+                full_content += content
+
+                if "<think>" in content:
+                    in_thinking = True
+                    thinking_content += content[content.index("<think>") + len("<think>"):]
+                elif "</think>" in content:
+                    in_thinking = False
+                    thinking_content += content[:content.index("</think>")]
+                    print(f"\n🤔 Model thinking: {thinking_content}")
+                    thinking_content = ""
+                elif in_thinking:
+                    thinking_content += content
+
+    # Remove all thinking content from full_content
+    thinking_tokens = 0
+    if "</think>" in full_content:
+        thinking = full_content[full_content.index("<think>"):full_content.index("</think>") + len("</think>")]
+        thinking_tokens = count_tokens(thinking)
+        full_content = full_content.replace(thinking, "")
+
+    throughput = get_throughput()
+    throughput.update(count_tokens(prompt + code), count_tokens(full_content) + thinking_tokens, thinking_tokens,
+                      first_token_seconds, request.duration)
+    save_throughput(MODEL_NAME, throughput)
+
+    return full_content.strip()
+
+EDITS_FORMAT = """
+=== OUTPUT FORMAT (EDIT LIST) ===
+If file contains NO user-facing strings: return ONLY "NO_STRINGS_TO_TRANSLATE"
+
+Otherwise do NOT return the modified file. Return ONE JSON object:
+{
+  "edits": [{"find": "<exact snippet of the original code>", "replace": "<new snippet>"}],
+  "hooks": ["<ComponentName that needs const { t } = useTranslation()>"],
+  "imports": ["import { useTranslation } from 'react-i18next'"],
+  "translations": {"<key>": "<source text>"}
+}
+
+Rules for edits:
+- "find" must be copied verbatim from the original code and occur exactly ONCE in it;
+  include a few surrounding characters when the text alone is ambiguous
+- Keep each edit as small as possible (one string or one JSX text node)
+- Edits are applied in order and must not overlap
+- Structural changes (moving a Zod schema into the component, turning constants into
+  functions) are edits too: one edit removing the old code, one inserting the new code
+- Do not add the useTranslation hook or import through edits, list them in "hooks" / "imports"
+
+Example:
+{
+  "edits": [
+    {"find": "placeholder=\"Search\"", "replace": "placeholder={t('jobList.searchPlaceholder')}"},
+    {"find": ">Submit</Button>", "replace": ">{t('jobList.submitButton')}</Button>"}
+  ],
+  "hooks": ["JobList"],
+  "imports": ["import { useTranslation } from 'react-i18next'"],
+  "translations": {"jobList.searchPlaceholder": "Search", "jobList.submitButton": "Submit"}
+}
+
+=== IMPORTANT ===
+- NEVER use markdown syntax (```) in response
+- NEVER include explanatory text
+- ALWAYS return a single valid JSON object
+"""
+
+STRUCTURED_FORMAT = """
+=== OUTPUT FORMAT (JSON) ===
+Return ONE JSON object with exactly these fields:
+- "no_strings": true if the file contains NO user-facing strings, otherwise false
+- "code": the fully modified code (empty string when no_strings is true)
+- "translations": a FLAT object of all new key-value pairs ({} when no_strings is true)
+
+=== IMPORTANT ===
+- NEVER use markdown syntax (```) in any field
+- NEVER include explanatory text
+"""
+
+STRUCTURED_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "i18n_result",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "code": {"type": "string"},
+                "translations": {"type": "object", "additionalProperties": {"type": "string"}},
+                "no_strings": {"type": "boolean"},
+            },
+            "required": ["code", "translations", "no_strings"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+def parse_structured_response(full_content: str) -> Optional[Tuple[str, Dict[str, str], bool]]:
+    try:
+        payload = json.loads(full_content)
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(payload, dict):
+        return None
+    code, translations, no_strings = payload.get("code"), payload.get("translations"), payload.get("no_strings")
+    if not isinstance(code, str) or not isinstance(translations, dict) or not isinstance(no_strings, bool):
+        return None
+    return code, {k: v for k, v in translations.items() if isinstance(v, str)}, no_strings
+
+def count_model_event(mode: str, event: str):
+    stats = model_stats.setdefault(mode, {"files": 0, "requests": 0, "retries": 0, "extraction_failures": 0, "fallbacks": 0})
+    stats[event] += 1
+
+def parse_edit_response(full_content: str) -> Optional[Dict[str, Any]]:
+    start, end = full_content.find("{"), full_content.rfind("}")
+    if start == -1 or end <= start:
+        return None
+    try:
+        payload = json.loads(full_content[start:end + 1])
+    except json.JSONDecodeError:
+        return None
+    return payload if isinstance(payload, dict) else None
+
+def existing_translation_keys() -> Set[str]:
+    if not TRANSLATION_PATH.exists():
+        return set()
+    with span("load translation.json", "json"), open(TRANSLATION_PATH, "r", encoding="utf-8") as f:
+        return set(flatten_json(json.load(f)))
+
+def known_translations(code: str) -> Dict[str, Any]:
+    """Source strings of code that already have a key in the translation memory"""
+    return {
+        source: entry
+        for source, entry in get_translation_memory().lookup_many(find_source_strings(code), SOURCE_LOCALE).items()
+        if entry.key
+    }
+
+def build_prompt(mode: str, known: Dict[str, Any]) -> str:
+    """Rules plus the output format of the response mode; the code is appended by stream_model_response"""
+    if mode == "json":
+        no_strings_rule = '- Set "no_strings" to true and leave "code" and "translations" empty'
+    else:
+        no_strings_rule = """- Return only the exact string "NO_STRINGS_TO_TRANSLATE" without any other text
+- Do not return the original code
+- Do not add any import statements"""
+
+    rules = f"""
 You are an expert React/i18n developer helping internationalize a React application using react-i18next. Follow these rules STRICTLY:
 
 === FIRST STEP: FILE ANALYSIS ===
@@ -214,9 +534,7 @@ Determine if the file contains ANY user-facing strings that need internationaliz
 - Technical strings to ignore: variable names, CSS classes, import paths, console logs, comments
 
 If the file contains NO user-facing strings that need translation:
-- Return only the exact string "NO_STRINGS_TO_TRANSLATE" without any other text
-- Do not return the original code
-- Do not add any import statements
+{no_strings_rule}
 
 === COMPONENT RULES (if strings need translation) ===
 1. Functional Components:
@@ -255,6 +573,10 @@ If the file contains NO user-facing strings that need translation:
    - Never modify existing t() calls
    - Maintain original formatting/indentation
 
+{known_translations_section(known)}
+"""
+
+    full_format = f"""
 === OUTPUT FORMAT ===
 If file contains NO user-facing strings: return ONLY "NO_STRINGS_TO_TRANSLATE"
 
@@ -325,58 +647,86 @@ function LoginForm() {{
 - If unsure about a string, ASK via <think> tags
 """
 
+    output_format = {"edits": EDITS_FORMAT, "json": STRUCTURED_FORMAT}.get(mode, full_format)
+    return rules + output_format
+
+def call_openai_for_i18n(code: str, mode: str = "edits") -> Optional[Tuple[str, Dict[str, str], bool]]:
+    """Ask the model to internationalize code, as an edit list or (mode="full") the whole file"""
+    memory = get_translation_memory()
+    known = known_translations(code)
+    if known:
+        print(f"🧠 {len(known)} strings found in the translation memory")
+
+    prompt = build_prompt(mode, known)
+    count_model_event(mode, "files")
+
     for attempt in range(MAX_RETRIES):
         try:
-            print("\n🔄 Sending request to model...")
-            response = client.chat.completions.create(
-                model=MODEL_NAME,
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant for internationalizing React applications."},
-                    {"role": "user", "content": prompt + "\n\nOriginal code:\n" + code}
-                ],
-                stream=True,
-            )
+            print(f"\n🔄 Sending request to model ({mode} mode)...")
+            count_model_event(mode, "requests")
+            if attempt > 0:
+                count_model_event(mode, "retries")
 
-            full_content = ""
-            thinking_content = ""
-            in_thinking = False
-            
-            print("🔄 Receiving stream response:")
-            for chunk in response:
-                delta = chunk.choices[0].delta
-                if delta.content:
-                    content = delta.content
-                    print(content, end="", flush=True)
-                    full_content += content
-                    
-                    if "<think>" in content:
-                        in_thinking = True
-                        thinking_content += content[content.index("<think>") + len("<think>"):]
-                    elif "</think>" in content:
-                        in_thinking = False
-                        thinking_content += content[:content.index("</think>")]
-                        print(f"\n🤔 Model thinking: {thinking_content}")
-                        thinking_content = ""
-                    elif in_thinking:
-                        thinking_content += content
-
-            # Remove all thinking content from full_content
-            if "</think>" in full_content:
-                full_content = full_content.replace(full_content[full_content.index("<think>"):full_content.index("</think>") + len("</think>")], "")
+            if mode == "json":
+                # The schema is enforced by the endpoint, so one json.loads validates the answer
+                full_content = stream_model_response(prompt, code, mode, STRUCTURED_RESPONSE_FORMAT)
+                structured = parse_structured_response(full_content)
+                if structured and structured[2]:
+                    print("\n✅ File contains no user-facing strings to translate")
+                    return None, {}, True
+                result = structured[:2] if structured and structured[0].strip() else None
+                if result is None:
+                    count_model_event(mode, "extraction_failures")
+                    print("\n⚠️ Structured response did not match the schema")
+                    if attempt < MAX_RETRIES - 1:
+                        print("Retrying...")
+                        time.sleep(RETRY_DELAY)
+                        continue
+                    raise ValueError("No valid structured response after multiple attempts")
+                code_part, translations = result
+                memory.record(
+                    ((value, value, key) for key, value in translations.items()), SOURCE_LOCALE, MODEL_NAME
+                )
+                return code_part, translations, False
+
+            full_content = stream_model_response(prompt, code, mode)
 
             # Check for the special marker indicating no strings to translate
-            full_content = full_content.strip()
             if "NO_STRINGS_TO_TRANSLATE" in full_content:
                 print("\n✅ File contains no user-facing strings to translate")
                 return None, {}, True  # Return with a flag indicating no translation needed
 
             full_content = full_content.replace("```ts", "").replace("```tsx", "").replace("```json", "").replace("```", "").strip()
 
-            result = extract_code_and_json(full_content)
+            if mode == "edits":
+                payload = parse_edit_response(full_content)
+                if payload is None:
+                    errors = ["response is not a JSON object"]
+                else:
+                    with span("apply edit list", "regex"):
+                        code_part, translations, errors = apply_edit_list(code, payload, existing_translation_keys())
+                if errors:
+                    print("\n⚠️ Edit list could not be applied:")
+                    for error in errors[:10]:
+                        print(f"  - {error}")
+                    print("↩️  Falling back to full-file mode")
+                    count_model_event(mode, "fallbacks")
+                    return call_openai_for_i18n(code, "full")
+                print(f"\n✂️  Applied {len(payload.get('edits', []))} edits locally")
+                result = code_part, translations
+            else:
+                result = extract_code_and_json(full_content)
+
             if result:
                 code_part, translations = result
+                memory.record(
+                    ((value, value, key) for key, value in translations.items() if isinstance(value, str)),
+                    SOURCE_LOCALE,
+                    MODEL_NAME,
+                )
                 return code_part, translations, False  # Return with flag indicating translation was performed
             else:
+                count_model_event(mode, "extraction_failures")
                 print("\n⚠️ Failed to extract code and JSON from response")
                 if attempt < MAX_RETRIES - 1:
                     print("Retrying...")
@@ -396,17 +746,29 @@ function LoginForm() {{
     return None, {}, False
 
 # === TRANSLATION UPDATE ===
-def update_translation_json(new_keys: Dict[str, str]):
+def update_translation_json(new_keys: Dict[str, str]) -> List[str]:
+    """Merge new keys (existing values win); returns the keys that were actually added"""
     if TRANSLATION_PATH.exists():
-        with open(TRANSLATION_PATH, "r", encoding="utf-8") as f:
+        with span("load translation.json", "json"), open(TRANSLATION_PATH, "r", encoding="utf-8") as f:
             existing = json.load(f)
     else:
         existing = {}
 
     merged = {**new_keys, **existing}
     TRANSLATION_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with open(TRANSLATION_PATH, "w", encoding="utf-8") as f:
+    with span("write translation.json", "json"), open(TRANSLATION_PATH, "w", encoding="utf-8") as f:
         json.dump(merged, f, indent=2, ensure_ascii=False)
+    return [key for key in new_keys if key not in existing]
+
+def remove_translation_keys(keys: List[str]):
+    if not keys or not TRANSLATION_PATH.exists():
+        return
+    with span("load translation.json", "json"), open(TRANSLATION_PATH, "r", encoding="utf-8") as f:
+        existing = json.load(f)
+    for key in keys:
+        existing.pop(key, None)
+    with span("write translation.json", "json"), open(TRANSLATION_PATH, "w", encoding="utf-8") as f:
+        json.dump(existing, f, indent=2, ensure_ascii=False)
 
 # === FORMAT FILE ===
 def format_with_prettier(filepath: str) -> bool:
@@ -415,13 +777,14 @@ def format_with_prettier(filepath: str) -> bool:
         print(f"🔍 Running Prettier on: {filepath}")
         # 确保相对于项目根目录运行命令
         project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-        result = subprocess.run(
-            ["pnpm", "dlx", "prettier", "--write", os.path.join(PROJECT_ROOT, filepath)],
-            cwd=project_root,
-            capture_output=True,
-            text=True,
-            check=False
-        )
+        with span(f"prettier {filepath}", "subprocess"):
+            result = subprocess.run(
+                ["pnpm", "dlx", "prettier", "--write", os.path.join(PROJECT_ROOT, filepath)],
+                cwd=project_root,
+                capture_output=True,
+                text=True,
+                check=False
+            )
         
         if result.returncode != 0:
             print(f"⚠️ Prettier formatting failed: {result.stderr}")
@@ -434,27 +797,71 @@ def format_with_prettier(filepath: str) -> bool:
         return False
 
 # === PROCESS EACH FILE ===
-def process_file(filepath: str):
-    print(f"\n📄 Processing file: {filepath}")
-    
+def needs_processing(filepath: str) -> bool:
+    """Cheap pre-check on the first line, so skipped files never need the model"""
     if has_current_version(filepath):
-        print(f"⚠️ Skipping: File already processed with version {SCRIPT_VERSION}")
-        return
-
+        print(f"⚠️ Skipping {filepath}: File already processed with version {SCRIPT_VERSION}")
+        return False
     with open(filepath, "r", encoding="utf-8") as f:
-        original_code = f.read()
+        first_line = f.readline()
+    if first_line.startswith("// ignore-i18n-script"):
+        print(f"⚠️ Skipping {filepath}: File contains ignore comment.")
+        return False
+    return True
 
-    if original_code.startswith("// ignore-i18n-script"):
-        print("⚠️ Skipping: File contains ignore comment.")
-        return
+def read_source_file(filepath: str) -> str:
+    with span(f"read {filepath}", "read"), open(filepath, "r", encoding="utf-8") as f:
+        return f.read()
 
-    result = call_openai_for_i18n(original_code)
+def run_local_codemod(filepath: str, code: str) -> CodemodResult:
+    """Rewrite the mechanical cases without the model, reusing keys from the translation memory"""
+    existing = {}
+    if TRANSLATION_PATH.exists():
+        with span("load translation.json", "json"), open(TRANSLATION_PATH, "r", encoding="utf-8") as f:
+            existing = flatten_json(json.load(f))
+    memory = get_translation_memory()
+
+    def known_key(text: str) -> Optional[str]:
+        entry = memory.lookup(text, SOURCE_LOCALE)
+        return entry.key if entry else None
+
+    stem = Path(filepath).name.split(".")[0]
+    component_name = "".join(part.capitalize() for part in re.split(r"[-_]", stem) if part)
+    with span(f"codemod {filepath}", "regex"):
+        return run_codemod(code, component_name, existing, known_key)
+
+def process_file_locally(filepath: str) -> bool:
+    """Try the local codemod; returns False when the file has to go to the model"""
+    original_code = read_source_file(filepath)
+    result = run_local_codemod(filepath, original_code)
+    if result.needs_model:
+        print(f"🤖 {filepath} needs the model:")
+        for reason in result.hard_cases[:5]:
+            print(f"  - {reason}")
+        return False
+
+    print(f"\n🛠️  Rewritten locally: {filepath}")
+    get_translation_memory().record(
+        ((value, value, key) for key, value in result.translations.items()), SOURCE_LOCALE, "codemod"
+    )
+    write_result(filepath, original_code, result.code, result.translations, not result.translations)
+    return True
+
+def process_file(filepath: str, mode: str = RESPONSE_MODE):
+    print(f"\n📄 Processing file: {filepath}")
+
+    original_code = read_source_file(filepath)
+
+    result = call_openai_for_i18n(original_code, mode)
     if result is None:
         print(f"❌ Failed to process file {filepath}")
         return
         
     new_code, translations, no_strings_flag = result
-    
+    write_result(filepath, original_code, new_code, translations, no_strings_flag)
+
+def write_result(filepath: str, original_code: str, new_code: Optional[str],
+                 translations: Dict[str, str], no_strings_flag: bool):
     if no_strings_flag:
         # Just add version comment without modifying the code
         version_comment = f"// i18n-processed-v{SCRIPT_VERSION} (no translatable strings)\n"
@@ -466,7 +873,7 @@ def process_file(filepath: str):
         else:
             new_code = version_comment + original_code
             
-        with open(filepath, "w", encoding="utf-8") as f:
+        with span(f"write {filepath}", "write"), open(filepath, "w", encoding="utf-8") as f:
             f.write(new_code)
             
         print(f"\n✅ File marked as processed (no translatable strings): {filepath}")
@@ -476,36 +883,199 @@ def process_file(filepath: str):
     
     # Verify useTranslation placement
     if "useTranslation" in new_code:
-        if "const { t } = useTranslation();" not in new_code:
+        if not re.search(r"const\s*\{\s*t\s*\}\s*=\s*useTranslation\(", new_code):
             print("⚠️ Warning: useTranslation may not be properly initialized inside component")
     
     # Add version comment
     new_code = add_version_comment(filepath, new_code)
     
-    with open(filepath, "w", encoding="utf-8") as f:
+    with span(f"write {filepath}", "write"), open(filepath, "w", encoding="utf-8") as f:
         f.write(new_code)
 
     print(f"\n✅ File updated: {filepath}")
-    update_translation_json(translations)
+    added_keys = update_translation_json(translations)
     print(f"🌍 Added {len(translations)} new translations.")
+    rewritten_files[os.path.abspath(filepath)] = {"file": filepath, "original": original_code, "added_keys": added_keys}
     
     # 格式化已修改的文件
     format_with_prettier(filepath)
 
+# === VERIFICATION ===
+def revert_file(path: str):
+    """Restore a rewritten file and drop the translation keys it added"""
+    entry = rewritten_files.pop(path)
+    with span(f"write {entry['file']}", "write"), open(path, "w", encoding="utf-8") as f:
+        f.write(entry["original"])
+    remove_translation_keys(entry["added_keys"])
+    print(f"↩️  Reverted {entry['file']}")
+
+def verify_rewrites(on_failure: str):
+    """One tsc and one eslint pass over every rewritten file, then report, revert or requeue failures"""
+    by_file = verify_files(rewritten_files)
+    if by_file is None:
+        return
+    failed = print_report(by_file)
+    if not failed or on_failure == "report":
+        return
+
+    requeue = [rewritten_files[path]["file"] for path in failed]
+    for path in failed:
+        revert_file(path)
+    if on_failure != "requeue":
+        return
+
+    # One more try with the whole file regenerated by the model, then revert what still fails
+    print(f"\n🔁 Requeueing {len(requeue)} files in full-file mode...")
+    for file in requeue:
+        process_file(file, "full")
+    retried = {path: entry for path, entry in rewritten_files.items() if entry["file"] in requeue}
+    by_file = verify_files(retried)
+    if by_file is None:
+        return
+    for path in print_report(by_file):
+        revert_file(path)
+
+# === RUN SUMMARY ===
+def report_model_stats():
+    """Print retry rates per response mode next to the previous run's, and append this run to the history"""
+    if not model_stats:
+        return
+    previous: Dict[str, Dict[str, int]] = {}
+    if RUN_HISTORY_PATH.exists():
+        with open(RUN_HISTORY_PATH, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    previous.update(json.loads(line).get("modes", {}))
+                except json.JSONDecodeError:
+                    continue
+
+    print("\n📊 Model requests by response mode:")
+    for mode, stats in model_stats.items():
+        rate = stats["retries"] / stats["requests"] * 100 if stats["requests"] else 0.0
+        line = (f"  - {mode}: {stats['files']} files, {stats['requests']} requests, "
+                f"{stats['retries']} retries ({rate:.1f}%), {stats['extraction_failures']} extraction failures")
+        if stats["fallbacks"]:
+            line += f", {stats['fallbacks']} fallbacks to full"
+        before = previous.get(mode)
+        if before and before.get("requests"):
+            line += f" | previous run: {before['retries'] / before['requests'] * 100:.1f}% retries"
+        print(line)
+
+    RUN_HISTORY_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(RUN_HISTORY_PATH, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"date": time.strftime("%Y-%m-%dT%H:%M:%S"), "model": MODEL_NAME, "modes": model_stats}) + "\n")
+
+# === SCHEDULING ===
+def estimate_cost(filepath: str, mode: str) -> FileCost:
+    code = read_source_file(filepath)
+    known = known_translations(code)
+    return estimate_file_cost(filepath, build_prompt(mode, known) + code, code, mode,
+                              count_new_strings(code, known), get_throughput())
+
+def print_estimate(files: List[str], mode: str, use_codemod: bool):
+    """Projected tokens and model time per target folder; everything is computed locally"""
+    tokenizer = use_model_tokenizer(MODEL_NAME)
+    throughput = get_throughput()
+    print(f"🔢 Tokens counted with {tokenizer or 'a chars-per-token heuristic (no local tokenizer for the model)'}")
+    if throughput.samples:
+        print(f"⏱️  Throughput measured over {throughput.samples} requests: "
+              f"{throughput.prefill_tps:.0f} prompt tok/s, {throughput.decode_tps:.1f} output tok/s")
+    else:
+        print(f"⏱️  No recorded throughput yet, assuming {throughput.prefill_tps:.0f} prompt tok/s, "
+              f"{throughput.decode_tps:.1f} output tok/s")
+
+    rows = {folder: {"files": 0, "model": 0, "prompt": 0, "output": 0, "seconds": 0.0} for folder in TARGET_FOLDERS}
+    for file in files:
+        row = rows[next(folder for folder in TARGET_FOLDERS if file.startswith(folder + "/"))]
+        row["files"] += 1
+        if use_codemod and not run_local_codemod(file, read_source_file(file)).needs_model:
+            continue
+        cost = estimate_cost(file, mode)
+        row["model"] += 1
+        row["prompt"] += cost.prompt_tokens
+        row["output"] += cost.output_tokens
+        row["seconds"] += cost.seconds
+
+    print(f"\n📐 Estimate for {mode} mode:")
+    print(f"  {'folder':<20} {'files':>6} {'model':>6} {'prompt tok':>11} {'output tok':>11} {'time':>8}")
+    total = {"files": 0, "model": 0, "prompt": 0, "output": 0, "seconds": 0.0}
+    for folder, row in rows.items():
+        for field in total:
+            total[field] += row[field]
+        print(f"  {folder:<20} {row['files']:>6} {row['model']:>6} {row['prompt']:>11} {row['output']:>11} "
+              f"{format_duration(row['seconds']):>8}")
+    print(f"  {'total':<20} {total['files']:>6} {total['model']:>6} {total['prompt']:>11} {total['output']:>11} "
+          f"{format_duration(total['seconds']):>8}")
+
 # === FILE SCANNER ===
-def find_all_tsx_jsx_files():
+def find_all_tsx_jsx_files(persist: bool = True):
     files = []
+    # Shared walk of PROJECT_ROOT (skips node_modules, dist, .venv, ...)
+    snapshot = load_snapshot(PROJECT_ROOT, persist)
     # cd PROJECT_ROOT
     os.chdir(PROJECT_ROOT)
     for folder in TARGET_FOLDERS:
         for ext in ("tsx", "ts", "jsx", "js"):
-            for file in glob.glob(f"{folder}/**/*.{ext}", recursive=True):
-                if not any(skip in file for skip in ["node_modules", "dist", ".venv"]):
-                    files.append(file)
+            for entry in snapshot.files(extensions=(f".{ext}",), under=folder):
+                files.append(entry.path)
     return files
 
 # === MAIN ENTRYPOINT ===
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Internationalize React components with the configured model.")
+    parser.add_argument(
+        "--no-codemod",
+        action="store_true",
+        help="Send every file to the model instead of rewriting simple files locally."
+    )
+    parser.add_argument(
+        "--local-only",
+        action="store_true",
+        help="Only apply the local codemod; leave files that need the model untouched."
+    )
+    parser.add_argument(
+        "--response-mode",
+        choices=RESPONSE_MODES,
+        default=RESPONSE_MODE,
+        help="Ask the model for an edit list (falls back to full on failure), the full modified file, "
+             "or schema-constrained JSON."
+    )
+    parser.add_argument(
+        "--estimate",
+        action="store_true",
+        help="Only print projected tokens and model time per target folder; nothing is sent or written."
+    )
+    parser.add_argument(
+        "--quick-feedback",
+        action="store_true",
+        help="Send the cheapest files to the model first instead of the most expensive ones."
+    )
+    parser.add_argument(
+        "--no-verify",
+        action="store_true",
+        help="Skip the end-of-run tsc/eslint pass over the rewritten files."
+    )
+    parser.add_argument(
+        "--on-failure",
+        choices=["report", "revert", "requeue"],
+        default="report",
+        help="What to do with rewritten files that fail verification."
+    )
+    parser.add_argument(
+        "--health-ttl",
+        type=int,
+        default=HEALTH_CHECK_TTL,
+        help="Reuse a successful connection test for this many seconds (0 always re-tests)."
+    )
+    add_profiling_arguments(parser)
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
+    with profiling_session(args, "i18n"):
+        run(args)
+
+def run(args: argparse.Namespace):
     print("\n🚀 Starting i18n conversion...")
     print(f"🔧 Configuration:")
     print(f"  - Model: {MODEL_NAME}")
@@ -514,18 +1084,57 @@ def main():
     print(f"  - Translation file: {TRANSLATION_PATH}")
     print(f"  - Script version: {SCRIPT_VERSION}\n")
     
-    if not test_model_connection():
-        print("❌ Cannot connect to model, please check your configuration.")
+    # --estimate writes nothing, not even the snapshot cache
+    files = find_all_tsx_jsx_files(persist=not args.estimate)
+    print(f"\n📁 Found {len(files)} files.")
+
+    with span("check processed markers", "read"):
+        pending = [file for file in files if needs_processing(file)]
+    if not pending:
+        print("\n🎉 Done! Every file is already processed, nothing to send to the model.")
         return
-        
-    files = find_all_tsx_jsx_files()
-    print(f"\n📁 Found {len(files)} files to process.")
+    print(f"\n📝 {len(pending)} files to process.")
+
+    if args.estimate:
+        # Estimating must not create or seed the on-disk translation memory
+        get_translation_memory(read_only=True)
+        print_estimate(pending, args.response_mode, not args.no_codemod)
+        return
+
+    # Simple files are rewritten locally, the model only sees the hard cases
+    model_files = pending
+    if not args.no_codemod:
+        model_files = [file for file in pending if not process_file_locally(file)]
+        print(f"\n🛠️  {len(pending) - len(model_files)} files rewritten locally, {len(model_files)} need the model.")
+
+    if model_files and args.local_only:
+        print("\n⏭️  --local-only: leaving these files for a later run:")
+        for file in model_files:
+            print(f"  - {file}")
+        model_files = []
+
+    if model_files:
+        with span("connection test", "model"):
+            connected = ensure_model_connection(args.health_ttl)
+        if not connected:
+            print("❌ Cannot connect to model, please check your configuration.")
+            return
+
+        with span("estimate costs", "read"):
+            costs = schedule([estimate_cost(file, args.response_mode) for file in model_files], args.quick_feedback)
+        progress = ProgressReporter(costs)
+        order = "shortest" if args.quick_feedback else "longest"
+        print(f"\n⏳ Estimated model time: {format_duration(progress.total)} for {len(costs)} files, {order} first.")
+        for cost in costs:
+            progress.start(cost)
+            process_file(cost.file, args.response_mode)
+            progress.finish(cost)
 
-    for i, file in enumerate(files, 1):
-        print(f"\n🔧 Processing progress: {i}/{len(files)}")
-        process_file(file)
+    if rewritten_files and not args.no_verify:
+        verify_rewrites(args.on_failure)
 
     print("\n🎉 Done! All files processed and translation file updated.")
+    report_model_stats()
     
     # 输出格式化失败的文件列表
     if formatting_failures:
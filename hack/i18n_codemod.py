@@ -0,0 +1,666 @@
+# Copyright 2025 RAIDS Lab
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# python3 ./hack/i18n_codemod.py src/components/form/duration-fields.tsx
+
+"""
+🛠️  Local codemod for the mechanical part of hack/i18n.py
+
+A small JSX scanner finds the text children and the placeholder / aria-label /
+title / alt attributes inside function components, wraps them in
+t('component.key') with keys derived from the component and the element, adds
+the useTranslation import and the `const { t } = useTranslation()` hook.
+
+Files it cannot rewrite safely come back with `hard_cases` set and are left to
+the model: module-level strings (Zod schemas, constants that must become
+functions), text mixed with expressions, strings in other positions, ...
+A file without targets is only reported as having no strings when its
+components contain no alphabetic string literal at all.
+"""
+
+import argparse
+import os
+import re
+import sys
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from timings import add_profiling_arguments, profiling_session, span
+
+TRANSLATABLE_ATTRIBUTES = {
+    'placeholder': 'Placeholder',
+    'aria-label': 'AriaLabel',
+    'title': 'Title',
+    'alt': 'Alt',
+}
+
+# Attributes whose string values are never shown to the user
+TECHNICAL_ATTRIBUTES = {
+    'className', 'class', 'id', 'key', 'href', 'to', 'src', 'type', 'name', 'variant', 'size',
+    'side', 'align', 'role', 'htmlFor', 'form', 'method', 'target', 'rel', 'mode', 'orientation',
+    'autoComplete', 'inputMode', 'accept', 'lang', 'dir', 'style', 'value', 'defaultValue',
+    'width', 'height', 'viewBox', 'fill', 'stroke', 'd', 'xmlns', 'sizes', 'pattern', 'step',
+    'min', 'max', 'language', 'theme', 'position', 'sideOffset', 'collisionPadding',
+}
+
+# Elements whose text is code or already handled by i18next
+SKIP_TEXT_ELEMENTS = {'code', 'pre', 'kbd', 'samp', 'style', 'script', 'Trans'}
+
+NON_ASCII_LETTER = re.compile(r'[^\x00-\x7f]')
+ENTITY_PATTERN = re.compile(r'&(?:#\d+|#x[0-9a-fA-F]+|\w+);')
+TAG_NAME_PATTERN = re.compile(r'[A-Za-z][\w.:-]*')
+ATTRIBUTE_NAME_PATTERN = re.compile(r'[A-Za-z_][\w:.-]*')
+WORD_PATTERN = re.compile(r'[A-Za-z0-9]+')
+
+FUNCTION_COMPONENT_PATTERN = re.compile(r'\bfunction\s+([A-Z]\w*)\s*(?:<[^>()]*>)?\s*\(')
+ANONYMOUS_DEFAULT_PATTERN = re.compile(r'\bexport\s+default\s+function\s*\(')
+ARROW_COMPONENT_PATTERN = re.compile(
+    r'\b(?:const|let)\s+([A-Z]\w*)\s*(?::[^=\n]+)?=\s*'
+    r'(?:(?:React\.)?(?:memo|forwardRef)(?:<[^>()]*>)?\(\s*)?(?:async\s*)?(?:<[^>()]*>)?\s*\('
+)
+SHADOWED_T_PATTERN = re.compile(
+    r'(?:\(|,)\s*t\s*(?::[^,)]+)?\)\s*=>|(?<![\w.$])t\s*=>|\b(?:const|let|var)\s+t\b'
+)
+IMPORT_STATEMENT_PATTERN = re.compile(
+    r'^import\b[^;\'"]*?(?:\bfrom\s*)?([\'"])[^\'"\n]+\1;?', re.M
+)
+# `<T,>(...) =>` and `<T extends X>(...) =>` in .tsx files
+GENERIC_PARAMS_PATTERN = re.compile(r'<[A-Za-z_]\w*\s*(?:,|extends\b)')
+I18NEXT_NAMED_IMPORT_PATTERN = re.compile(r'import\s*\{([^}]*)\}\s*from\s*([\'"])react-i18next\2')
+
+class ScanError(Exception):
+    pass
+
+@dataclass
+class Literal:
+    start: int
+    end: int
+    value: str
+    attribute: Optional[str] = None  # set for JSX attribute values
+    tag: Optional[str] = None
+
+@dataclass
+class TextNode:
+    start: int
+    end: int
+    value: str
+    tag: str
+    mixed: bool  # an expression sits directly next to the text
+
+@dataclass
+class Component:
+    name: str
+    body_start: int  # index of the `{` opening the body, or -1 for expression bodies
+    start: int
+    end: int
+
+@dataclass
+class CodemodResult:
+    code: str
+    translations: Dict[str, str] = field(default_factory=dict)
+    hard_cases: List[str] = field(default_factory=list)
+
+    @property
+    def needs_model(self) -> bool:
+        return bool(self.hard_cases)
+
+class JsxScanner:
+    """Splits TSX source into string literals, JSX text nodes and brace pairs"""
+
+    def __init__(self, code: str):
+        self.code = code
+        self.i = 0
+        self.literals: List[Literal] = []
+        self.texts: List[TextNode] = []
+        self.blocks: Dict[int, int] = {}  # `{` index -> matching `}` index
+        self.has_jsx = False
+
+    def scan(self) -> "JsxScanner":
+        self.scan_code(None)
+        return self
+
+    # === CODE ===
+    def skip_comment(self) -> bool:
+        code, i = self.code, self.i
+        if code.startswith('//', i):
+            end = code.find('\n', i)
+            self.i = len(code) if end == -1 else end
+            return True
+        if code.startswith('/*', i):
+            end = code.find('*/', i + 2)
+            if end == -1:
+                raise ScanError("unterminated comment")
+            self.i = end + 2
+            return True
+        return False
+
+    def previous_significant(self, index: int) -> Tuple[str, str]:
+        """The last non-space character before index and the identifier it ends, if any"""
+        j = index - 1
+        while j >= 0 and self.code[j].isspace():
+            j -= 1
+        if j < 0:
+            return '', ''
+        k = j
+        while k >= 0 and (self.code[k].isalnum() or self.code[k] in '_$'):
+            k -= 1
+        return self.code[j], self.code[k + 1:j + 1]
+
+    def starts_jsx(self) -> bool:
+        code, i = self.code, self.i
+        if i + 1 >= len(code) or not (code[i + 1].isalpha() or code[i + 1] == '>'):
+            return False
+        if GENERIC_PARAMS_PATTERN.match(code, i):
+            return False
+        char, word = self.previous_significant(i)
+        if word:
+            return word in ('return', 'yield', 'default', 'case')
+        return char == '' or char in '(,=:?&|{[!;>'
+
+    def read_string(self, quote: str) -> Tuple[int, int, str]:
+        code, start = self.code, self.i
+        j = start + 1
+        while j < len(code):
+            if code[j] == '\\':
+                j += 2
+                continue
+            if code[j] == quote:
+                self.i = j + 1
+                return start, j + 1, code[start + 1:j]
+            if code[j] == '\n' and quote != '`':
+                break
+            j += 1
+        raise ScanError(f"unterminated string at {start}")
+
+    def read_template(self):
+        code, start = self.code, self.i
+        self.i += 1
+        has_expression = False
+        while self.i < len(code):
+            char = code[self.i]
+            if char == '\\':
+                self.i += 2
+            elif char == '`':
+                self.i += 1
+                if not has_expression:
+                    self.literals.append(Literal(start, self.i, code[start + 1:self.i - 1]))
+                return
+            elif code.startswith('${', self.i):
+                has_expression = True
+                self.i += 2
+                self.scan_code('}')
+            else:
+                self.i += 1
+        raise ScanError(f"unterminated template literal at {start}")
+
+    def scan_code(self, closing: Optional[str]):
+        """Scan code until the unmatched `closing` bracket (consumed) or the end of input"""
+        code = self.code
+        pairs = {'{': '}', '(': ')', '[': ']'}
+        stack: List[Tuple[str, int]] = []
+        while self.i < len(code):
+            if self.skip_comment():
+                continue
+            char = code[self.i]
+            if char in '\'"':
+                start, end, value = self.read_string(char)
+                self.literals.append(Literal(start, end, value))
+            elif char == '`':
+                self.read_template()
+            elif char == '<' and self.starts_jsx():
+                self.has_jsx = True
+                self.scan_element()
+            elif char in pairs:
+                stack.append((pairs[char], self.i))
+                self.i += 1
+            elif char in ')]}':
+                if not stack:
+                    if char == closing:
+                        self.i += 1
+                        return
+                    raise ScanError(f"unbalanced '{char}' at {self.i}")
+                expected, opened = stack.pop()
+                if expected != char:
+                    raise ScanError(f"mismatched '{char}' at {self.i}")
+                if char == '}':
+                    self.blocks[opened] = self.i
+                self.i += 1
+            else:
+                self.i += 1
+        if closing or stack:
+            raise ScanError("unexpected end of file")
+
+    # === JSX ===
+    def skip_space(self):
+        while self.i < len(self.code) and self.code[self.i].isspace():
+            self.i += 1
+
+    def scan_expression_container(self) -> bool:
+        """Scan `{...}` at self.i; returns True if it only holds a comment or a space literal"""
+        start = self.i
+        self.i += 1
+        literal_count = len(self.literals)
+        self.scan_code('}')
+        inner = re.sub(r'/\*.*?\*/', '', self.code[start + 1:self.i - 1], flags=re.S).strip()
+        if inner in ("' '", '" "', ''):
+            del self.literals[literal_count:]
+            return True
+        return False
+
+    def scan_element(self):
+        code = self.code
+        self.i += 1
+        if code[self.i] == '>':
+            self.i += 1
+            self.scan_children('')
+            return
+
+        match = TAG_NAME_PATTERN.match(code, self.i)
+        if not match:
+            raise ScanError(f"bad tag at {self.i}")
+        tag = match.group(0)
+        self.i = match.end()
+
+        while True:
+            self.skip_space()
+            if self.i >= len(code):
+                raise ScanError(f"unterminated <{tag}>")
+            if code.startswith('/>', self.i):
+                self.i += 2
+                return
+            if code[self.i] == '>':
+                self.i += 1
+                self.scan_children(tag)
+                return
+            if code[self.i] == '{':
+                self.scan_expression_container()
+                continue
+            if self.skip_comment():
+                continue
+            attr = ATTRIBUTE_NAME_PATTERN.match(code, self.i)
+            if not attr:
+                raise ScanError(f"bad attribute in <{tag}> at {self.i}")
+            self.i = attr.end()
+            self.skip_space()
+            if self.i < len(code) and code[self.i] == '=':
+                self.i += 1
+                self.skip_space()
+                if code[self.i] in '\'"':
+                    start, end, value = self.read_string(code[self.i])
+                    self.literals.append(Literal(start, end, value, attr.group(0), tag))
+                elif code[self.i] == '{':
+                    self.scan_expression_container()
+                else:
+                    raise ScanError(f"bad attribute value in <{tag}> at {self.i}")
+
+    def scan_children(self, tag: str):
+        code = self.code
+        previous = 'tag'
+        while True:
+            start = self.i
+            while self.i < len(code) and code[self.i] not in '<{':
+                self.i += 1
+            if self.i >= len(code):
+                raise ScanError(f"unterminated <{tag}>")
+
+            text = code[start:self.i]
+            nxt = 'tag'
+            if code[self.i] == '{':
+                save = self.i
+                nxt = 'tag' if self.scan_expression_container() else 'expr'
+                self.i = save
+            if text.strip():
+                self.texts.append(TextNode(start, self.i, text, tag, previous == 'expr' or nxt == 'expr'))
+
+            if code[self.i] == '{':
+                previous = 'tag' if self.scan_expression_container() else 'expr'
+            elif code.startswith('</', self.i):
+                end = code.find('>', self.i)
+                if end == -1:
+                    raise ScanError(f"unterminated </{tag}>")
+                self.i = end + 1
+                return
+            else:
+                self.scan_element()
+                previous = 'tag'
+
+def find_components(code: str, scanner: JsxScanner, default_name: str) -> List[Component]:
+    """Function and arrow components with the range of their bodies"""
+    components = []
+
+    def params_end(open_paren: int) -> int:
+        depth = 0
+        for j in range(open_paren, len(code)):
+            if code[j] in '([{':
+                depth += 1
+            elif code[j] in ')]}':
+                depth -= 1
+                if depth == 0:
+                    return j
+        return -1
+
+    def body_after(j: int) -> int:
+        """Index of the `{` opening a body after the parameter list, -1 for expression bodies"""
+        depth = 0
+        while j < len(code):
+            char = code[j]
+            if char in '<(':
+                depth += 1
+            elif char in '>)' and code[j - 1] != '=':
+                depth -= 1
+            elif depth <= 0 and code.startswith('=>', j):
+                k = j + 2
+                while k < len(code) and code[k].isspace():
+                    k += 1
+                return k if k < len(code) and code[k] == '{' else -1
+            elif depth <= 0 and char == '{':
+                # `{` right after `)` or a return type opens the body; a type literal follows `:`
+                before = code[:j].rstrip()
+                if not before.endswith(':'):
+                    return j
+            j += 1
+        return -1
+
+    matches = [(m.group(1), m.end() - 1, m.start()) for m in FUNCTION_COMPONENT_PATTERN.finditer(code)]
+    matches += [(default_name, m.end() - 1, m.start()) for m in ANONYMOUS_DEFAULT_PATTERN.finditer(code)]
+    matches += [(m.group(1), m.end() - 1, m.start()) for m in ARROW_COMPONENT_PATTERN.finditer(code)]
+    for name, open_paren, start in matches:
+        close = params_end(open_paren)
+        if close == -1:
+            continue
+        body = body_after(close + 1)
+        if body != -1 and body in scanner.blocks:
+            components.append(Component(name, body, start, scanner.blocks[body]))
+        else:
+            # Expression body: ends at the end of the statement, approximated by the next blank line
+            end = code.find('\n\n', close)
+            components.append(Component(name, -1, start, len(code) if end == -1 else end))
+    return sorted(components, key=lambda c: c.start)
+
+def lower_camel(name: str) -> str:
+    parts = re.split(r'[^A-Za-z0-9]+', name)
+    parts = [p for p in parts if p]
+    if not parts:
+        return 'component'
+    first = parts[0][0].lower() + parts[0][1:]
+    return first + ''.join(p[0].upper() + p[1:] for p in parts[1:])
+
+def key_suffix(text: str, tag: str, attribute: Optional[str]) -> str:
+    """`saveChanges`, `searchJobsPlaceholder`, `buttonText`, `inputPlaceholder`, ..."""
+    words = WORD_PATTERN.findall(text.replace("'", '')) if text.isascii() else []
+    if words and not words[0][0].isdigit():
+        base = words[0].lower() + ''.join(w.capitalize() for w in words[1:4])
+    else:
+        base = lower_camel(tag.split('.')[-1] or 'fragment')
+        if not attribute:
+            base += 'Text'
+    if attribute:
+        base += TRANSLATABLE_ATTRIBUTES[attribute]
+    return base
+
+def looks_user_facing(value: str) -> bool:
+    """Heuristic for string literals outside the positions handled locally"""
+    if not any(c.isalpha() for c in value):
+        return False
+    if NON_ASCII_LETTER.search(value):
+        return True
+    return value[0].isupper() and (' ' in value or value.rstrip()[-1] in '.!?:')
+
+def containing(components: List[Component], index: int) -> Optional[Component]:
+    for component in components:
+        if component.start <= index <= component.end:
+            return component
+    return None
+
+def line_of(code: str, index: int) -> str:
+    start = code.rfind('\n', 0, index) + 1
+    end = code.find('\n', index)
+    return code[start:len(code) if end == -1 else end]
+
+def hook_insertion(code: str, component: Component) -> Tuple[int, str]:
+    body = component.body_start
+    line_start = code.rfind('\n', 0, component.start) + 1
+    base_indent = re.match(r'[ \t]*', code[line_start:]).group(0)
+    next_line = re.match(r'[^\n]*\n([ \t]*)\S', code[body + 1:])
+    indent = next_line.group(1) if next_line else base_indent + '  '
+    semicolon = ';' if re.search(r';\s*$', code[body + 1:component.end], re.M) else ''
+    return body + 1, f"\n{indent}const {{ t }} = useTranslation(){semicolon}"
+
+def import_insertion(code: str) -> Optional[Tuple[int, str]]:
+    """Where and what to insert so useTranslation is imported, None if it already is"""
+    if re.search(r'^import\s*\{[^}]*\buseTranslation\b[^}]*\}', code, re.M):
+        return None
+    named = I18NEXT_NAMED_IMPORT_PATTERN.search(code)
+    if named:
+        return code.index('{', named.start()) + 1, ' useTranslation,'
+    statements = list(IMPORT_STATEMENT_PATTERN.finditer(code))
+    quote = statements[0].group(1) if statements else "'"
+    semicolon = ';' if statements and statements[0].group(0).endswith(';') else ''
+    statement = f"import {{ useTranslation }} from {quote}react-i18next{quote}{semicolon}"
+    if statements:
+        return statements[-1].end(), '\n' + statement
+    return 0, statement + '\n\n'
+
+def run_codemod(code: str, default_name: str = 'component',
+                existing: Optional[Dict[str, str]] = None,
+                known_key: Optional[Callable[[str], Optional[str]]] = None) -> CodemodResult:
+    """
+    Rewrite the simple cases of code locally.
+
+    existing maps keys already in the translation file to their text, so new keys
+    never clash; known_key returns the key a text already has (translation memory).
+    """
+    existing = existing or {}
+    try:
+        scanner = JsxScanner(code).scan()
+    except ScanError as e:
+        return CodemodResult(code, hard_cases=[f"could not parse: {e}"])
+
+    components = find_components(code, scanner, default_name)
+    hard_cases: List[str] = []
+    targets: List[Tuple[int, int, str, str, Optional[str], Component]] = []  # start, end, text, tag, attribute
+    leftover: List[str] = []  # other alphabetic literals inside components, e.g. toast.success('Saved')
+
+    for node in scanner.texts:
+        value = node.value.strip()
+        if not any(c.isalpha() for c in value) or node.tag in SKIP_TEXT_ELEMENTS:
+            continue
+        component = containing(components, node.start)
+        if node.mixed:
+            hard_cases.append(f"text mixed with expressions: {value[:40]!r}")
+        elif ENTITY_PATTERN.search(value):
+            hard_cases.append(f"text with HTML entities: {value[:40]!r}")
+        elif not component:
+            hard_cases.append(f"JSX text outside a component: {value[:40]!r}")
+        else:
+            lead = len(node.value) - len(node.value.lstrip())
+            trail = len(node.value.rstrip())
+            targets.append((node.start + lead, node.start + trail, ' '.join(value.split()), node.tag, None, component))
+
+    for literal in scanner.literals:
+        if not any(c.isalpha() for c in literal.value):
+            continue
+        component = containing(components, literal.start)
+        if literal.attribute in TRANSLATABLE_ATTRIBUTES:
+            if component:
+                targets.append((literal.start, literal.end, literal.value, literal.tag, literal.attribute, component))
+            else:
+                hard_cases.append(f"attribute outside a component: {literal.attribute}={literal.value[:40]!r}")
+            continue
+        if literal.attribute:
+            if (literal.attribute not in TECHNICAL_ATTRIBUTES and not literal.attribute.startswith('data-')
+                    and (NON_ASCII_LETTER.search(literal.value) or literal.value[0].isupper())):
+                hard_cases.append(f"{literal.attribute}={literal.value[:40]!r}")
+            continue
+
+        line = line_of(code, literal.start).strip()
+        before = code[max(0, literal.start - 16):literal.start]
+        if line.startswith(('import ', 'export * from', '} from')) or 'console.' in line or re.search(r'\bt\(\s*$', before):
+            continue
+        if looks_user_facing(literal.value):
+            if not component:
+                reason = "module-level Zod schema" if re.search(r'\bz\.', line) else "module-level string"
+            else:
+                reason = "string outside JSX text/attributes"
+            hard_cases.append(f"{reason}: {literal.value[:40]!r}")
+        elif component:
+            leftover.append(literal.value)
+
+    if not targets and not hard_cases:
+        # Only a file without any string left in its components is safe to mark as having none
+        if leftover:
+            return CodemodResult(code, hard_cases=[f"unclassified string in a component: {value[:40]!r}"
+                                                   for value in dict.fromkeys(leftover)][:5])
+        return CodemodResult(code)
+
+    for component in {t[5].name: t[5] for t in targets}.values():
+        body = code[component.start:component.end]
+        if component.body_start == -1:
+            hard_cases.append(f"{component.name} has an expression body")
+        elif SHADOWED_T_PATTERN.search(body):
+            hard_cases.append(f"{component.name} already binds a `t` variable")
+        elif 'useTranslation(' in body and not re.search(r'\{\s*t\b[^}]*\}\s*=\s*useTranslation\(', body):
+            hard_cases.append(f"{component.name} calls useTranslation() without destructuring t")
+    if hard_cases:
+        return CodemodResult(code, hard_cases=list(dict.fromkeys(hard_cases)))
+
+    # Keys: reuse known ones, otherwise component.suffix made unique against the translation file
+    translations: Dict[str, str] = {}
+    used: Dict[str, str] = {}
+    edits: List[Tuple[int, int, str]] = []
+    for start, end, text, tag, attribute, component in targets:
+        key = known_key(text) if known_key else None
+        if not key:
+            base = f"{lower_camel(component.name)}.{key_suffix(text, tag, attribute)}"
+            key, n = base, 2
+            while (key in used and used[key] != text) or (key in existing and existing[key] != text):
+                key, n = f"{base}{n}", n + 1
+        used[key] = text
+        translations[key] = text
+        call = f"t('{key}')"
+        edits.append((start, end, f"{{{call}}}"))
+
+    for component in {t[5].name: t[5] for t in targets}.values():
+        body = code[component.start:component.end]
+        if 'useTranslation(' not in body:
+            position, text = hook_insertion(code, component)
+            edits.append((position, position, text))
+    insertion = import_insertion(code)
+    if insertion:
+        edits.append((insertion[0], insertion[0], insertion[1]))
+
+    new_code = code
+    for start, end, replacement in sorted(edits, key=lambda e: (e[0], e[1]), reverse=True):
+        new_code = new_code[:start] + replacement + new_code[end:]
+    return CodemodResult(new_code, translations)
+
+T_CALL_PATTERN = re.compile(r"""(?<![\w.$])t\(\s*(['"`])([^'"`]+)\1""")
+
+def insert_imports(code: str, statements: List[str]) -> str:
+    for statement in statements:
+        statement = statement.strip().rstrip(';')
+        if 'useTranslation' in statement and 'react-i18next' in statement:
+            insertion = import_insertion(code)
+        elif statement.startswith('import') and statement not in code:
+            existing = list(IMPORT_STATEMENT_PATTERN.finditer(code))
+            insertion = (existing[-1].end(), '\n' + statement) if existing else (0, statement + '\n\n')
+        else:
+            insertion = None
+        if insertion:
+            code = code[:insertion[0]] + insertion[1] + code[insertion[0]:]
+    return code
+
+def apply_edit_list(code: str, payload: Dict, existing_keys: Iterable[str] = ()) -> Tuple[str, Dict[str, str], List[str]]:
+    """
+    Apply a model edit list ({edits, hooks, imports, translations}) to code.
+    Returns (new code, translations, errors); any error means the result must not be used.
+    """
+    errors: List[str] = []
+    translations = payload.get('translations') or {}
+    if not isinstance(translations, dict):
+        return code, {}, ["translations is not an object"]
+
+    new_code = code
+    for i, edit in enumerate(payload.get('edits') or []):
+        find, replace = (edit.get('find'), edit.get('replace')) if isinstance(edit, dict) else (None, None)
+        if not isinstance(find, str) or not isinstance(replace, str) or not find:
+            errors.append(f"edit {i}: needs string 'find' and 'replace'")
+            continue
+        count = new_code.count(find)
+        if count != 1:
+            errors.append(f"edit {i}: snippet {'not found' if count == 0 else f'found {count} times'}: {find[:60]!r}")
+            continue
+        new_code = new_code.replace(find, replace, 1)
+
+    hooks = [name for name in payload.get('hooks') or [] if isinstance(name, str)]
+    if hooks and not errors:
+        try:
+            scanner = JsxScanner(new_code).scan()
+        except ScanError as e:
+            return code, {}, [f"edited code does not parse: {e}"]
+        components = {c.name: c for c in find_components(new_code, scanner, 'Component')}
+        insertions = []
+        for name in dict.fromkeys(hooks):
+            component = components.get(name)
+            if not component or component.body_start == -1:
+                errors.append(f"hook: no component with a block body named {name}")
+            elif 'useTranslation(' not in new_code[component.start:component.end]:
+                insertions.append(hook_insertion(new_code, component))
+        for position, text in sorted(insertions, reverse=True):
+            new_code = new_code[:position] + text + new_code[position:]
+
+    new_code = insert_imports(new_code, [s for s in payload.get('imports') or [] if isinstance(s, str)])
+    if errors:
+        return code, {}, errors
+
+    # The result must still parse, and every new t() key must be defined somewhere
+    try:
+        JsxScanner(new_code).scan()
+    except ScanError as e:
+        return code, {}, [f"edited code does not parse: {e}"]
+    known = set(existing_keys) | set(translations) | {m.group(2) for m in T_CALL_PATTERN.finditer(code)}
+    for match in T_CALL_PATTERN.finditer(new_code):
+        if match.group(2) not in known:
+            errors.append(f"t('{match.group(2)}') has no translation")
+    if T_CALL_PATTERN.search(new_code) and not re.search(r'\buseTranslation\b', new_code) \
+            and not T_CALL_PATTERN.search(code):
+        errors.append("t() is used but useTranslation is never imported")
+    return (code, {}, errors) if errors else (new_code, translations, [])
+
+def main():
+    parser = argparse.ArgumentParser(description="Preview the local i18n codemod on a file.")
+    parser.add_argument("file", help="Component file to rewrite (printed, not written).")
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+
+    with profiling_session(args, "i18n_codemod"):
+        with span(f"read {args.file}", "read"), open(args.file, 'r', encoding='utf-8') as f:
+            code = f.read()
+        name = lower_camel(os.path.splitext(os.path.basename(args.file))[0])
+        with span(f"codemod {args.file}", "regex"):
+            result = run_codemod(code, name[0].upper() + name[1:])
+    if result.needs_model:
+        print("🤖 Needs the model:")
+        for reason in result.hard_cases:
+            print(f"  - {reason}")
+        sys.exit(1)
+    if not result.translations:
+        print("✅ No translatable strings.")
+        return
+    print(result.code)
+    for key, value in result.translations.items():
+        print(f"  {key}: {value}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+# Copyright 2025 RAIDS Lab
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+⏳ Cost estimates and ordering for the model requests of hack/i18n.py
+
+A file's cost is its prompt tokens plus the output tokens the response mode is
+expected to produce (the whole file for full/json, a few dozen tokens per
+string for an edit list, plus the model's thinking), converted to seconds with
+the prefill/decode throughput measured by earlier runs
+(hack/.cache/i18n_throughput.json) or the defaults below. Tokens are counted
+with the model's own tokenizer when use_model_tokenizer() finds it locally
+(transformers or tokenizers installed, files on disk), else with a
+chars-per-token heuristic.
+
+Files are sent longest-first so a large file never ends the run on its own;
+quick_feedback sends the short ones first. ProgressReporter prints an ETA from
+the remaining estimated cost, scaled by how fast the run is actually going.
+"""
+
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import List, Optional
+
+THROUGHPUT_PATH = Path(__file__).resolve().parent / ".cache" / "i18n_throughput.json"
+
+# Used until a run has measured the endpoint
+DEFAULT_PREFILL_TPS = 1500.0
+DEFAULT_DECODE_TPS = 30.0
+DEFAULT_THINKING_TOKENS = 500.0
+
+CHARS_PER_TOKEN = 3.5  # code and English text; CJK characters count as one token each
+EDIT_BASE_TOKENS = 60  # hooks/imports/braces of an edit list
+EDIT_TOKENS_PER_STRING = 45  # one find/replace pair plus its translations entry
+TRANSLATION_TOKENS_PER_STRING = 15  # one entry of the translations object
+JSON_ESCAPE_OVERHEAD = 1.1  # quotes and newlines escaped inside the "code" field
+
+def is_cjk(char: str) -> bool:
+    return '\u3000' <= char <= '\u9fff' or '\uac00' <= char <= '\ud7af' or '\uff00' <= char <= '\uffef'
+
+_tokenizer = None
+
+def use_model_tokenizer(model: str) -> Optional[str]:
+    """
+    Count tokens with the tokenizer of model from now on. Only local files are
+    read (I18N_TOKENIZER may point to a tokenizer directory or tokenizer.json);
+    returns a description of the tokenizer, or None when the heuristic stays.
+    """
+    global _tokenizer
+    source = os.getenv("I18N_TOKENIZER", model)
+    try:
+        from transformers import AutoTokenizer
+        tokenizer = AutoTokenizer.from_pretrained(source, local_files_only=True)
+        _tokenizer = lambda text: len(tokenizer.encode(text, add_special_tokens=False))
+        return f"transformers ({source})"
+    except Exception:
+        pass
+    try:
+        from tokenizers import Tokenizer
+        path = source if source.endswith(".json") else os.path.join(source, "tokenizer.json")
+        tokenizer = Tokenizer.from_file(path)
+        _tokenizer = lambda text: len(tokenizer.encode(text, add_special_tokens=False).ids)
+        return f"tokenizers ({path})"
+    except Exception:
+        return None
+
+def count_tokens(text: str) -> int:
+    """Token count of text: exact with the model tokenizer, approximate otherwise"""
+    if _tokenizer is not None:
+        return _tokenizer(text)
+    cjk = sum(1 for char in text if is_cjk(char))
+    return cjk + round((len(text) - cjk) / CHARS_PER_TOKEN)
+
+# === THROUGHPUT HISTORY ===
+@dataclass
+class Throughput:
+    prefill_tps: float = DEFAULT_PREFILL_TPS
+    decode_tps: float = DEFAULT_DECODE_TPS
+    thinking_tokens: float = DEFAULT_THINKING_TOKENS
+    samples: int = 0
+
+    def update(self, prompt_tokens: int, output_tokens: int, thinking_tokens: int,
+               first_token_seconds: float, total_seconds: float):
+        """Fold one measured request into the moving averages"""
+        weight = max(1.0 / (self.samples + 1), 0.2)
+        if first_token_seconds > 0:
+            self.prefill_tps += weight * (prompt_tokens / first_token_seconds - self.prefill_tps)
+        decode_seconds = total_seconds - first_token_seconds
+        if decode_seconds > 0 and output_tokens:
+            self.decode_tps += weight * (output_tokens / decode_seconds - self.decode_tps)
+        self.thinking_tokens += weight * (thinking_tokens - self.thinking_tokens)
+        self.samples += 1
+
+def load_throughput(model: str, path: Path = THROUGHPUT_PATH) -> Throughput:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return Throughput(**json.load(f)[model])
+    except (OSError, json.JSONDecodeError, KeyError, TypeError):
+        return Throughput()
+
+def save_throughput(model: str, throughput: Throughput, path: Path = THROUGHPUT_PATH):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            by_model = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        by_model = {}
+    by_model[model] = asdict(throughput)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(by_model, f, indent=2)
+
+# === ESTIMATES ===
+@dataclass
+class FileCost:
+    file: str
+    prompt_tokens: int
+    output_tokens: int
+    seconds: float
+
+def expected_output_tokens(code: str, mode: str, strings: int, throughput: Throughput) -> int:
+    """Thinking plus the answer: an edit list grows with the strings, full/json repeat the whole file"""
+    if mode == "edits":
+        answer = EDIT_BASE_TOKENS + strings * EDIT_TOKENS_PER_STRING
+    else:
+        answer = count_tokens(code) + strings * TRANSLATION_TOKENS_PER_STRING
+        if mode == "json":
+            answer *= JSON_ESCAPE_OVERHEAD
+    return round(throughput.thinking_tokens + answer)
+
+def estimate_file_cost(file: str, prompt: str, code: str, mode: str, strings: int,
+                       throughput: Throughput) -> FileCost:
+    """prompt is the full text sent to the model (rules, output format and code)"""
+    prompt_tokens = count_tokens(prompt)
+    output_tokens = expected_output_tokens(code, mode, strings, throughput)
+    seconds = prompt_tokens / throughput.prefill_tps + output_tokens / throughput.decode_tps
+    return FileCost(file, prompt_tokens, output_tokens, seconds)
+
+def schedule(costs: List[FileCost], quick_feedback: bool = False) -> List[FileCost]:
+    """Longest-first, or shortest-first for quick feedback; ties keep the file order"""
+    return sorted(costs, key=lambda cost: cost.seconds if quick_feedback else -cost.seconds)
+
+# === PROGRESS ===
+def format_duration(seconds: float) -> str:
+    seconds = int(round(seconds))
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+class ProgressReporter:
+    """🔧 Progress lines with an ETA weighted by the estimated cost of each file"""
+
+    def __init__(self, costs: List[FileCost]):
+        self.costs = costs
+        self.total = sum(cost.seconds for cost in costs)
+        self.done = 0.0  # estimated seconds of the finished files
+        self.count = 0
+        self.started = time.monotonic()
+
+    def eta(self) -> float:
+        """Remaining estimate, corrected by the actual/estimated ratio of the finished files"""
+        remaining = self.total - self.done
+        if self.done > 0:
+            remaining *= (time.monotonic() - self.started) / self.done
+        return remaining
+
+    def start(self, cost: FileCost):
+        self.count += 1
+        share = self.done / self.total * 100 if self.total else 0.0
+        elapsed = time.monotonic() - self.started
+        print(f"\n🔧 Processing progress: {self.count}/{len(self.costs)}, {share:.0f}% of estimated work, "
+              f"elapsed {format_duration(elapsed)}, ETA {format_duration(self.eta())} "
+              f"(this file ~{format_duration(cost.seconds)}, {cost.prompt_tokens}+{cost.output_tokens} tokens)")
+
+    def finish(self, cost: FileCost):
+        self.done += cost.seconds
@@ -0,0 +1,157 @@
+# Copyright 2025 RAIDS Lab
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# python3 ./hack/i18n_verify.py src/components/form/combobox.tsx src/routes/index.tsx
+
+"""
+✅ Batched verification of rewritten files
+
+One incremental `tsc --noEmit` over the project (the .tsbuildinfo lives in
+hack/.cache/, so unchanged files are not re-checked) and one `eslint` call over
+all modified files, with the diagnostics mapped back to those files. Used at the
+end of hack/i18n.py; runs standalone on a list of files too.
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from timings import add_profiling_arguments, profiling_session, span
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+TSBUILDINFO_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "tsc-verify.tsbuildinfo")
+
+TSC_DIAGNOSTIC_PATTERN = re.compile(r'^(?P<path>.+?)\((?P<line>\d+),(?P<column>\d+)\): error (?P<code>TS\d+): (?P<message>.*)$')
+
+@dataclass
+class Diagnostic:
+    tool: str
+    path: str  # absolute
+    line: int
+    column: int
+    code: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.tool} {self.code} {os.path.relpath(self.path, PROJECT_ROOT)}:{self.line}:{self.column} {self.message}"
+
+def run_tool(args: List[str], name: str) -> Optional[subprocess.CompletedProcess]:
+    try:
+        with span(name, "subprocess"):
+            return subprocess.run(args, cwd=PROJECT_ROOT, capture_output=True, text=True, check=False)
+    except OSError as e:
+        print(f"⚠️ Could not run {name}: {e}")
+        return None
+
+def run_tsc() -> Optional[List[Diagnostic]]:
+    """Type-check the whole project incrementally; None if tsc could not run"""
+    os.makedirs(os.path.dirname(TSBUILDINFO_PATH), exist_ok=True)
+    result = run_tool(
+        ["pnpm", "exec", "tsc", "--noEmit", "--incremental", "--tsBuildInfoFile", TSBUILDINFO_PATH,
+         "--pretty", "false", "-p", "tsconfig.json"],
+        "tsc --noEmit",
+    )
+    if result is None:
+        return None
+    diagnostics = []
+    for line in result.stdout.splitlines():
+        match = TSC_DIAGNOSTIC_PATTERN.match(line.strip())
+        if match:
+            diagnostics.append(Diagnostic(
+                "tsc", os.path.abspath(os.path.join(PROJECT_ROOT, match.group("path"))),
+                int(match.group("line")), int(match.group("column")), match.group("code"), match.group("message"),
+            ))
+    if result.returncode != 0 and not diagnostics:
+        print(f"⚠️ tsc failed without diagnostics: {(result.stderr or result.stdout).strip()[:500]}")
+        return None
+    return diagnostics
+
+def run_eslint(files: List[str]) -> Optional[List[Diagnostic]]:
+    """Lint the given files in one eslint call; None if eslint could not run"""
+    result = run_tool(["pnpm", "exec", "eslint", "--format", "json", *files], "eslint")
+    if result is None:
+        return None
+    try:
+        reports = json.loads(result.stdout or "[]")
+    except json.JSONDecodeError:
+        print(f"⚠️ Unexpected eslint output: {(result.stderr or result.stdout).strip()[:500]}")
+        return None
+    diagnostics = []
+    for report in reports:
+        for message in report.get("messages", []):
+            if message.get("severity") != 2:
+                continue
+            diagnostics.append(Diagnostic(
+                "eslint", os.path.abspath(report["filePath"]), message.get("line", 0), message.get("column", 0),
+                message.get("ruleId") or "parse", message.get("message", ""),
+            ))
+    return diagnostics
+
+def verify_files(files: Iterable[str]) -> Optional[Dict[str, List[Diagnostic]]]:
+    """
+    Diagnostics per modified file (absolute paths), None if neither tool could run.
+    Errors tsc reports in other files are listed under the key '' since a rewrite
+    may have caused them.
+    """
+    files = sorted({os.path.abspath(f) for f in files})
+    by_file: Dict[str, List[Diagnostic]] = {path: [] for path in files}
+    if not files:
+        return by_file
+
+    print(f"\n🔎 Verifying {len(files)} rewritten files with tsc and eslint...")
+    results = [run_tsc(), run_eslint(files)]
+    if all(diagnostics is None for diagnostics in results):
+        print("⚠️ Verification skipped: neither tsc nor eslint could run.")
+        return None
+    for diagnostics in results:
+        for diagnostic in diagnostics or []:
+            by_file.setdefault(diagnostic.path if diagnostic.path in by_file else '', []).append(diagnostic)
+    return by_file
+
+def print_report(by_file: Dict[str, List[Diagnostic]]) -> List[str]:
+    """Print the diagnostics and return the modified files that failed"""
+    failed = [path for path, diagnostics in by_file.items() if path and diagnostics]
+    for path in failed:
+        print(f"❌ {os.path.relpath(path, PROJECT_ROOT)}")
+        for diagnostic in by_file[path][:10]:
+            print(f"    {diagnostic}")
+    others = by_file.get('', [])
+    if others:
+        print(f"⚠️ {len(others)} type errors in files that were not rewritten:")
+        for diagnostic in others[:10]:
+            print(f"    {diagnostic}")
+    if not failed:
+        print(f"✅ All {len([p for p in by_file if p])} rewritten files pass verification.")
+    return failed
+
+def main():
+    parser = argparse.ArgumentParser(description="Type-check and lint a set of files in one pass.")
+    parser.add_argument("files", nargs="+", help="Files to verify.")
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+
+    with profiling_session(args, "i18n_verify"):
+        by_file = verify_files(args.files)
+        failed = by_file is not None and print_report(by_file)
+    if by_file is None:
+        sys.exit(2)
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
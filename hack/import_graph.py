@@ -0,0 +1,411 @@
+# Copyright 2025 RAIDS Lab
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+🕸️  Module import graph for src/, cached on disk
+
+Parses every .ts/.tsx/.js/.jsx module of the shared source snapshot (see
+source_snapshot.py) for `@/` and relative imports, dynamic import() calls and
+re-exports, and keeps the parse results in hack/.cache/import_graph.json.
+Later runs only re-parse modules whose content hash in the snapshot changed.
+
+ModuleResolver is the one implementation of import resolution for the hack/
+tools; refactor_filenames.py uses it to rewrite imports.
+
+Usage:
+    python3 hack/import_graph.py stats
+    python3 hack/import_graph.py importers-of src/components/file/file-size.tsx
+    python3 hack/import_graph.py dependents src/utils/time.ts
+    python3 hack/import_graph.py rename-impact src/components/file src/components/files
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from source_snapshot import SourceSnapshot, load_snapshot
+from timings import add_profiling_arguments, profiling_session, span, timed
+
+CACHE_VERSION = 3
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "import_graph.json")
+
+SOURCE_EXTENSIONS = ('.ts', '.tsx', '.js', '.jsx')
+# Extensions tried when an import omits it, in the order TypeScript resolves them
+RESOLVE_EXTENSIONS = ('.ts', '.tsx', '.d.ts', '.js', '.jsx')
+INDEX_FILES = tuple(f"index{ext}" for ext in RESOLVE_EXTENSIONS)
+
+# `import x from '...'`, `import '...'`, `import type { X } from '...'`, `export { x } from '...'`, `export * from '...'`
+STATIC_IMPORT_PATTERN = re.compile(
+    r"""(?<![\w.$])(import|export)\s+(?:type\s+)?"""
+    r"""(?:((?:(?!\b(?:import|export)\b)[\w*{}\s,$])*?)\s*from\s*)?(['"])([^'"\n]+)\3"""
+)
+DYNAMIC_IMPORT_PATTERN = re.compile(r"""(?<![\w.$])import\(\s*(['"])([^'"\n]+)\1\s*\)""")
+# `export const foo`, `export default function Foo`, `export type Bar`, ...
+EXPORT_DECLARATION_PATTERN = re.compile(
+    r"""(?<![\w.$])export\s+(?:declare\s+)?(default\s+)?(?:async\s+)?"""
+    r"""(?:(?:abstract\s+)?class|function\*?|const|let|var|type|interface|enum)?\s*([\w$]+)?"""
+)
+# `export { a, b as c }` without a `from` clause
+EXPORT_LIST_PATTERN = re.compile(r"""(?<![\w.$])export\s+(?:type\s+)?\{([^}]*)\}(?!\s*from)""")
+
+@dataclass
+class ImportEdge:
+    """One import specifier found in a module"""
+    specifier: str
+    kind: str  # 'static', 'dynamic' or 're-export'
+    names: List[str] = field(default_factory=list)  # imported names, '*' for all of them
+    target: Optional[str] = None  # resolved module, relative to the source root
+
+@dataclass
+class ModuleEntry:
+    path: str  # relative to the source root, '/' separated
+    sha1: str  # content hash from the source snapshot
+    lines: int = 0
+    imports: List[ImportEdge] = field(default_factory=list)
+    exports: List[str] = field(default_factory=list)
+
+def parse_clause_names(clause: str) -> List[str]:
+    """Names pulled from a module by an import/export clause (`Foo, { a, b as c }`, `* as ns`)"""
+    clause = clause.strip()
+    if not clause:
+        return []
+    if clause.startswith('*'):
+        return ['*']
+
+    names = []
+    braces = re.search(r'\{([^}]*)\}', clause)
+    default_part = clause[:braces.start()] if braces else clause
+    if default_part.strip(' ,'):
+        names.append('default')
+    if braces:
+        for item in braces.group(1).split(','):
+            item = re.sub(r'^\s*type\s+', '', item).strip()
+            if item:
+                names.append(item.split()[0])
+    return names
+
+def parse_exports(content: str) -> List[str]:
+    """Names a module declares as exports (re-exports are recorded on their import edge)"""
+    exports = []
+    for match in EXPORT_DECLARATION_PATTERN.finditer(content):
+        if match.group(1):
+            exports.append('default')
+        elif match.group(2) and match.group(2) not in ('from', 'type', 'default'):
+            exports.append(match.group(2))
+    for match in EXPORT_LIST_PATTERN.finditer(content):
+        for item in match.group(1).split(','):
+            item = re.sub(r'^\s*type\s+', '', item).strip()
+            if item:
+                exports.append(item.split()[-1])
+    return sorted(set(exports))
+
+def parse_imports(content: str) -> List[ImportEdge]:
+    """Extract local (`@/` and relative) imports from a module"""
+    edges = []
+    for match in STATIC_IMPORT_PATTERN.finditer(content):
+        specifier = match.group(4)
+        if specifier.startswith('@/') or specifier.startswith('.'):
+            kind = 'static' if match.group(1) == 'import' else 're-export'
+            edges.append(ImportEdge(specifier, kind, parse_clause_names(match.group(2) or '')))
+    for match in DYNAMIC_IMPORT_PATTERN.finditer(content):
+        specifier = match.group(2)
+        if specifier.startswith('@/') or specifier.startswith('.'):
+            edges.append(ImportEdge(specifier, 'dynamic', ['*']))
+    return edges
+
+class ModuleResolver:
+    """🧭 Resolves `@/` and relative import specifiers against the files of a source snapshot"""
+
+    def __init__(self, snapshot: SourceSnapshot):
+        self.snapshot = snapshot
+        self.src_dir = snapshot.root
+        self.files: Set[str] = set(snapshot.entries)
+        self.dirs: Set[str] = snapshot.dirs
+
+    def relative(self, abs_path: str) -> str:
+        rel_path = os.path.relpath(abs_path, self.src_dir).replace(os.sep, '/')
+        return '' if rel_path == '.' else rel_path
+
+    def specifier_base(self, importer: str, specifier: str) -> Optional[str]:
+        """The path an import points at before extension/index resolution"""
+        if specifier.startswith('@/'):
+            joined = specifier[2:]
+        elif specifier.startswith('.'):
+            joined = os.path.join(os.path.dirname(importer), specifier)
+        else:
+            return None
+        normalized = os.path.normpath(joined).replace(os.sep, '/')
+        return '' if normalized == '.' else normalized
+
+    def resolve_path(self, base: str) -> Optional[str]:
+        """Resolve an extension-less import target the way the bundler does"""
+        if base in self.files:
+            return base
+        for ext in RESOLVE_EXTENSIONS:
+            if base + ext in self.files:
+                return base + ext
+        if base in self.dirs:
+            for index_file in INDEX_FILES:
+                candidate = f"{base}/{index_file}" if base else index_file
+                if candidate in self.files:
+                    return candidate
+        return None
+
+    def resolve_abspath(self, abs_base: str) -> Optional[str]:
+        """resolve_path for absolute paths"""
+        resolved = self.resolve_path(self.relative(abs_base))
+        return self.snapshot.abspath(resolved) if resolved is not None else None
+
+class ImportGraph(ModuleResolver):
+    """🔧 Import graph over a source root, with the parse results cached on disk"""
+
+    def __init__(self, src_dir: str = "src", cache_path: str = DEFAULT_CACHE_PATH,
+                 snapshot: Optional[SourceSnapshot] = None):
+        super().__init__(snapshot or load_snapshot(src_dir))
+        self.cache_path = cache_path
+        self.modules: Dict[str, ModuleEntry] = {}
+        self.importers: Dict[str, Set[str]] = {}
+        self.stats = {'reused': 0, 'parsed': 0, 'removed': 0}
+
+    # === CACHE ===
+    def load_cache(self) -> Dict[str, ModuleEntry]:
+        try:
+            with span("load graph cache", "json"), open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        if data.get('version') != CACHE_VERSION or data.get('src_dir') != self.src_dir:
+            return {}
+
+        cached = {}
+        for path, entry in data['modules'].items():
+            cached[path] = ModuleEntry(
+                path=path,
+                sha1=entry['sha1'],
+                lines=entry['lines'],
+                imports=[ImportEdge(e['specifier'], e['kind'], e['names']) for e in entry['imports']],
+                exports=entry['exports'],
+            )
+        return cached
+
+    def save_cache(self):
+        data = {
+            'version': CACHE_VERSION,
+            'src_dir': self.src_dir,
+            'modules': {
+                path: {
+                    'sha1': entry.sha1,
+                    'lines': entry.lines,
+                    'imports': [
+                        {'specifier': e.specifier, 'kind': e.kind, 'names': e.names}
+                        for e in entry.imports
+                    ],
+                    'exports': entry.exports,
+                }
+                for path, entry in sorted(self.modules.items())
+            },
+        }
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        with span("save graph cache", "json"), open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.cache_path)
+
+    # === BUILD ===
+    def refresh(self) -> "ImportGraph":
+        """Bring the graph up to date with the snapshot, re-parsing only changed modules"""
+        cached = self.load_cache()
+        self.modules = {}
+        self.stats = {'reused': 0, 'parsed': 0, 'removed': 0}
+
+        with span("parse modules", "regex"):
+            for file_entry in self.snapshot.files(extensions=SOURCE_EXTENSIONS):
+                previous = cached.get(file_entry.path)
+                if previous and previous.sha1 == file_entry.sha1:
+                    self.stats['reused'] += 1
+                    self.modules[file_entry.path] = previous
+                    continue
+
+                self.stats['parsed'] += 1
+                content = self.snapshot.read_bytes(file_entry.path).decode('utf-8', errors='replace')
+                self.modules[file_entry.path] = ModuleEntry(
+                    file_entry.path, file_entry.sha1,
+                    lines=content.count('\n') + 1,
+                    imports=parse_imports(content),
+                    exports=parse_exports(content),
+                )
+
+        self.stats['removed'] = len(set(cached) - set(self.modules))
+        with span("resolve imports", "scan"):
+            self.resolve_all()
+        if self.stats['parsed'] or self.stats['removed'] or not cached:
+            self.save_cache()
+        return self
+
+    def resolve_all(self):
+        self.importers = {}
+        for path, entry in self.modules.items():
+            for edge in entry.imports:
+                base = self.specifier_base(path, edge.specifier)
+                edge.target = self.resolve_path(base) if base is not None else None
+                if edge.target:
+                    self.importers.setdefault(edge.target, set()).add(path)
+
+    # === QUERIES ===
+    def importers_of(self, path: str) -> List[str]:
+        return sorted(self.importers.get(path, set()))
+
+    def dependents_of(self, path: str) -> List[str]:
+        """Every module that transitively imports path"""
+        seen: Set[str] = set()
+        queue = deque([path])
+        while queue:
+            current = queue.popleft()
+            for importer in self.importers.get(current, ()):
+                if importer not in seen:
+                    seen.add(importer)
+                    queue.append(importer)
+        seen.discard(path)
+        return sorted(seen)
+
+    def reachable_from(self, roots: List[str]) -> Set[str]:
+        """Every module reachable from roots through static, dynamic and re-export edges"""
+        seen = {root for root in roots if root in self.modules}
+        queue = deque(seen)
+        while queue:
+            current = queue.popleft()
+            for edge in self.modules[current].imports:
+                if edge.target in self.modules and edge.target not in seen:
+                    seen.add(edge.target)
+                    queue.append(edge.target)
+        return seen
+
+    def imported_names(self) -> Dict[str, Set[str]]:
+        """module -> names other modules import from it ('*' when all of them may be used)"""
+        used: Dict[str, Set[str]] = {}
+        for entry in self.modules.values():
+            for edge in entry.imports:
+                if edge.target:
+                    used.setdefault(edge.target, set()).update(edge.names)
+        return used
+
+    def rename_impact(self, old: str, new: str) -> List[Tuple[str, str, str]]:
+        """(importer, old specifier, new specifier) for every import a rename would change"""
+        old = old.rstrip('/')
+        new = new.rstrip('/')
+
+        def moved(path: str) -> Optional[str]:
+            if path == old:
+                return new
+            if path.startswith(old + '/'):
+                return new + path[len(old):]
+            return None
+
+        impact = []
+        for importer, entry in sorted(self.modules.items()):
+            new_importer = moved(importer) or importer
+            for edge in entry.imports:
+                if not edge.target:
+                    continue
+                base = self.specifier_base(importer, edge.specifier)
+                new_base = moved(base)
+                if new_base is None and edge.target == old and old.startswith(base):
+                    # The import omits the extension of the renamed file
+                    omitted = old[len(base):]
+                    new_base = new[:-len(omitted)] if omitted and new.endswith(omitted) else new
+                importer_moved = new_importer != importer
+                if new_base is None and not (importer_moved and edge.specifier.startswith('.')):
+                    continue
+
+                new_base = new_base if new_base is not None else base
+                if edge.specifier.startswith('@/'):
+                    new_specifier = '@/' + new_base
+                else:
+                    new_specifier = os.path.relpath(new_base or '.', os.path.dirname(new_importer) or '.')
+                    new_specifier = new_specifier.replace(os.sep, '/')
+                    if not new_specifier.startswith('.'):
+                        new_specifier = './' + new_specifier
+
+                if new_specifier != edge.specifier:
+                    impact.append((importer, edge.specifier, new_specifier))
+        return impact
+
+def to_module_path(graph: ImportGraph, path: str) -> str:
+    """Accepts paths relative to cwd (src/utils/time.ts) or to the source root (utils/time.ts)"""
+    abs_path = os.path.abspath(path)
+    if abs_path.startswith(graph.src_dir + os.sep) or abs_path == graph.src_dir:
+        return graph.relative(abs_path)
+    return path.replace(os.sep, '/').removeprefix('./').removeprefix('@/')
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the cached import graph of the source tree.")
+    parser.add_argument("--dir", default="src", help="The source root to index (default: src).")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH, help="Where to store the graph cache.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("stats", help="Show module and edge counts.")
+    importers = subparsers.add_parser("importers-of", help="List modules that directly import a module.")
+    importers.add_argument("path")
+    dependents = subparsers.add_parser("dependents", help="List modules that transitively import a module.")
+    dependents.add_argument("path")
+    rename = subparsers.add_parser("rename-impact", help="Dry-run the import rewrites a rename would need.")
+    rename.add_argument("old")
+    rename.add_argument("new")
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+
+    with profiling_session(args, "import_graph"):
+        run(args)
+
+def run(args: argparse.Namespace):
+    if not os.path.isdir(args.dir):
+        print(f"Error: Directory '{args.dir}' not found.")
+        sys.exit(1)
+
+    with timed("build graph", "main") as build:
+        graph = ImportGraph(args.dir, args.cache).refresh()
+
+    with timed(f"query {args.command}", "main") as query:
+        run_query(graph, args)
+
+    s = graph.stats
+    print(f"\n⏱️  graph {build.duration * 1000:.1f}ms "
+          f"(reused {s['reused']}, parsed {s['parsed']}, removed {s['removed']}), "
+          f"query {query.duration * 1000:.1f}ms", file=sys.stderr)
+
+def run_query(graph: ImportGraph, args: argparse.Namespace):
+    if args.command == "stats":
+        edges = sum(len(entry.imports) for entry in graph.modules.values())
+        unresolved = sum(1 for entry in graph.modules.values() for e in entry.imports if not e.target)
+        print(f"📦 Modules: {len(graph.modules)}")
+        print(f"🔗 Local imports: {edges} ({unresolved} unresolved)")
+    elif args.command == "importers-of":
+        for importer in graph.importers_of(to_module_path(graph, args.path)):
+            print(importer)
+    elif args.command == "dependents":
+        for dependent in graph.dependents_of(to_module_path(graph, args.path)):
+            print(dependent)
+    elif args.command == "rename-impact":
+        impact = graph.rename_impact(to_module_path(graph, args.old), to_module_path(graph, args.new))
+        for importer, old_specifier, new_specifier in impact:
+            print(f"  - {importer}: {old_specifier}  ->  {new_specifier}")
+        print(f"\n{len(impact)} import(s) in {len({i for i, _, _ in impact})} file(s) would change.")
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,17 @@
 # hack/refactor_filenames.py
 import os
 import re
+import json
+import time
+import shutil
 import argparse
-from typing import List, Tuple, Dict, Set
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Tuple, Dict, Set, Optional
+
+from import_graph import ImportGraph, ModuleResolver
+from source_snapshot import SourceSnapshot, load_snapshot
+from timings import add_profiling_arguments, profiling_session, span, timed
 
 def to_kebab_case(name: str) -> str:
     """Converts a string from PascalCase or camelCase to kebab-case."""
@@ -18,143 +27,399 @@ def to_kebab_case(name: str) -> str:
     name = re.sub(r'(?<!^)(?=[A-Z])', '-', name)
     return name.lower()
 
-def find_rename_targets(root_dir: str, ignore_list: List[str]) -> List[Tuple[str, str]]:
+class IgnoreTrie:
+    """Ignored paths relative to the scan root, matched whole path component by component."""
+
+    def __init__(self, ignore_list: List[str]):
+        self.root: Dict = {}
+        for path in ignore_list:
+            parts = [part for part in os.path.normpath(path).replace(os.sep, '/').split('/') if part not in ('', '.')]
+            node = self.root
+            for part in parts:
+                node = node.setdefault(part, {})
+            node[None] = True  # marks an ignored path; everything below it is ignored too
+
+    @staticmethod
+    def child(node: Optional[Dict], name: str) -> Tuple[bool, Optional[Dict]]:
+        """(ignored, node for the entries below name); a None node means nothing below is ignored"""
+        if not node or name not in node:
+            return False, None
+        below = node[name]
+        return None in below, below
+
+@dataclass
+class RenamePlan:
+    renames: List[Tuple[str, str]] = field(default_factory=list)
+    # (entries that would end up with the same name, that name), per directory
+    collisions: List[Tuple[List[str], str]] = field(default_factory=list)
+
+def is_case_only(old_path: str, new_path: str) -> bool:
+    return old_path != new_path and old_path.casefold() == new_path.casefold()
+
+def find_rename_targets(root_dir: str, ignore_list: List[str]) -> RenamePlan:
     """
-    Walks the directory from the bottom up to find files/dirs to rename.
-    Bottom-up is crucial to ensure directories are renamed after their contents.
+    Walks the directory with scandir to find files/dirs to rename, skipping ignored
+    subtrees without descending into them. Renames are listed bottom-up: a
+    directory comes after its contents, so it is renamed last.
+    Names that would collide in a directory (compared case-insensitively, since
+    macOS and Windows checkouts are) are reported instead of renamed.
     """
-    rename_map = []
-    abs_root = os.path.abspath(root_dir)
-    
-    # Normalize ignore list to be relative paths
-    normalized_ignore = [os.path.normpath(p) for p in ignore_list]
-
-    for dirpath, dirnames, filenames in os.walk(root_dir, topdown=False):
-        # Process files first
-        for filename in filenames:
-            rel_path = os.path.relpath(os.path.join(dirpath, filename), root_dir)
-            if any(rel_path.startswith(p) for p in normalized_ignore):
-                continue
-                
-            if any(c.isupper() for c in filename):
-                old_path = os.path.join(dirpath, filename)
-                base, ext = os.path.splitext(filename)
-                new_filename = to_kebab_case(base) + ext
-                new_path = os.path.join(dirpath, new_filename)
-                if old_path != new_path:
-                    rename_map.append((old_path, new_path))
-        
-        # Then process directories
-        for dirname in dirnames:
-            rel_path = os.path.relpath(os.path.join(dirpath, dirname), root_dir)
-            if any(rel_path.startswith(p) for p in normalized_ignore):
-                continue
+    plan = RenamePlan()
+    ignore = IgnoreTrie(ignore_list)
+
+    def visit(dir_path: str, node: Optional[Dict]):
+        with os.scandir(dir_path) as it:
+            entries = sorted((entry.name, entry.is_dir(follow_symlinks=False)) for entry in it)
+
+        # Final names, casefolded; ignored entries keep theirs but can still collide with a rename
+        targets: Dict[str, List[Tuple[str, str, bool]]] = {}
+        for name, is_dir in entries:
+            ignored, below = ignore.child(node, name)
+            if ignored:
+                new_name = name
+            elif is_dir:
+                visit(os.path.join(dir_path, name), below)
+                new_name = to_kebab_case(name)
+            else:
+                base, ext = os.path.splitext(name)
+                new_name = to_kebab_case(base) + ext
+            targets.setdefault(new_name.casefold(), []).append((name, new_name, is_dir))
 
-            if any(c.isupper() for c in dirname):
-                old_path = os.path.join(dirpath, dirname)
-                new_dirname = to_kebab_case(dirname)
-                new_path = os.path.join(dirpath, new_dirname)
-                if old_path != new_path:
-                    rename_map.append((old_path, new_path))
+        renames = []
+        for group in targets.values():
+            if len(group) > 1:
+                plan.collisions.append(([os.path.join(dir_path, name) for name, _, _ in group], group[0][1]))
+            elif group[0][0] != group[0][1]:
+                name, new_name, is_dir = group[0]
+                renames.append((is_dir, os.path.join(dir_path, name), os.path.join(dir_path, new_name)))
+        # Files first, then directories, as os.walk(topdown=False) listed them
+        plan.renames.extend((old, new) for _, old, new in sorted(renames))
 
-    return rename_map
+    with span("find rename targets", "scan"):
+        visit(root_dir, ignore.root)
+    return plan
 
-def update_file_imports(root_dir: str, rename_map: List[Tuple[str, str]], dry_run: bool):
+DEFAULT_JOURNAL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "refactor_journal.json")
+
+# Regex to find static and dynamic imports, handles single and double quotes
+IMPORT_REGEX = re.compile(r"""from\s+(['"])([^'"]+)\1|import\((['"])([^'"]+)\3\)""")
+
+def rewrite_import_path(import_path: str, file_dir: str, resolver: ModuleResolver,
+                        renames: Dict[str, str]) -> str:
     """
-    Scans all .ts and .tsx files and updates their import statements based on the rename map.
+    Returns import_path with every renamed directory or file segment replaced.
+    Segments are resolved against the snapshot of the tree as it is *before* renaming.
     """
-    # Create a lookup dictionary for faster checks
-    # We strip extensions because imports often omit them
-    old_to_new_lookup = {
-        os.path.splitext(os.path.abspath(old))[0]: os.path.splitext(os.path.abspath(new))[0]
-        for old, new in rename_map
-    }
-
-    if not old_to_new_lookup:
-        return
+    if import_path.startswith('@/'):
+        # It's an alias path, resolve from root_dir
+        current = resolver.src_dir
+        prefix, segments = '@/', import_path[2:].split('/')
+    elif import_path.startswith('.'):
+        # It's a relative path, resolve from the current file's directory
+        current = file_dir
+        prefix, segments = '', import_path.split('/')
+    else:
+        # It's a library import, skip it
+        return import_path
+
+    new_segments = []
+    last = len(segments) - 1
+    for i, segment in enumerate(segments):
+        if segment in ('', '.'):
+            new_segments.append(segment)
+            continue
+        if segment == '..':
+            current = os.path.dirname(current)
+            new_segments.append(segment)
+            continue
+
+        candidate = os.path.join(current, segment)
+        new_segment = segment
+
+        if candidate in renames:
+            # A directory, or a file imported with its extension
+            new_segment = os.path.basename(renames[candidate])
+        elif i == last:
+            resolved = resolver.resolve_abspath(candidate)
+            if resolved in renames and resolved.startswith(candidate):
+                # Keep whatever suffix the import omitted (e.g. '.tsx')
+                omitted = resolved[len(candidate):]
+                new_name = os.path.basename(renames[resolved])
+                new_segment = new_name[:len(new_name) - len(omitted)] if omitted else new_name
+
+        new_segments.append(new_segment)
+        current = candidate
+
+    return prefix + '/'.join(new_segments)
+
+def read_source(snapshot: SourceSnapshot, rel_path: str) -> Tuple[str, Optional[str]]:
+    file_path = snapshot.abspath(rel_path)
+    try:
+        return file_path, snapshot.read_text(rel_path)
+    except UnicodeDecodeError:
+        return file_path, None
+
+def rewrite_file_imports(content: str, file_path: str, resolver: ModuleResolver,
+                         renames: Dict[str, str]) -> Tuple[str, List[Tuple[str, str]]]:
+    """Builds the rewritten file in one pass over the import match spans"""
+    file_dir = os.path.dirname(file_path)
+    pieces = []
+    changes = []
+    last_end = 0
+
+    for match in IMPORT_REGEX.finditer(content):
+        # Group 2 is for `from '...'` and group 4 is for `import('...')`
+        group = 2 if match.group(2) else 4
+        import_path = match.group(group)
+        if not import_path:
+            continue
+
+        new_import_path = rewrite_import_path(import_path, file_dir, resolver, renames)
+        if new_import_path == import_path:
+            continue
+
+        start, end = match.span(group)
+        pieces.append(content[last_end:start])
+        pieces.append(new_import_path)
+        last_end = end
+        changes.append((import_path, new_import_path))
+
+    if not changes:
+        return content, changes
+
+    pieces.append(content[last_end:])
+    return ''.join(pieces), changes
+
+def update_file_imports(root_dir: str, rename_map: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """
+    Scans all .ts and .tsx files and rewrites their import statements based on the rename map.
+    Returns (file path, new content) for every file that changed; nothing is written here.
+    """
+    if not rename_map:
+        return []
 
     print("\n🔍 Scanning for imports to update...")
-    
-    # Regex to find static and dynamic imports, handles single and double quotes
-    import_regex = re.compile(r"""from\s+(['"])([^'"]+)\1|import\((['"])([^'"]+)\3\)""")
+    timings: Dict[str, float] = {}
 
-    files_to_update = 0
-    for dirpath, _, filenames in os.walk(root_dir):
-        for filename in filenames:
-            if not (filename.endswith('.tsx') or filename.endswith('.ts')):
-                continue
+    # Phase 1: index every existing path once
+    with timed("index modules", "scan") as phase:
+        resolver = ModuleResolver(load_snapshot(root_dir))
+        sources = [entry.path for entry in resolver.snapshot.files(extensions=('.ts', '.tsx'))]
+        renames = {
+            os.path.abspath(old): os.path.abspath(new)
+            for old, new in rename_map
+        }
+    timings['index'] = phase.duration
+
+    # Phase 2: read all sources in parallel
+    with timed("read sources", "read") as phase:
+        with ThreadPoolExecutor() as pool:
+            contents = list(pool.map(lambda path: read_source(resolver.snapshot, path), sources))
+    timings['read'] = phase.duration
 
-            file_path = os.path.join(dirpath, filename)
-            
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-            except UnicodeDecodeError:
+    # Phase 3: rewrite in memory
+    with timed("rewrite imports", "regex") as phase:
+        updated: List[Tuple[str, str]] = []
+        for file_path, content in contents:
+            if content is None:
                 print(f"⚠️  Could not read {file_path} (skipping).")
                 continue
 
-            original_content = content
-            
-            # Use finditer to get all matches
-            matches = import_regex.finditer(content)
-            
-            for match in matches:
-                # Group 2 is for `from '...'` and group 4 is for `import('...')`
-                import_path = match.group(2) or match.group(4)
-                
-                if not import_path:
-                    continue
-
-                abs_path_base = None
-                # Correctly resolve path based on its type
-                if import_path.startswith('@/'):
-                    # It's an alias path, resolve from root_dir
-                    abs_path_base = os.path.abspath(os.path.join(root_dir, import_path[2:]))
-                elif import_path.startswith('.'):
-                    # It's a relative path, resolve from the current file's directory
-                    abs_path_base = os.path.abspath(os.path.join(os.path.dirname(file_path), import_path))
-                else:
-                    # It's a library import, skip it
-                    continue
-
-                if abs_path_base in old_to_new_lookup:
-                    new_abs_path = old_to_new_lookup[abs_path_base]
-                    new_import_base_name = os.path.basename(new_abs_path)
-                    
-                    # Construct the new import path by replacing the last part (the filename)
-                    path_parts = import_path.split('/')
-                    path_parts[-1] = new_import_base_name
-                    new_import_path = '/'.join(path_parts)
-                    
-                    # Extract the original quote style to preserve it
-                    quote_char = match.group(1) or match.group(3)
-                    
-                    original_import_statement = f"{quote_char}{import_path}{quote_char}"
-                    new_import_statement = f"{quote_char}{new_import_path}{quote_char}"
-                    
-                    if original_import_statement != new_import_statement:
-                        print(f"  - In '{os.path.relpath(file_path, root_dir)}':")
-                        print(f"    {import_path}  ->  {new_import_path}")
-                        content = content.replace(original_import_statement, new_import_statement)
-
-            if content != original_content:
-                files_to_update += 1
-                if not dry_run:
-                    print(f"  💾 Writing changes to '{os.path.relpath(file_path, root_dir)}'")
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write(content)
-    
-    if files_to_update > 0:
-        print(f"\n✅ Found and updated imports in {files_to_update} files.")
+            new_content, changes = rewrite_file_imports(content, file_path, resolver, renames)
+            if not changes:
+                continue
+
+            print(f"  - In '{os.path.relpath(file_path, resolver.src_dir)}':")
+            for import_path, new_import_path in changes:
+                print(f"    {import_path}  ->  {new_import_path}")
+            updated.append((file_path, new_content))
+    timings['rewrite'] = phase.duration
+
+    if updated:
+        print(f"\n✅ Found imports to update in {len(updated)} files.")
     else:
         print("\n✅ No relevant local imports needed updating.")
 
+    print(f"⏱️  {len(sources)} files: " + ", ".join(
+        f"{phase} {seconds * 1000:.1f}ms" for phase, seconds in timings.items()
+    ))
+    return updated
+
+def exists_exactly(path: str) -> bool:
+    """os.path.exists with a case-sensitive last component, also on case-insensitive filesystems"""
+    try:
+        return os.path.basename(path) in os.listdir(os.path.dirname(path) or '.')
+    except OSError:
+        return False
+
+def rename_steps(rename_map: List[Tuple[str, str]]) -> List[List[str]]:
+    """
+    Absolute (old, new) renames as journaled. A case-only rename is a no-op or an
+    error on some case-insensitive filesystems, so it goes through a temp name in
+    two journaled steps that rollback can undo one by one.
+    """
+    steps = []
+    for old, new in rename_map:
+        old, new = os.path.abspath(old), os.path.abspath(new)
+        if is_case_only(old, new):
+            steps.append([old, new + '.refactor-case'])
+            steps.append([new + '.refactor-case', new])
+        else:
+            steps.append([old, new])
+    return steps
+
+class RefactorTransaction:
+    """
+    Applies import edits and renames behind a write-ahead journal.
+
+    The journal lists every planned edit and rename before anything is touched.
+    Each edited file is hard-linked (or copied) to a backup, its new content is
+    staged in a temp file and swapped in with os.replace, then the renames run.
+    If anything fails, or the process dies and `--rollback` is run later, the
+    renames are undone in reverse and the backups swapped back.
+    """
+
+    def __init__(self, journal_path: str):
+        self.journal_path = os.path.abspath(journal_path)
+        self.backup_dir = self.journal_path + '.backup'
+
+    def pending(self) -> bool:
+        return os.path.exists(self.journal_path)
+
+    def write_journal(self, journal: Dict):
+        os.makedirs(os.path.dirname(self.journal_path), exist_ok=True)
+        tmp_path = self.journal_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(journal, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.journal_path)
+
+    def apply(self, edits: List[Tuple[str, str]], rename_map: List[Tuple[str, str]]):
+        journal = {
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'edits': [
+                {
+                    'path': os.path.abspath(path),
+                    'backup': os.path.join(self.backup_dir, str(i)),
+                }
+                for i, (path, _) in enumerate(edits)
+            ],
+            'renames': rename_steps(rename_map),
+        }
+        self.write_journal(journal)
+        # Left over when a previous commit stopped between removing the journal and the backups
+        shutil.rmtree(self.backup_dir, ignore_errors=True)
+        os.makedirs(self.backup_dir, exist_ok=True)
+
+        try:
+            with timed("write edits", "write") as phase:
+                # Stage every edit before swapping any of them in
+                for entry, (_, new_content) in zip(journal['edits'], edits):
+                    tmp_path = entry['path'] + '.refactor-tmp'
+                    with open(tmp_path, 'w', encoding='utf-8') as f:
+                        f.write(new_content)
+                    try:
+                        os.link(entry['path'], entry['backup'])
+                    except OSError:
+                        shutil.copy2(entry['path'], entry['backup'])
+
+                for entry in journal['edits']:
+                    os.replace(entry['path'] + '.refactor-tmp', entry['path'])
+            print(f"💾 Wrote {len(edits)} files in {phase.duration * 1000:.1f}ms")
+
+            if rename_map:
+                print("\n🚀 Performing renames...")
+                with span("rename paths", "write"):
+                    for old, new in journal['renames']:
+                        os.rename(old, new)
+                print("✅ All renames completed successfully!")
+        except (OSError, KeyboardInterrupt) as e:
+            print(f"\n❌ An error occurred, rolling back: {e}")
+            self.rollback()
+            raise SystemExit(1)
+
+        self.commit()
+
+    def commit(self):
+        # Journal first: a journal without its backups could not restore the edited files
+        os.remove(self.journal_path)
+        shutil.rmtree(self.backup_dir, ignore_errors=True)
+
+    def rollback(self):
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            journal = json.load(f)
+
+        undone = 0
+        for old, new in reversed(journal['renames']):
+            if exists_exactly(new) and not exists_exactly(old):
+                os.rename(new, old)
+                undone += 1
+
+        restored = 0
+        for entry in journal['edits']:
+            tmp_path = entry['path'] + '.refactor-tmp'
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            if os.path.exists(entry['backup']):
+                os.replace(entry['backup'], entry['path'])
+                restored += 1
+
+        self.commit()
+        print(f"↩️  Rolled back {undone} renames and restored {restored} files.")
+
+
+# Entry points of the app: everything else must be reachable from these
+DEAD_CODE_ROOTS = ['main.tsx', 'router.tsx', 'routeTree.gen.ts']
+DEAD_CODE_ROOT_DIRS = ['routes']
+
+def find_dead_modules(root_dir: str, extra_roots: List[str]):
+    """
+    Reports modules unreachable from the app entry points, and exports nobody imports.
+    """
+    with span("build import graph", "scan"):
+        graph = ImportGraph(root_dir).refresh()
+
+    roots = [r for r in DEAD_CODE_ROOTS + extra_roots if r in graph.modules]
+    for path in graph.modules:
+        if path.endswith('.d.ts') or any(path.startswith(d + '/') for d in DEAD_CODE_ROOT_DIRS):
+            roots.append(path)
+
+    reachable = graph.reachable_from(roots)
+    unreachable = sorted(
+        (path for path in graph.modules if path not in reachable),
+        key=lambda path: (-graph.modules[path].lines, path),
+    )
+
+    print(f"\n🌱 {len(roots)} roots, {len(reachable)}/{len(graph.modules)} modules reachable.")
+    if unreachable:
+        total_lines = sum(graph.modules[path].lines for path in unreachable)
+        print(f"\n🪦 {len(unreachable)} unreachable modules ({total_lines} lines):")
+        for path in unreachable:
+            print(f"  - {path} ({graph.modules[path].lines} lines)")
+    else:
+        print("\n✅ Every module is reachable.")
+
+    used = graph.imported_names()
+    root_set = set(roots)
+    unused_exports = []
+    for path in sorted(reachable - root_set):
+        names = used.get(path, set())
+        if '*' in names:
+            continue
+        unused_exports.extend((path, name) for name in graph.modules[path].exports if name not in names)
+
+    if unused_exports:
+        print(f"\n🔇 {len(unused_exports)} exports are never imported:")
+        for path, name in unused_exports:
+            print(f"  - {path}: {name}")
+    else:
+        print("\n✅ Every export is imported somewhere.")
 
 def main():
     parser = argparse.ArgumentParser(description="Refactor filenames to kebab-case and update imports.")
     parser.add_argument(
         "--dir", 
-        required=True, 
         help="The root directory to scan (e.g., 'src')."
     )
     parser.add_argument(
@@ -168,12 +433,58 @@ def main():
         action="store_true", 
         help="Show what would be changed without actually modifying any files."
     )
+    parser.add_argument(
+        "--find-dead",
+        action="store_true",
+        help="List modules unreachable from main.tsx/router.tsx/routes and unused exports, then exit."
+    )
+    parser.add_argument(
+        "--root",
+        action="append",
+        default=[],
+        help="Extra entry module for --find-dead, relative to --dir. Can be used multiple times."
+    )
+    parser.add_argument(
+        "--journal",
+        default=DEFAULT_JOURNAL_PATH,
+        help="Write-ahead journal used to roll back an interrupted refactor."
+    )
+    parser.add_argument(
+        "--rollback",
+        action="store_true",
+        help="Undo an interrupted refactor recorded in the journal, then exit."
+    )
+    add_profiling_arguments(parser)
     args = parser.parse_args()
 
+    with profiling_session(args, "refactor_filenames"):
+        run(args, parser)
+
+def run(args: argparse.Namespace, parser: argparse.ArgumentParser):
+    transaction = RefactorTransaction(args.journal)
+    if args.rollback:
+        if not transaction.pending():
+            print("✅ No interrupted refactor to roll back.")
+            return
+        transaction.rollback()
+        return
+
+    if not args.dir:
+        parser.error("the following arguments are required: --dir")
+
     if not os.path.isdir(args.dir):
         print(f"Error: Directory '{args.dir}' not found.")
         return
 
+    if args.find_dead:
+        find_dead_modules(args.dir, args.root)
+        return
+
+    if not args.dry_run and transaction.pending():
+        print(f"❌ An interrupted refactor is recorded in {args.journal}.")
+        print("Run with --rollback to undo it before starting a new one.")
+        return
+
     print("="*50)
     if args.dry_run:
         print("DRY RUN MODE: No files will be changed.")
@@ -187,7 +498,17 @@ def main():
             print(f"  - {p}")
 
     # 1. Find all files and directories that need to be renamed
-    rename_map = find_rename_targets(args.dir, args.ignore)
+    plan = find_rename_targets(args.dir, args.ignore)
+    rename_map = plan.renames
+
+    if plan.collisions:
+        print("\n❌ These names would collide after the rename (names are compared case-insensitively):")
+        for paths, new_name in plan.collisions:
+            names = ", ".join(f"'{os.path.relpath(path, args.dir)}'" for path in paths)
+            print(f"  - {names}  ->  '{new_name}'")
+        if not args.dry_run:
+            print("Rename or --ignore them first; nothing was changed.")
+            return
 
     if not rename_map:
         print("\n✅ All filenames already seem to be in kebab-case or are ignored. No renames needed.")
@@ -197,21 +518,15 @@ def main():
         for old, new in sorted(rename_map):
             old_rel = os.path.relpath(old, args.dir)
             new_rel = os.path.relpath(new, args.dir)
-            print(f"  - '{old_rel}'  ->  '{new_rel}'")
+            note = "  (case-only)" if is_case_only(old, new) else ""
+            print(f"  - '{old_rel}'  ->  '{new_rel}'{note}")
 
-    # 2. Update all import statements
-    update_file_imports(args.dir, rename_map, args.dry_run)
+    # 2. Rewrite all import statements in memory
+    edits = update_file_imports(args.dir, rename_map)
 
-    # 3. Perform the actual renaming if not in dry-run
+    # 3. Apply the edits and renames as one journaled transaction
     if not args.dry_run and rename_map:
-        print("\n🚀 Performing renames...")
-        try:
-            for old, new in rename_map:
-                os.rename(old, new)
-            print("✅ All renames completed successfully!")
-        except OSError as e:
-            print(f"\n❌ An error occurred during renaming: {e}")
-            print("Please check the state of your files. You may need to revert using Git.")
+        transaction.apply(edits, rename_map)
 
     print("\n✨ Refactoring process finished.")
     if args.dry_run:
@@ -0,0 +1,195 @@
+# Copyright 2025 RAIDS Lab
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+📸 Shared snapshot of the source tree for the hack/ tools
+
+One scandir walk collects every file under a root with its size, mtime and
+content hash; contents are only read when a tool asks for them. The snapshot
+is cached in hack/.cache/, so later runs (e.g. the next tool in the pre-commit
+chain) only re-hash files whose size or mtime changed; the caches of the
+least recently saved roots beyond MAX_CACHED_ROOTS are removed. Within one
+process load_snapshot() hands every caller the same snapshot.
+
+    from source_snapshot import load_snapshot
+
+    snapshot = load_snapshot("src")
+    for entry in snapshot.files(extensions=(".ts", ".tsx")):
+        content = snapshot.read_text(entry.path)
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set
+
+from timings import span
+
+CACHE_VERSION = 1
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+# One cache file per root; the least recently saved ones beyond this are removed
+MAX_CACHED_ROOTS = 8
+
+# The same skip rules for every tool
+SKIP_DIRS = {'node_modules', 'dist', '.venv', '.git', '__pycache__'}
+
+@dataclass
+class FileEntry:
+    path: str  # relative to the snapshot root, '/' separated
+    size: int
+    mtime_ns: int
+    sha1: str
+
+    @property
+    def name(self) -> str:
+        return self.path.rsplit('/', 1)[-1]
+
+class SourceSnapshot:
+    """🔧 Files under a root directory, refreshed incrementally from the on-disk cache"""
+
+    def __init__(self, root: str = "src", cache_dir: Optional[str] = None):
+        self.root = os.path.abspath(root)
+        root_id = hashlib.sha1(self.root.encode('utf-8')).hexdigest()[:12]
+        self.cache_path = os.path.join(cache_dir or CACHE_DIR, f"source_snapshot_{root_id}.json")
+        self.entries: Dict[str, FileEntry] = {}
+        self.dirs: Set[str] = {''}
+        self.stats = {'reused': 0, 'hashed': 0, 'removed': 0}
+        self._contents: Dict[str, bytes] = {}
+
+    def load_cache(self) -> Dict[str, FileEntry]:
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        if data.get('version') != CACHE_VERSION:
+            return {}
+        return {path: FileEntry(path, *values) for path, values in data['entries'].items()}
+
+    def save_cache(self):
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        data = {
+            'version': CACHE_VERSION,
+            'root': self.root,
+            'entries': {
+                path: [entry.size, entry.mtime_ns, entry.sha1]
+                for path, entry in sorted(self.entries.items())
+            },
+        }
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.cache_path)
+        self.prune_caches()
+
+    def prune_caches(self):
+        """Drop the caches of roots not saved for the longest time (temp trees, old checkouts)"""
+        cache_dir = os.path.dirname(self.cache_path)
+        caches = []
+        with os.scandir(cache_dir) as it:
+            for entry in it:
+                if entry.name.startswith("source_snapshot_") and entry.name.endswith(".json"):
+                    caches.append((entry.stat().st_mtime_ns, entry.path))
+        for _, path in sorted(caches, reverse=True)[MAX_CACHED_ROOTS:]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass  # pruned by a concurrent run
+
+    def refresh(self, persist: bool = True) -> "SourceSnapshot":
+        """
+        Walk the root once, re-hashing only files whose size or mtime changed.
+        persist=False leaves the on-disk cache untouched (read-only runs).
+        """
+        cached = self.load_cache()
+        self.entries = {}
+        self.dirs = {''}
+        self._contents = {}
+        self.stats = {'reused': 0, 'hashed': 0, 'removed': 0}
+
+        with span(f"snapshot {os.path.basename(self.root)}", "scan"):
+            stack = [(self.root, '')]
+            while stack:
+                current, prefix = stack.pop()
+                with os.scandir(current) as it:
+                    for dir_entry in it:
+                        rel_path = prefix + dir_entry.name
+                        if dir_entry.is_dir(follow_symlinks=False):
+                            if dir_entry.name not in SKIP_DIRS:
+                                self.dirs.add(rel_path)
+                                stack.append((dir_entry.path, rel_path + '/'))
+                            continue
+
+                        stat = dir_entry.stat()
+                        previous = cached.get(rel_path)
+                        if previous and previous.size == stat.st_size and previous.mtime_ns == stat.st_mtime_ns:
+                            self.entries[rel_path] = previous
+                            self.stats['reused'] += 1
+                            continue
+
+                        with open(dir_entry.path, 'rb') as f:
+                            raw = f.read()
+                        # Keep what we just read, the caller most likely needs it next
+                        self._contents[rel_path] = raw
+                        self.entries[rel_path] = FileEntry(
+                            rel_path, stat.st_size, stat.st_mtime_ns, hashlib.sha1(raw).hexdigest()
+                        )
+                        self.stats['hashed'] += 1
+
+        self.stats['removed'] = len(set(cached) - set(self.entries))
+        if persist and (self.stats['hashed'] or self.stats['removed'] or not cached):
+            self.save_cache()
+        return self
+
+    def files(self, extensions: Optional[Iterable[str]] = None, under: str = '',
+              names: Optional[Iterable[str]] = None) -> List[FileEntry]:
+        """Entries filtered by extension, sub-directory (relative to the root) and file name"""
+        extensions = tuple(extensions) if extensions else None
+        names = set(names) if names else None
+        prefix = under.strip('/').replace(os.sep, '/')
+        prefix = f"{prefix}/" if prefix and prefix != '.' else ''
+
+        result = []
+        for path in sorted(self.entries):
+            if prefix and not path.startswith(prefix):
+                continue
+            if extensions and not path.endswith(extensions):
+                continue
+            if names and path.rsplit('/', 1)[-1] not in names:
+                continue
+            result.append(self.entries[path])
+        return result
+
+    def abspath(self, rel_path: str) -> str:
+        return os.path.join(self.root, *rel_path.split('/'))
+
+    def read_bytes(self, rel_path: str) -> bytes:
+        """Content of a file, read from disk at most once per snapshot"""
+        if rel_path not in self._contents:
+            with open(self.abspath(rel_path), 'rb') as f:
+                self._contents[rel_path] = f.read()
+        return self._contents[rel_path]
+
+    def read_text(self, rel_path: str) -> str:
+        return self.read_bytes(rel_path).decode('utf-8')
+
+_snapshots: Dict[str, SourceSnapshot] = {}
+
+def load_snapshot(root: str = "src", persist: bool = True) -> SourceSnapshot:
+    """The refreshed snapshot of root, shared by every caller in this process"""
+    abs_root = os.path.abspath(root)
+    if abs_root not in _snapshots:
+        _snapshots[abs_root] = SourceSnapshot(abs_root).refresh(persist)
+    return _snapshots[abs_root]
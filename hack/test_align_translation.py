@@ -0,0 +1,92 @@
+# Copyright 2025 RAIDS Lab
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# python3 -m pytest -q hack/test_align_translation.py
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import source_snapshot
+from align_translation import LocaleKeyIndex, TranslationAligner
+
+@pytest.fixture(autouse=True)
+def snapshot_cache(tmp_path, monkeypatch):
+    """Keep the snapshots of the temp projects out of hack/.cache"""
+    monkeypatch.setattr(source_snapshot, "CACHE_DIR", str(tmp_path / ".cache"))
+
+def write_json(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+
+def make_project(tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "app.tsx").write_text(
+        "export function App() {\n"
+        "  return <div title={t('page.title')}>{t('common.cancel')} {t('job.new')} {t('form.name.label')}</div>\n"
+        "}\n",
+        encoding="utf-8",
+    )
+    locales = tmp_path / "src" / "i18n" / "locales"
+    write_json(locales / "zhCN" / "translation.json", {
+        "page.title": "标题",
+        "common.cancel": "取消",
+        "job.new": "新建",
+        "dialog": {"cancel": "取消"},
+    })
+    # "取消" is already translated under dialog.cancel, job.new is unknown
+    write_json(locales / "enUS" / "translation.json", {"page.title": "Title", "dialog": {"cancel": "Cancel"}})
+    return tmp_path
+
+def test_run_writes_memory_filled_missing_files(tmp_path):
+    project = make_project(tmp_path)
+    aligner = TranslationAligner(str(project), memory_db=str(tmp_path / "memory.sqlite"))
+    aligner.run()
+
+    output_dir = project / "hack" / "missing_translations"
+    files = {path.name.split("_missing_")[0]: path for path in output_dir.glob("*.json")}
+    assert set(files) == {"zhCN", "enUS"}
+
+    zh = json.loads(files["zhCN"].read_text(encoding="utf-8"))
+    assert zh == {"form": {"name": {"label": "TODO: Translate 'form.name.label'"}}}
+
+    en = json.loads(files["enUS"].read_text(encoding="utf-8"))
+    assert en["common.cancel"] == "Cancel"  # from the translation memory
+    assert en["job.new"] == "新建"  # no translation known, the default language text is kept
+    assert en["form"] == {"name": {"label": "TODO: Translate 'form.name.label'"}}
+
+def test_run_without_save_writes_nothing(tmp_path):
+    project = make_project(tmp_path)
+    TranslationAligner(str(project), memory_db=str(tmp_path / "memory.sqlite")).run(save=False)
+    assert not (project / "hack" / "missing_translations").exists()
+
+def test_key_index_reports_and_renders_conflicts():
+    index = LocaleKeyIndex.from_translations({"job": "Job", "job.name": "Name", "a.b": "flat", "a": {"b": "nested"}})
+    assert index.get("a.b") == "flat"
+    assert index.is_namespace("job") and index.subtree_size("job") == 2
+    assert [key for key, _ in index.conflicts()] == ["a.b", "job"]
+
+    output = LocaleKeyIndex()
+    output.add("job", "Job")
+    output.add("job.name", "Name")
+    assert output.to_dict() == {"job": "Job", "job.name": "Name"}
+
+def test_memory_defaults_to_the_base_dir(tmp_path):
+    project = make_project(tmp_path)
+    TranslationAligner(str(project)).run()
+    assert (project / "hack" / ".cache" / "translation_memory.sqlite").exists()
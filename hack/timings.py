@@ -0,0 +1,199 @@
+# Copyright 2025 RAIDS Lab
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+⏱️  Phase timing and profiling hooks shared by the hack/ CLIs
+
+Wrap the main phases of a script in spans:
+
+    from timings import add_profiling_arguments, profiling_session, span
+
+    with span("read translation.json", "json"):
+        data = json.load(f)
+
+and every CLI gets the same options through add_profiling_arguments():
+
+    --timings          print time per span and per category when the run ends
+    --trace FILE       write a Chrome trace-event JSON (chrome://tracing, Perfetto)
+    --profile FILE     write cProfile stats (python -m pstats FILE, snakeviz)
+
+Categories used across the scripts: scan, read, regex, json, model,
+subprocess, write. While profiling is off span() returns a shared no-op
+context, so it costs one flag check; use timed() for a block whose duration
+the script reports itself.
+
+Worker processes record into their own copy of this module. A pool started
+with initializer=init_worker, initargs=(profiling_enabled(),) records there,
+and the parent merges what the workers send back from collect_spans() with
+add_spans().
+"""
+
+import argparse
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional
+
+@dataclass
+class Span:
+    name: str
+    category: str
+    start_ns: int
+    end_ns: int = 0
+    thread_id: int = 0
+    pid: int = 0
+
+    @property
+    def duration(self) -> float:
+        """Seconds, valid once the span has ended"""
+        return (self.end_ns - self.start_ns) / 1e9
+
+_enabled = False
+_spans: List[Span] = []
+_lock = threading.Lock()
+
+_NO_SPAN = nullcontext()
+
+def span(name: str, category: str = "main"):
+    """Record a block while profiling is on; yields None (and costs nothing) while it is off"""
+    if not _enabled:
+        return _NO_SPAN
+    return timed(name, category)
+
+@contextmanager
+def timed(name: str, category: str = "main") -> Iterator[Span]:
+    """Time a block. The yielded Span carries its duration after the block, even when recording is off."""
+    record = Span(name, category, time.perf_counter_ns())
+    try:
+        yield record
+    finally:
+        record.end_ns = time.perf_counter_ns()
+        if _enabled:
+            record.thread_id = threading.get_ident()
+            record.pid = os.getpid()
+            with _lock:
+                _spans.append(record)
+
+# === WORKER PROCESSES ===
+def profiling_enabled() -> bool:
+    return _enabled
+
+def init_worker(enabled: bool):
+    """Pool initializer: record in the worker when the parent does"""
+    global _enabled
+    _enabled = enabled
+    _spans.clear()
+
+def collect_spans() -> List[Span]:
+    """Take the spans recorded so far in this process, to send them to the parent"""
+    with _lock:
+        spans = list(_spans)
+        _spans.clear()
+    return spans
+
+def add_spans(spans: List[Span]):
+    with _lock:
+        _spans.extend(spans)
+
+def add_profiling_arguments(parser: argparse.ArgumentParser):
+    group = parser.add_argument_group("profiling")
+    group.add_argument("--timings", action="store_true", help="Print a per-phase timing summary at the end.")
+    group.add_argument("--trace", metavar="FILE", help="Write a Chrome trace-event JSON file.")
+    group.add_argument("--profile", metavar="FILE", help="Write cProfile statistics to FILE.")
+
+def outermost_per_category(spans: List[Span]) -> List[Span]:
+    """Spans not nested inside another span of the same category, so category totals add up"""
+    result = []
+    ordered = sorted(spans, key=lambda record: (record.pid, record.thread_id, record.start_ns, -record.end_ns))
+    stack: List[Span] = []
+    for record in ordered:
+        while stack and ((stack[-1].pid, stack[-1].thread_id) != (record.pid, record.thread_id)
+                         or stack[-1].end_ns <= record.start_ns):
+            stack.pop()
+        if not any(parent.category == record.category for parent in stack):
+            result.append(record)
+        stack.append(record)
+    return result
+
+def summarize(spans: List[Span], total: float) -> str:
+    by_category: Dict[str, float] = {}
+    by_name: Dict[tuple, List[float]] = {}
+    for record in outermost_per_category(spans):
+        if record.category != "main":
+            by_category[record.category] = by_category.get(record.category, 0.0) + record.duration
+    for record in spans:
+        if record.category != "main":
+            by_name.setdefault((record.category, record.name), []).append(record.duration)
+
+    lines = [f"⏱️  Timings (total {total:.3f}s)"]
+    for category, seconds in sorted(by_category.items(), key=lambda item: -item[1]):
+        share = seconds / total * 100 if total else 0.0
+        lines.append(f"  {category:<12} {seconds:>9.3f}s {share:>5.1f}%")
+    lines.append("")
+    for (category, name), durations in sorted(by_name.items(), key=lambda item: -sum(item[1]))[:20]:
+        lines.append(f"  {category:<12} {sum(durations):>9.3f}s  x{len(durations):<5} {name}")
+    return "\n".join(lines)
+
+def write_trace(spans: List[Span], path: str):
+    origin = min((record.start_ns for record in spans), default=0)
+    events = [
+        {
+            "name": record.name,
+            "cat": record.category,
+            "ph": "X",
+            "ts": (record.start_ns - origin) / 1000,
+            "dur": (record.end_ns - record.start_ns) / 1000,
+            "pid": record.pid,
+            "tid": record.thread_id,
+        }
+        for record in spans
+    ]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+@contextmanager
+def profiling_session(args: Optional[argparse.Namespace], name: str = "main") -> Iterator[None]:
+    """Record spans (and cProfile) for the duration of the block when the CLI asked for it"""
+    global _enabled
+    timings = getattr(args, "timings", False)
+    trace_path = getattr(args, "trace", None)
+    profile_path = getattr(args, "profile", None)
+    if not (timings or trace_path or profile_path):
+        yield
+        return
+
+    _enabled = True
+    _spans.clear()
+    profiler = cProfile.Profile() if profile_path else None
+    if profiler:
+        profiler.enable()
+    try:
+        with timed(name, "main") as total:
+            yield
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(profile_path)
+            print(f"📈 cProfile stats written to {profile_path}", file=sys.stderr)
+        _enabled = False
+        if trace_path:
+            write_trace(_spans, trace_path)
+            print(f"📈 Trace written to {trace_path}", file=sys.stderr)
+        if timings:
+            print(summarize(_spans, total.duration), file=sys.stderr)
@@ -0,0 +1,242 @@
+# Copyright 2025 RAIDS Lab
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# python3 ./hack/translation_memory.py stats
+# python3 ./hack/translation_memory.py lookup "取消" --locale enUS
+
+"""
+🧠 Translation memory shared by the i18n scripts
+
+A SQLite table maps a normalized source string to its translation in every
+locale, together with the i18n key it was stored under, the model (or
+`locales` for seeded entries) and the date. It is seeded from
+src/i18n/locales/*/translation.json: every value of a key is a source for the
+values of the same key in the other locales. Seeding only re-reads locale files
+whose hash changed.
+
+TranslationMemory(read_only=True) never creates or writes the database: an
+existing one is opened for lookups only (and not re-seeded), a missing one is
+replaced by an in-memory copy seeded from the locale files.
+
+    from translation_memory import TranslationMemory
+
+    memory = TranslationMemory()
+    memory.seed_from_locales("src/i18n/locales")
+    entry = memory.lookup("取消", "enUS")
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+import unicodedata
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from format_translation import flatten_json
+from timings import add_profiling_arguments, profiling_session, span
+
+DEFAULT_DB_PATH = Path(__file__).resolve().parent / ".cache" / "translation_memory.sqlite"
+DEFAULT_LOCALES_DIR = Path(__file__).resolve().parent.parent / "src" / "i18n" / "locales"
+SEED_MODEL = "locales"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    source TEXT NOT NULL,
+    locale TEXT NOT NULL,
+    translation TEXT NOT NULL,
+    key TEXT,
+    model TEXT NOT NULL,
+    created TEXT NOT NULL,
+    PRIMARY KEY (source, locale)
+);
+CREATE TABLE IF NOT EXISTS seeded_files (
+    path TEXT PRIMARY KEY,
+    sha1 TEXT NOT NULL
+);
+"""
+
+WHITESPACE_PATTERN = re.compile(r'\s+')
+INTERPOLATION_PATTERN = re.compile(r'\{\{\s*([\w.]+)\s*\}\}')
+
+def normalize_source(text: str) -> str:
+    """Lookup form of a source string: NFC, collapsed whitespace, `{{ name }}` spelled `{{name}}`"""
+    text = unicodedata.normalize("NFC", text)
+    text = WHITESPACE_PATTERN.sub(" ", text).strip()
+    return INTERPOLATION_PATTERN.sub(r'{{\1}}', text)
+
+@dataclass
+class MemoryEntry:
+    source: str
+    locale: str
+    translation: str
+    key: Optional[str]
+    model: str
+    created: str
+
+class TranslationMemory:
+    """🔧 Normalized source string -> translation per locale, backed by SQLite"""
+
+    def __init__(self, db_path: Optional[str] = None, read_only: bool = False):
+        self.db_path = Path(db_path or DEFAULT_DB_PATH)
+        # Only an existing database is opened read-only, a missing one becomes an in-memory copy
+        self.read_only = read_only and self.db_path.exists()
+        if self.read_only:
+            self.conn = sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True)
+        elif read_only:
+            self.conn = sqlite3.connect(":memory:")
+            self.conn.executescript(SCHEMA)
+        else:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self.conn = sqlite3.connect(str(self.db_path))
+            self.conn.executescript(SCHEMA)
+        self.stats = {'hits': 0, 'misses': 0, 'recorded': 0}
+
+    def close(self):
+        self.conn.close()
+
+    # === SEEDING ===
+    def seed_from_locales(self, locales_dir: str = DEFAULT_LOCALES_DIR) -> int:
+        """Load every locale's translation.json, skipping files seeded with the same content. Returns entries written."""
+        if self.read_only:
+            return 0
+        locales_dir = Path(locales_dir).resolve()
+        files = sorted(locales_dir.glob("*/translation.json"))
+        if not files:
+            return 0
+
+        contents = {}
+        changed = False
+        for path in files:
+            raw = path.read_bytes()
+            contents[path.parent.name] = raw
+            row = self.conn.execute("SELECT sha1 FROM seeded_files WHERE path = ?", (str(path),)).fetchone()
+            if not row or row[0] != hashlib.sha1(raw).hexdigest():
+                changed = True
+        if not changed:
+            return 0
+
+        with span("seed translation memory", "json"):
+            by_locale: Dict[str, Dict[str, str]] = {}
+            for locale, raw in contents.items():
+                try:
+                    flat = flatten_json(json.loads(raw.decode("utf-8")))
+                except (UnicodeDecodeError, json.JSONDecodeError) as e:
+                    print(f"⚠️  Skipping {locale}/translation.json for the translation memory: {e}")
+                    continue
+                by_locale[locale] = {key: value for key, value in flat.items() if isinstance(value, str) and value}
+
+            created = time.strftime('%Y-%m-%d')
+            rows = []
+            for source_locale, source_values in by_locale.items():
+                # Later rows win, so the shortest (most generic) key ends up stored for a shared string
+                for key, source in sorted(source_values.items(), key=lambda item: (-len(item[0]), item[0])):
+                    normalized = normalize_source(source)
+                    for locale, values in by_locale.items():
+                        if key in values:
+                            rows.append((normalized, locale, values[key], key, SEED_MODEL, created))
+
+            with self.conn:
+                # The locale files are reviewed, so they win over earlier model output
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?)", rows
+                )
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO seeded_files VALUES (?, ?)",
+                    [(str(locales_dir / locale / "translation.json"), hashlib.sha1(raw).hexdigest())
+                     for locale, raw in contents.items()],
+                )
+        return len(rows)
+
+    # === LOOKUP ===
+    def lookup(self, source: str, locale: str) -> Optional[MemoryEntry]:
+        row = self.conn.execute(
+            "SELECT * FROM translations WHERE source = ? AND locale = ?", (normalize_source(source), locale)
+        ).fetchone()
+        self.stats['hits' if row else 'misses'] += 1
+        return MemoryEntry(*row) if row else None
+
+    def lookup_many(self, sources: Iterable[str], locale: str) -> Dict[str, MemoryEntry]:
+        """Known entries for sources, keyed by the original (un-normalized) source string"""
+        found = {}
+        for source in sources:
+            entry = self.lookup(source, locale)
+            if entry:
+                found[source] = entry
+        return found
+
+    # === RECORDING ===
+    def record(self, translations: Iterable[Tuple[str, str, Optional[str]]], locale: str, model: str) -> int:
+        """Store (source, translation, key) triples produced by a model; existing entries are kept"""
+        created = time.strftime('%Y-%m-%d')
+        rows = [
+            (normalize_source(source), locale, translation, key, model, created)
+            for source, translation, key in translations
+            if source and translation
+        ]
+        with self.conn:
+            cursor = self.conn.executemany("INSERT OR IGNORE INTO translations VALUES (?, ?, ?, ?, ?, ?)", rows)
+        self.stats['recorded'] += cursor.rowcount
+        return cursor.rowcount
+
+    def counts(self) -> List[Tuple[str, str, int]]:
+        return self.conn.execute(
+            "SELECT locale, model, COUNT(*) FROM translations GROUP BY locale, model ORDER BY locale, model"
+        ).fetchall()
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect the translation memory used by the i18n scripts.")
+    parser.add_argument("--db", default=str(DEFAULT_DB_PATH), help="SQLite database of the translation memory.")
+    parser.add_argument("--locales-dir", default=str(DEFAULT_LOCALES_DIR), help="Locale folders to seed from.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("stats", help="Seed from the locale files and show entry counts.")
+    lookup = subparsers.add_parser("lookup", help="Look up a source string.")
+    lookup.add_argument("text")
+    lookup.add_argument("--locale", action="append", help="Locale(s) to show (default: all).")
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+
+    with profiling_session(args, "translation_memory"):
+        run(args)
+
+def run(args: argparse.Namespace):
+    if not os.path.isdir(args.locales_dir):
+        print(f"Error: Locales directory '{args.locales_dir}' not found.")
+        sys.exit(1)
+
+    memory = TranslationMemory(args.db)
+    seeded = memory.seed_from_locales(args.locales_dir)
+    if seeded:
+        print(f"🌱 Seeded {seeded} entries from {args.locales_dir}")
+
+    if args.command == "stats":
+        for locale, model, count in memory.counts():
+            print(f"  {locale:<8} {model:<24} {count}")
+    elif args.command == "lookup":
+        locales = args.locale or [locale for locale, _, _ in memory.counts()]
+        for locale in dict.fromkeys(locales):
+            entry = memory.lookup(args.text, locale)
+            if entry:
+                print(f"  {locale:<8} {entry.translation}  ({entry.key}, {entry.model}, {entry.created})")
+            else:
+                print(f"  {locale:<8} -")
+    memory.close()
+
+if __name__ == "__main__":
+    main()
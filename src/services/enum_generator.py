@@ -0,0 +1,432 @@
+# Copyright 2025 RAIDS Lab
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# python3 ./src/services/enum_generator.py ./enums.json
+# make generate-enums ENUM_CONFIG=./enums.json
+
+"""
+Mirror backend Go constant types (job status, resource types, ...) as TypeScript enums.
+
+The config lists Go source files and, for each, the types to export:
+
+    {
+      "sources": [
+        {
+          "go": "../web-backend/internal/model/job.go",
+          "types": [
+            {"type": "JobStatus", "output": "./src/services/enums/job-status.ts"},
+            {"type": "JobType", "output": "./src/services/enums/job-type.ts", "trimPrefix": "Job"}
+          ]
+        }
+      ]
+    }
+
+Paths are relative to the config file. Each Go file is tokenized once, both
+single and grouped `const (...)` declarations are evaluated (including `iota`
+sequences and implicit repetition), and one TypeScript module is written per
+type. Source hashes are cached, so unchanged sources are skipped on the next run.
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+import sys
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', '..', 'hack', '.cache', 'enum_generator.json'
+)
+
+# === TOKENIZER ===
+TOKEN_PATTERN = re.compile(r'''
+    (?P<comment>//[^\n]*|/\*.*?\*/)
+  | (?P<newline>\n)
+  | (?P<space>[ \t\r]+)
+  | (?P<string>"(?:\\.|[^"\\\n])*"|`[^`]*`)
+  | (?P<rune>'(?:\\.|[^'\\\n])+')
+  | (?P<number>0[xX][0-9a-fA-F_]+|0[bB][01_]+|0[oO][0-7_]+|(?:\d[\d_]*(?:\.[\d_]*)?|\.\d[\d_]*)(?:[eE][+-]?\d+)?)
+  | (?P<ident>[A-Za-z_]\w*)
+  | (?P<op><<|>>|&\^|[-+*/%&|^!(),;=.\[\]{}<>:~])
+''', re.VERBOSE | re.DOTALL)
+
+# Go inserts a semicolon at a newline after these tokens
+SEMICOLON_AFTER = {'ident', 'number', 'string', 'rune'}
+
+def tokenize(go_source: str):
+    """Returns [(kind, text)], with Go's automatic semicolons made explicit"""
+    tokens = []
+    position = 0
+    while position < len(go_source):
+        match = TOKEN_PATTERN.match(go_source, position)
+        if not match:
+            raise ValueError(f'Unexpected character {go_source[position]!r} at offset {position}')
+        position = match.end()
+        kind = match.lastgroup
+        text = match.group()
+
+        if kind in ('space', 'comment') and '\n' not in text:
+            continue
+        if kind in ('newline', 'comment'):
+            if tokens and (tokens[-1][0] in SEMICOLON_AFTER or tokens[-1][1] in (')', ']', '}')):
+                tokens.append(('op', ';'))
+            continue
+        if kind == 'space':
+            continue
+        tokens.append((kind, text))
+    return tokens
+
+SIMPLE_ESCAPES = {
+    'a': '\a', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t', 'v': '\v',
+    '\\': '\\', "'": "'", '"': '"',
+}
+ESCAPE_PATTERN = re.compile(r'\\(?:([abfnrtv\\\'"])|([0-7]{3})|x([0-9a-fA-F]{2})|u([0-9a-fA-F]{4})|U([0-9a-fA-F]{8})|(.))')
+
+def decode_go_escapes(text: str, rune: bool = False) -> str:
+    """
+    Body of an interpreted string or rune literal with Go's escape sequences decoded.
+    In strings \\x and octal escapes are single bytes of the UTF-8 encoding; in runes they are the code point.
+    """
+    decoded = bytearray()
+    position = 0
+    for match in ESCAPE_PATTERN.finditer(text):
+        decoded += text[position:match.start()].encode('utf-8')
+        position = match.end()
+        simple, octal, hex_byte, short, long, invalid = match.groups()
+        if invalid is not None:
+            raise ValueError(f'Unknown escape sequence \\{invalid}')
+        if simple:
+            decoded += SIMPLE_ESCAPES[simple].encode('utf-8')
+        elif (octal or hex_byte) and not rune:
+            decoded.append(int(octal, 8) if octal else int(hex_byte, 16))
+        else:
+            decoded += chr(int(octal, 8) if octal else int(hex_byte or short or long, 16)).encode('utf-8')
+    decoded += text[position:].encode('utf-8')
+    return decoded.decode('utf-8')
+
+def parse_number(text: str):
+    text = text.replace('_', '')
+    if text[:2].lower() in ('0x', '0b', '0o'):
+        return int(text, 0)
+    if any(c in text for c in '.eE'):
+        return float(text)
+    # Go reads a leading 0 as octal
+    return int(text, 8) if len(text) > 1 and text[0] == '0' else int(text)
+
+# === CONSTANT EVALUATION ===
+BINARY_PRECEDENCE = {
+    '*': 5, '/': 5, '%': 5, '<<': 5, '>>': 5, '&': 5, '&^': 5,
+    '+': 4, '-': 4, '|': 4, '^': 4,
+}
+
+class ExpressionEvaluator:
+    """Evaluates a constant expression token list with Go operator precedence"""
+
+    def __init__(self, tokens, iota: int, scope: dict):
+        self.tokens = tokens
+        self.position = 0
+        self.iota = iota
+        self.scope = scope
+
+    def peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, None)
+
+    def take(self):
+        token = self.peek()
+        self.position += 1
+        return token
+
+    def evaluate(self):
+        value = self.binary(1)
+        if self.position != len(self.tokens):
+            raise ValueError(f'Unsupported constant expression: {" ".join(t for _, t in self.tokens)}')
+        return value
+
+    def binary(self, min_precedence: int):
+        left = self.unary()
+        while True:
+            _, op = self.peek()
+            precedence = BINARY_PRECEDENCE.get(op)
+            if precedence is None or precedence < min_precedence:
+                return left
+            self.take()
+            right = self.binary(precedence + 1)
+            left = self.apply(op, left, right)
+
+    @staticmethod
+    def apply(op: str, left, right):
+        if op == '+':
+            return left + right
+        if op == '-':
+            return left - right
+        if op == '*':
+            return left * right
+        if op == '/':
+            return int(left / right) if isinstance(left, int) and isinstance(right, int) else left / right
+        if op == '%':
+            return int(math.fmod(left, right))
+        if op == '<<':
+            return left << right
+        if op == '>>':
+            return left >> right
+        if op == '&':
+            return left & right
+        if op == '&^':
+            return left & ~right
+        if op == '|':
+            return left | right
+        return left ^ right
+
+    def unary(self):
+        _, text = self.peek()
+        if text in ('-', '+', '^'):
+            self.take()
+            value = self.unary()
+            return -value if text == '-' else (~value if text == '^' else value)
+        return self.primary()
+
+    def primary(self):
+        kind, text = self.take()
+        if kind == 'number':
+            return parse_number(text)
+        if kind == 'string':
+            return text[1:-1] if text.startswith('`') else decode_go_escapes(text[1:-1])
+        if kind == 'rune':
+            value = decode_go_escapes(text[1:-1], rune=True)
+            if len(value) != 1:
+                raise ValueError(f'Invalid rune literal {text}')
+            return ord(value)
+        if text == '(':
+            value = self.binary(1)
+            self.expect(')')
+            return value
+        if kind == 'ident':
+            # Skip package qualifiers: `pkg.Name`
+            while self.peek()[1] == '.':
+                self.take()
+                _, text = self.take()
+            if self.peek()[1] == '(':
+                # Conversion like `JobStatus("Running")` or `int64(1 << iota)`
+                self.take()
+                value = self.binary(1)
+                self.expect(')')
+                return value
+            if text == 'iota':
+                return self.iota
+            if text in ('true', 'false'):
+                return text == 'true'
+            if text in self.scope:
+                return self.scope[text]
+        raise ValueError(f'Unsupported token in constant expression: {text!r}')
+
+    def expect(self, text: str):
+        _, actual = self.take()
+        if actual != text:
+            raise ValueError(f'Expected {text!r}, got {actual!r}')
+
+def split_top_level(tokens, separator: str):
+    parts, current, depth = [], [], 0
+    for token in tokens:
+        if token[1] in ('(', '[', '{'):
+            depth += 1
+        elif token[1] in (')', ']', '}'):
+            depth -= 1
+        if token[1] == separator and depth == 0:
+            parts.append(current)
+            current = []
+        else:
+            current.append(token)
+    parts.append(current)
+    return parts
+
+def parse_const_specs(spec_tokens_list, scope: dict):
+    """
+    Evaluates the specs of one const declaration, returns [(name, type, value)].
+    Constants the evaluator does not support (`5 * time.Minute`, calls, ...) are
+    skipped with a warning; enum members referring to them fail in turn.
+    """
+    constants = []
+    previous_type, previous_exprs = None, None
+
+    # Empty specs come from blank lines and do not advance iota
+    for iota, spec in enumerate(spec for spec in spec_tokens_list if spec):
+        if ('op', '=') in spec:
+            left = spec[:spec.index(('op', '='))]
+            exprs = split_top_level(spec[spec.index(('op', '=')) + 1:], ',')
+            names = [t for k, t in left if k == 'ident']
+            # `A, B Type = ...` -> the last identifier is the type if there is one more ident than commas
+            commas = sum(1 for _, t in left if t == ',')
+            type_name = None
+            if len(names) > commas + 1:
+                type_name = names.pop()
+                # `Name pkg.Type`: drop the qualifier
+                if len(names) > commas + 1:
+                    names.pop()
+            previous_type, previous_exprs = type_name, exprs
+        else:
+            # Implicit repetition of the previous expression list and type
+            names = [t for k, t in spec if k == 'ident']
+            type_name, exprs = previous_type, previous_exprs
+            if exprs is None:
+                continue
+
+        for name, expr in zip(names, exprs):
+            try:
+                value = ExpressionEvaluator(expr, iota, scope).evaluate()
+            except (ValueError, TypeError, ZeroDivisionError, IndexError) as e:
+                if name != '_':
+                    print(f'⚠️  Skipping constant {name}: {e}')
+                continue
+            if name != '_':
+                scope[name] = value
+                constants.append((name, type_name, value))
+    return constants
+
+def parse_go_constants(go_source: str):
+    """All typed and untyped constants of a Go file, in declaration order"""
+    tokens = tokenize(go_source)
+    constants = []
+    scope = {}
+    i = 0
+    while i < len(tokens):
+        if tokens[i] != ('ident', 'const'):
+            i += 1
+            continue
+        i += 1
+        if tokens[i][1] == '(':
+            depth, start = 1, i + 1
+            i += 1
+            while depth:
+                if tokens[i][1] == '(':
+                    depth += 1
+                elif tokens[i][1] == ')':
+                    depth -= 1
+                i += 1
+            specs = split_top_level(tokens[start:i - 1], ';')
+        else:
+            start = i
+            while i < len(tokens) and tokens[i][1] != ';':
+                i += 1
+            specs = [tokens[start:i]]
+        constants.extend(parse_const_specs(specs, scope))
+    return constants
+
+# === CODE GENERATION ===
+def ts_literal(value) -> str:
+    if isinstance(value, str):
+        return "'" + value.replace('\\', '\\\\').replace("'", "\\'") + "'"
+    return str(value)
+
+def render_ts_enum(type_name: str, members, source_label: str, trim_prefix: str) -> str:
+    lines = [
+        f'// This file is generated by enum_generator.py from {source_label}',
+        '// Please do not modify this file manually',
+        '',
+        f'export enum {type_name} {{',
+    ]
+    for name, value in members:
+        member = name
+        if trim_prefix and name.startswith(trim_prefix) and name != trim_prefix:
+            stripped = name[len(trim_prefix):]
+            if not stripped[0].isdigit():
+                member = stripped
+        lines.append(f'  {member} = {ts_literal(value)},')
+    lines.append('}')
+    return '\n'.join(lines) + '\n'
+
+def write_if_changed(path: str, content: str) -> bool:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            if f.read() == content:
+                return False
+    except FileNotFoundError:
+        pass
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+    return True
+
+def load_cache(cache_path: str) -> dict:
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_cache(cache_path: str, cache: dict):
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    with open(cache_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=2)
+
+def generate_enums(config_path: str, cache_path: str = DEFAULT_CACHE_PATH, force: bool = False) -> int:
+    """Generate every configured enum, returns the number of files written"""
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    base_dir = os.path.dirname(os.path.abspath(config_path))
+    cache = load_cache(cache_path)
+    written = 0
+    # A change to the tokenizer or renderer must regenerate unchanged sources too
+    with open(os.path.abspath(__file__), 'rb') as f:
+        generator_digest = hashlib.sha256(f.read()).digest()
+
+    for source in config['sources']:
+        go_path = os.path.normpath(os.path.join(base_dir, source['go']))
+        with open(go_path, 'rb') as f:
+            raw = f.read()
+
+        # The hash covers the Go source, its config entry and this generator
+        digest = hashlib.sha256(
+            generator_digest + raw + json.dumps(source, sort_keys=True).encode('utf-8')
+        ).hexdigest()
+        outputs = [os.path.normpath(os.path.join(base_dir, t['output'])) for t in source['types']]
+        if not force and cache.get(go_path) == digest and all(os.path.exists(p) for p in outputs):
+            print(f'Skipping {source["go"]} (unchanged)')
+            continue
+
+        constants = parse_go_constants(raw.decode('utf-8'))
+        for type_config, output_path in zip(source['types'], outputs):
+            type_name = type_config['type']
+            members = [(name, value) for name, const_type, value in constants if const_type == type_name]
+            if not members:
+                print(f'⚠️  No constants of type {type_name} found in {source["go"]}')
+                continue
+
+            content = render_ts_enum(
+                type_name, members, os.path.basename(go_path), type_config.get('trimPrefix', type_name)
+            )
+            if write_if_changed(output_path, content):
+                written += 1
+                print(f'Generated {type_config["output"]} ({len(members)} members)')
+
+        cache[go_path] = digest
+
+    save_cache(cache_path, cache)
+    return written
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate TypeScript enums from backend Go constants.')
+    parser.add_argument('config', help='JSON config listing Go sources and the types to export')
+    parser.add_argument('--cache', default=DEFAULT_CACHE_PATH, help='Where to store per-source hashes')
+    parser.add_argument('--force', action='store_true', help='Regenerate even if sources are unchanged')
+    args = parser.parse_args()
+
+    try:
+        written = generate_enums(args.config, args.cache, args.force)
+    except (OSError, ValueError, KeyError) as e:
+        print(f'Failed to generate enums: {e}')
+        sys.exit(1)
+    print(f'TypeScript Enum Files Generated Successfully ({written} written)')
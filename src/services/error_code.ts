@@ -16,9 +16,12 @@
 
 // This file is generated by generator.py
 // Please do not modify this file manually
+// content-hash: 2eb30a3f9addd9753c1590b90d3ef7aeee804b5012cd3310e98b0df59f22bf01
 
 export type ErrorCode = number
 
+type ErrorCodeTable = Readonly<Record<ErrorCode, string>>
+
 export const OK: ErrorCode = 0
 export const ERROR_INVALID_REQUEST: ErrorCode = 40001
 export const ERROR_TOKEN_EXPIRED: ErrorCode = 40101
@@ -32,3 +35,37 @@ export const ERROR_USER_EMAIL_NOT_VERIFIED: ErrorCode = 40302
 export const ERROR_SERVICE_SSHD_NOT_FOUND: ErrorCode = 40401
 export const ERROR_BACKEND: ErrorCode = 50001
 export const ERROR_NOT_SPECIFIED: ErrorCode = 99999
+
+// Error code -> constant name
+export const ERROR_CODE_NAMES: ErrorCodeTable = /* @__PURE__ */ Object.freeze({
+  0: 'OK',
+  40001: 'ERROR_INVALID_REQUEST',
+  40101: 'ERROR_TOKEN_EXPIRED',
+  40102: 'ERROR_TOKEN_INVALID',
+  40103: 'ERROR_MUST_REGISTER',
+  40104: 'ERROR_REGISTER_TIMEOUT',
+  40105: 'ERROR_REGISTER_NOT_FOUND',
+  40106: 'ERROR_INVALID_CREDENTIALS',
+  40301: 'ERROR_USER_NOT_ALLOWED',
+  40302: 'ERROR_USER_EMAIL_NOT_VERIFIED',
+  40401: 'ERROR_SERVICE_SSHD_NOT_FOUND',
+  50001: 'ERROR_BACKEND',
+  99999: 'ERROR_NOT_SPECIFIED',
+})
+
+// Error code -> i18n key of its message
+export const ERROR_CODE_I18N_KEYS: ErrorCodeTable = /* @__PURE__ */ Object.freeze({
+  0: 'errorCode.ok',
+  40001: 'errorCode.invalidRequest',
+  40101: 'errorCode.tokenExpired',
+  40102: 'errorCode.tokenInvalid',
+  40103: 'errorCode.mustRegister',
+  40104: 'errorCode.registerTimeout',
+  40105: 'errorCode.registerNotFound',
+  40106: 'errorCode.invalidCredentials',
+  40301: 'errorCode.userNotAllowed',
+  40302: 'errorCode.userEmailNotVerified',
+  40401: 'errorCode.serviceSshdNotFound',
+  50001: 'errorCode.backend',
+  99999: 'errorCode.notSpecified',
+})
@@ -14,31 +14,26 @@
 
 # python3 ./src/services/generator.py ../web-backend/internal/resputil/code.go ./src/services/error_code.ts
 
+import argparse
+import hashlib
+import json
 import os
 import re
 import sys
+import time
 
-def generate_ts_error_code_file(go_error_code_file_path: str, ts_error_code_file_path: str):
-    # Read Go ErrorCode File
-    go_error_code_file = open(go_error_code_file_path, 'r')
-    go_error_code_file_content = go_error_code_file.read()
-    go_error_code_file.close()
+# Hash of the generated body, stored in the header; survives prettier formatting of the output
+HASH_HEADER_PATTERN = re.compile(r'// content-hash: ([0-9a-f]+)')
 
+def parse_go_error_codes(go_error_code_file_content: str):
+    """Returns [(TypeScript name, value, i18n key)] in declaration order"""
     # Parse Go ErrorCode File
     # match 'NotSpecified ErrorCode = 99999', get $1 as 'NotSpecified', $2 as '99999'
     go_error_code_pattern = re.compile(r'(\w+)\s+ErrorCode\s+=\s+(\d+)')
     go_error_code_matches = go_error_code_pattern.findall(go_error_code_file_content)
 
-    # Generate TypeScript ErrorCode File
-    ts_error_code_file = open(ts_error_code_file_path, 'w')
-    ts_error_code_file.write('// This file is generated by generator.py\n')
-    ts_error_code_file.write('// Please do not modify this file manually\n\n')
-    ts_error_code_file.write('export type ErrorCode = number;\n\n')
-
-    for go_error_code_match in go_error_code_matches:
-        go_error_code_name = go_error_code_match[0]
-        go_error_code_value = go_error_code_match[1]
-
+    error_codes = []
+    for go_error_code_name, go_error_code_value in go_error_code_matches:
         # Convert Go ErrorCode Name to TypeScript ErrorCode Name
         # e.g. 'NotSpecified' -> 'ERROR_NOT_SPECIFIED'
         # e.g. 'OK' -> 'OK'
@@ -47,19 +42,166 @@ def generate_ts_error_code_file(go_error_code_file_path: str, ts_error_code_file
         else:
             ts_error_code_name = 'ERROR_' + re.sub(r'(?<!^)(?=[A-Z])', '_', go_error_code_name).upper()
 
-        ts_error_code_file.write(f'export const {ts_error_code_name}: ErrorCode = {go_error_code_value};\n')
+        # Convert Go ErrorCode Name to i18n key
+        # e.g. 'NotSpecified' -> 'errorCode.notSpecified'
+        # e.g. 'OK' -> 'errorCode.ok'
+        if go_error_code_name.isupper():
+            i18n_name = go_error_code_name.lower()
+        else:
+            i18n_name = go_error_code_name[0].lower() + go_error_code_name[1:]
+
+        error_codes.append((ts_error_code_name, int(go_error_code_value), f'errorCode.{i18n_name}'))
+    return error_codes
+
+def render_ts_error_code_file(error_codes) -> str:
+    # Generate TypeScript ErrorCode File
+    lines = ['export type ErrorCode = number;\n\n', 'type ErrorCodeTable = Readonly<Record<ErrorCode, string>>;\n\n']
+
+    for ts_error_code_name, go_error_code_value, _ in error_codes:
+        lines.append(f'export const {ts_error_code_name}: ErrorCode = {go_error_code_value};\n')
+
+    # Lookup tables, the first declaration wins if the backend reuses a value
+    unique_error_codes = {}
+    for error_code in error_codes:
+        unique_error_codes.setdefault(error_code[1], error_code)
+
+    lines.append('\n// Error code -> constant name\n')
+    lines.append('export const ERROR_CODE_NAMES: ErrorCodeTable = /* @__PURE__ */ Object.freeze({\n')
+    for go_error_code_value, (ts_error_code_name, _, _) in unique_error_codes.items():
+        lines.append(f"  {go_error_code_value}: '{ts_error_code_name}',\n")
+    lines.append('});\n')
+
+    lines.append('\n// Error code -> i18n key of its message\n')
+    lines.append('export const ERROR_CODE_I18N_KEYS: ErrorCodeTable = /* @__PURE__ */ Object.freeze({\n')
+    for go_error_code_value, (_, _, i18n_key) in unique_error_codes.items():
+        lines.append(f"  {go_error_code_value}: '{i18n_key}',\n")
+    lines.append('});\n')
+
+    body = ''.join(lines)
+    content_hash = hashlib.sha256(body.encode('utf-8')).hexdigest()
 
-    ts_error_code_file.close()
+    header = '// This file is generated by generator.py\n'
+    header += '// Please do not modify this file manually\n'
+    header += f'// content-hash: {content_hash}\n\n'
+    return header + body
+
+def find_missing_i18n_keys(error_codes, locales_dir: str):
+    """Returns {locale: [missing keys]} for every locale translation.json under locales_dir"""
+    def has_key(translations, key):
+        # Supports both flat ("errorCode.ok") and nested ({"errorCode": {"ok": ...}}) files
+        if key in translations:
+            return True
+        current = translations
+        for part in key.split('.'):
+            if not isinstance(current, dict) or part not in current:
+                return False
+            current = current[part]
+        return True
+
+    missing = {}
+    for locale in sorted(os.listdir(locales_dir)):
+        translation_file_path = os.path.join(locales_dir, locale, 'translation.json')
+        if not os.path.isfile(translation_file_path):
+            continue
+        with open(translation_file_path, 'r', encoding='utf-8') as translation_file:
+            translations = json.load(translation_file)
+        missing_keys = [key for _, _, key in error_codes if not has_key(translations, key)]
+        if missing_keys:
+            missing[locale] = sorted(set(missing_keys))
+    return missing
+
+def read_existing_hash(ts_error_code_file_path: str):
+    try:
+        with open(ts_error_code_file_path, 'r') as ts_error_code_file:
+            match = HASH_HEADER_PATTERN.search(ts_error_code_file.read())
+    except FileNotFoundError:
+        return None
+    return match.group(1) if match else None
+
+def read_go_error_codes(go_error_code_file_path: str):
+    # Read Go ErrorCode File
+    with open(go_error_code_file_path, 'r') as go_error_code_file:
+        return parse_go_error_codes(go_error_code_file.read())
+
+def generate_ts_error_code_file(go_error_code_file_path: str, ts_error_code_file_path: str) -> bool:
+    """Regenerate the TypeScript file, returns False if the output is unchanged and nothing was written"""
+    error_codes = read_go_error_codes(go_error_code_file_path)
+    if not error_codes:
+        # Most likely a half-written file caught by --watch; never replace the constants with nothing
+        raise ValueError(f'No ErrorCode constants found in {go_error_code_file_path}, nothing written')
+    ts_error_code_file_content = render_ts_error_code_file(error_codes)
+
+    # Skip the write (and the Vite reload it triggers) when nothing changed
+    new_hash = HASH_HEADER_PATTERN.search(ts_error_code_file_content).group(1)
+    if read_existing_hash(ts_error_code_file_path) == new_hash:
+        return False
+
+    # Write atomically so Vite and tsc never see a half-written file
+    tmp_file_path = ts_error_code_file_path + '.tmp'
+    with open(tmp_file_path, 'w') as ts_error_code_file:
+        ts_error_code_file.write(ts_error_code_file_content)
+    os.replace(tmp_file_path, ts_error_code_file_path)
+    return True
+
+def watch(go_error_code_file_path: str, ts_error_code_file_path: str, interval: float):
+    """Poll the Go file and regenerate whenever it changes"""
+    print(f'Watching {go_error_code_file_path} (Ctrl+C to stop)')
+    last_mtime = None
+    while True:
+        try:
+            mtime = os.stat(go_error_code_file_path).st_mtime_ns
+        except FileNotFoundError:
+            # Editors may briefly remove the file while saving
+            mtime = None
+
+        if mtime is not None and mtime != last_mtime:
+            last_mtime = mtime
+            try:
+                if generate_ts_error_code_file(go_error_code_file_path, ts_error_code_file_path):
+                    print(f'[{time.strftime("%H:%M:%S")}] TypeScript ErrorCode File Regenerated')
+            except (OSError, ValueError) as e:
+                print(f'[{time.strftime("%H:%M:%S")}] Failed to regenerate: {e}')
+
+        time.sleep(interval)
 
 if __name__ == '__main__':
-    if len(sys.argv) != 3:
-        print('Usage: python generator.py <Go ErrorCode File Path> <TypeScript ErrorCode File Path>')
-        print('Example: python3 generator.py ~/Workspace/ACT/web-backend/pkg/server/response/code.go ./error_code.ts')
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description='Generate TypeScript error codes from the backend Go ErrorCode file.',
+        epilog='Example: python3 generator.py ~/Workspace/ACT/web-backend/pkg/server/response/code.go ./error_code.ts',
+    )
+    parser.add_argument('go_error_code_file_path', help='Go ErrorCode File Path')
+    parser.add_argument('ts_error_code_file_path', help='TypeScript ErrorCode File Path')
+    parser.add_argument('--watch', action='store_true', help='Regenerate whenever the Go file changes')
+    parser.add_argument('--interval', type=float, default=0.5, help='Polling interval in seconds for --watch')
+    parser.add_argument(
+        '--locales-dir',
+        default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'i18n', 'locales'),
+        help='Check that every error code i18n key exists in <locales-dir>/*/translation.json',
+    )
+    parser.add_argument('--strict-i18n', action='store_true', help='Exit with an error if any i18n key is missing')
+    args = parser.parse_args()
 
-    go_error_code_file_path = sys.argv[1]
-    ts_error_code_file_path = sys.argv[2]
+    if args.watch:
+        try:
+            watch(args.go_error_code_file_path, args.ts_error_code_file_path, args.interval)
+        except KeyboardInterrupt:
+            sys.exit(0)
 
-    generate_ts_error_code_file(go_error_code_file_path, ts_error_code_file_path)
-    print('TypeScript ErrorCode File Generated Successfully')
+    try:
+        generated = generate_ts_error_code_file(args.go_error_code_file_path, args.ts_error_code_file_path)
+    except ValueError as e:
+        print(f'Error: {e}')
+        sys.exit(1)
+    if generated:
+        print('TypeScript ErrorCode File Generated Successfully')
+    else:
+        print('TypeScript ErrorCode File Up To Date')
 
+    if os.path.isdir(args.locales_dir):
+        missing = find_missing_i18n_keys(read_go_error_codes(args.go_error_code_file_path), args.locales_dir)
+        for locale, missing_keys in missing.items():
+            print(f'Missing {len(missing_keys)} error code i18n keys in {locale}/translation.json:')
+            for key in missing_keys:
+                print(f'  - {key}')
+        if missing and args.strict_i18n:
+            sys.exit(1)